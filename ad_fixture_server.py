@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Meta Ad Library and Google Ads Transparency endpoints
+
+Serves pages in each provider's response format, with injected latency,
+server errors and throttling, so the fetch path can be load-tested offline
+and reproducibly. Queries found in the fixture directory replay their
+recorded ads; any other query gets synthetic ads, --volume of them per query.
+
+Usage:
+    python ad_fixture_server.py serve [--port 8765] [--fixtures fixtures] [--volume 10000]
+        [--latency-ms 50] [--jitter-ms 20] [--error-rate 0.01] [--throttle-rate 0.0] [--seed 1]
+    python ad_fixture_server.py record meta technology --credential TOKEN [--limit 1000] [--fixtures fixtures]
+
+Point the server's providers at it:
+    META_ADS_API_URL=http://127.0.0.1:8765/meta/ads_archive
+    GOOGLE_ADS_API_URL=http://127.0.0.1:8765/google/search
+
+Fixture files are JSONL named <provider>.jsonl, one {"query", "ad"} object per
+line, where query is the Meta search_terms or the Google text parameter and
+ad is the raw provider ad.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+DEFAULT_PORT = 8765
+DEFAULT_VOLUME = 1000
+# Distinct synthetic advertisers per query
+SYNTHETIC_ADVERTISERS = 50
+# Page size when a request does not ask for one
+DEFAULT_PAGE_SIZE = 100
+
+PROVIDERS = ("meta", "google")
+
+def load_fixtures(directory: Optional[str]) -> Dict[str, Dict[str, List[Dict]]]:
+    """Read recorded ads as provider -> query -> ads."""
+    fixtures = {provider: {} for provider in PROVIDERS}
+    if not directory:
+        return fixtures
+    for provider in PROVIDERS:
+        path = os.path.join(directory, f"{provider}.jsonl")
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as stream:
+            for line in stream:
+                if line.strip():
+                    record = json.loads(line)
+                    fixtures[provider].setdefault(record["query"], []).append(record["ad"])
+    return fixtures
+
+def synthetic_ad(provider: str, query: str, index: int) -> Dict:
+    """Deterministic raw ad number index for a query, in the provider's format."""
+    advertiser = f"Fixture Advertiser {index % SYNTHETIC_ADVERTISERS + 1}"
+    started = datetime(2024, 1, 1) + timedelta(days=index % 365)
+    stopped = started + timedelta(days=7 + index % 60)
+    scale = index % 20 + 1
+    if provider == "meta":
+        return {
+            "id": f"fixture_meta_{index}",
+            "page_name": advertiser,
+            "ad_creative_body": f"{query.split(' OR ')[0]} offer {index}",
+            "ad_delivery_start_time": started.isoformat(),
+            "ad_delivery_stop_time": stopped.isoformat(),
+            "spend": {"lower_bound": str(scale * 100), "upper_bound": str(scale * 500)},
+            "impressions": {"lower_bound": str(scale * 1000), "upper_bound": str(scale * 5000)},
+            "region_distribution": [{"region": "Brussels", "percentage": "0.4"}, {"region": "Paris", "percentage": "0.6"}]
+        }
+    return {
+        "ad_creative_id": f"fixture_google_{index}",
+        "advertiser": advertiser,
+        "advertiser_id": f"AR{index % SYNTHETIC_ADVERTISERS:08d}",
+        "title": f"{query.split(' ')[0].title()} offer {index}",
+        "snippet": f"Synthetic Transparency Center creative {index}",
+        "format": ["text", "image", "video"][index % 3],
+        "first_shown": int(started.timestamp()),
+        "last_shown": int(stopped.timestamp()),
+        "performance_metrics": {"impressions_min": scale * 5000, "impressions_max": scale * 25000, "clicks_estimate": scale * 250}
+    }
+
+class FixtureState:
+    """Fixtures plus the injected faults, shared by every request thread."""
+
+    def __init__(self, fixtures: Dict, volume: int, latency_ms: float, jitter_ms: float,
+                 error_rate: float, throttle_rate: float, seed: int):
+        self.fixtures = fixtures
+        self.volume = volume
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "throttled": 0}
+
+    def draw(self) -> tuple:
+        """Delay and fault for the next request: (seconds, None | "error" | "throttle")."""
+        with self.lock:
+            self.counts["requests"] += 1
+            delay = max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self.random.random()
+            fault = None
+            if roll < self.error_rate:
+                fault = "error"
+                self.counts["errors"] += 1
+            elif roll < self.error_rate + self.throttle_rate:
+                fault = "throttle"
+                self.counts["throttled"] += 1
+            return delay, fault
+
+    def ads(self, provider: str, query: str, offset: int, limit: int) -> tuple:
+        """One page of ads for a query and whether more follow."""
+        recorded = self.fixtures[provider].get(query)
+        total = len(recorded) if recorded is not None else self.volume
+        end = min(total, offset + limit)
+        if recorded is not None:
+            page = recorded[offset:end]
+        else:
+            page = [synthetic_ad(provider, query, index) for index in range(offset, end)]
+        return page, end < total
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    state: FixtureState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/stats":
+            with self.state.lock:
+                return self._send(200, dict(self.state.counts))
+        provider = url.path.strip("/").split("/")[0]
+        if provider not in PROVIDERS:
+            return self._send(404, {"error": f"Unknown path {url.path}"})
+
+        delay, fault = self.state.draw()
+        time.sleep(delay)
+        if fault == "error":
+            return self._send(500, {"error": {"message": "Injected server error", "code": 2}})
+        if fault == "throttle":
+            if provider == "meta":
+                return self._send(400, {"error": {"message": "Application request limit reached", "code": 4}},
+                                  {"Retry-After": "1"})
+            return self._send(429, {"error": "Injected rate limit"}, {"Retry-After": "1"})
+
+        try:
+            if provider == "meta":
+                offset, limit = int(params.get("after", 0)), int(params.get("limit", DEFAULT_PAGE_SIZE))
+            else:
+                offset, limit = int(params.get("next_page_token", 0)), int(params.get("num", DEFAULT_PAGE_SIZE))
+            if offset < 0 or limit < 1:
+                raise ValueError
+        except ValueError:
+            message = "Invalid paging cursor or page size"
+            if provider == "meta":
+                return self._send(400, {"error": {"message": message, "type": "OAuthException", "code": 100}})
+            return self._send(400, {"error": message})
+
+        if provider == "meta":
+            query = params.get("search_terms", "")
+            ads, more = self.state.ads(provider, query, offset, limit)
+            body = {"data": ads, "paging": {"cursors": {"after": str(offset + len(ads))}}}
+            if more:
+                next_params = dict(params, after=str(offset + len(ads)))
+                body["paging"]["next"] = f"http://{self.headers['Host']}{url.path}?{urlencode(next_params)}"
+            return self._send(200, body)
+
+        query = params.get("text", "")
+        ads, more = self.state.ads(provider, query, offset, limit)
+        body = {"ad_creatives": ads}
+        if more:
+            body["serpapi_pagination"] = {"next_page_token": str(offset + len(ads))}
+        return self._send(200, body)
+
+def create_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT, fixtures_dir: Optional[str] = None,
+                  volume: int = DEFAULT_VOLUME, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                  error_rate: float = 0.0, throttle_rate: float = 0.0, seed: int = 0) -> ThreadingHTTPServer:
+    """Build a fixture server; call serve_forever() on it, or run it on a thread in tests and load runs."""
+    state = FixtureState(load_fixtures(fixtures_dir), volume, latency_ms, jitter_ms, error_rate, throttle_rate, seed)
+    handler = type("BoundFixtureHandler", (FixtureHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def record(provider_name: str, industry: str, credential: str, limit: int, fixtures_dir: str) -> Dict:
+    """Fetch raw ads through a live provider and append them to its fixture file."""
+    from ad_providers import MAX_QUERY_KEYWORDS, get_provider
+    from server import INDUSTRY_KEYWORDS
+
+    provider = get_provider(provider_name)
+    keywords = INDUSTRY_KEYWORDS[industry.lower()]
+    query = " OR ".join(keywords[:MAX_QUERY_KEYWORDS]) if provider_name == "meta" else " ".join(keywords[:MAX_QUERY_KEYWORDS])
+    os.makedirs(fixtures_dir, exist_ok=True)
+    recorded = 0
+    with open(os.path.join(fixtures_dir, f"{provider_name}.jsonl"), "a", encoding="utf-8") as stream:
+        for page in provider.iter_pages(industry.lower(), keywords, limit, credential):
+            for ad in page.ads:
+                stream.write(json.dumps({"query": query, "ad": ad}, separators=(",", ":")) + "\n")
+            recorded += len(page.ads)
+    return {"provider": provider_name, "industry": industry, "query": query, "recorded": recorded}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve or record ad provider fixtures")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Serve fixtures with injected latency and faults")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--fixtures", help="Directory of <provider>.jsonl recordings")
+    serve.add_argument("--volume", type=int, default=DEFAULT_VOLUME, help="Synthetic ads per unrecorded query")
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with HTTP 500")
+    serve.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests rejected as rate limited")
+    serve.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and fault injection")
+
+    rec = commands.add_parser("record", help="Record a live provider's ads as fixtures")
+    rec.add_argument("provider", choices=PROVIDERS)
+    rec.add_argument("industry")
+    rec.add_argument("--credential", required=True, help="Meta access token or SerpApi key")
+    rec.add_argument("--limit", type=int, default=1000)
+    rec.add_argument("--fixtures", default="fixtures")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        print(json.dumps(record(args.provider, args.industry, args.credential, args.limit, args.fixtures), indent=2))
+        return 0
+
+    server = create_server(args.host, args.port, args.fixtures, args.volume, args.latency_ms, args.jitter_ms,
+                           args.error_rate, args.throttle_rate, args.seed)
+    print(f"Serving ad provider fixtures on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
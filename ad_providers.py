@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Ad transparency providers behind one paging interface
+
+A provider fetches one page of an industry's ads at a time from a cursor,
+normalizes each ad to the fields the rest of the server reads, and declares
+its published rate limit. Every request first takes a token from the shared
+rate limiter's bucket for its provider and credential; throttled, failed or
+unreachable requests are retried with backoff. The Meta Ad Library and the
+Google Ads Transparency Center (through SerpApi's JSON endpoint) share one
+pooled HTTP session, and both endpoints can be pointed at
+ad_fixture_server.py for offline load tests.
+
+Environment:
+    META_ADS_API_URL: Ad Library endpoint (default: the Graph API)
+    GOOGLE_ADS_API_URL: Transparency Center endpoint (default: SerpApi)
+    AD_PROVIDER_POOL_SIZE: Pooled connections kept per host
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import MAX_RETRIES, QuotaExhausted, rate_limiter
+
+META_ADS_API_URL = os.environ.get("META_ADS_API_URL", "https://graph.facebook.com/v18.0/ads_archive")
+GOOGLE_ADS_API_URL = os.environ.get("GOOGLE_ADS_API_URL", "https://serpapi.com/search")
+POOL_SIZE = int(os.environ.get("AD_PROVIDER_POOL_SIZE", "32"))
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Keywords sent per search query
+MAX_QUERY_KEYWORDS = 5
+
+class ProviderError(Exception):
+    """A provider request failed, with the HTTP status when there was a response."""
+
+    def __init__(self, message: str, status: Optional[int] = None, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class RateLimit(NamedTuple):
+    """A provider's published request allowance."""
+    requests: int
+    per_seconds: float
+
+class Page(NamedTuple):
+    """One page of raw provider ads, the cursor of the next page and the response headers."""
+    ads: List[Dict]
+    cursor: Optional[str]
+    headers: Dict[str, str]
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Get the HTTP session every provider shares, keeping up to POOL_SIZE connections per host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+def _isoformat(value) -> Optional[str]:
+    """ISO timestamp from an ISO string or Unix seconds."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value).isoformat()
+    return value
+
+class AdProvider:
+    """Base class for a paged ad transparency source."""
+
+    name = ""
+    page_size = 100
+    rate_limit = RateLimit(60, 60.0)
+
+    def __init__(self, base_url: str, session: Optional[requests.Session] = None):
+        self.base_url = base_url
+        self.session = session or get_session()
+
+    def fetch_page(self, industry: Optional[str], keywords: List[str], credential: str, limit: int,
+                   cursor: Optional[str] = None) -> Page:
+        """Fetch one page of raw ads, starting at cursor (None for the first page).
+
+        Raises:
+            ProviderError: If the request fails or the provider returns an error status
+        """
+        raise NotImplementedError
+
+    def normalize(self, ad: Dict) -> Dict:
+        """Add the common ad fields (id, advertiser_name, first_shown, last_shown, platform) to a raw ad."""
+        return ad
+
+    def is_throttled(self, response: requests.Response) -> bool:
+        """Whether a response rejects the request for exceeding the provider's rate limit."""
+        return response.status_code == 429
+
+    def quota(self, credential: Optional[str]) -> Dict:
+        """Remaining request allowance for a credential."""
+        return rate_limiter.quota(self.name, credential, *self.rate_limit)
+
+    def _json(self, response: requests.Response) -> Dict:
+        """Decode a response body that must be a JSON object.
+
+        Raises:
+            ProviderError: If the body is not a JSON object
+        """
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            raise ProviderError(f"{self.name} API returned an unexpected body: {response.text[:200]}",
+                                response.status_code, dict(response.headers))
+        return data
+
+    def _get(self, url: str, params: Optional[Dict], credential: Optional[str]) -> requests.Response:
+        """Send a paced GET, retrying throttled, server-failed and unreachable requests.
+
+        Raises:
+            ProviderError: On a client error, once retries run out, or when the
+                credential has no allowance within the limiter's wait limit
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                rate_limiter.acquire(self.name, credential, *self.rate_limit)
+            except QuotaExhausted as e:
+                raise ProviderError(f"{self.name} API rate limit: {e}", 429)
+
+            delay = None
+            try:
+                response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
+            except requests.RequestException as e:
+                error = ProviderError(f"{self.name} API request failed: {e}")
+                delay = rate_limiter.backoff(attempt)
+            else:
+                throttled = self.is_throttled(response)
+                # Throttling blocks the bucket, so the next acquire waits out the backoff
+                rate_limiter.record(self.name, credential, *self.rate_limit, response.headers, throttled, attempt)
+                if response.status_code < 400:
+                    return response
+                error = ProviderError(f"{self.name} API request failed: HTTP {response.status_code} {response.text[:200]}",
+                                      response.status_code, dict(response.headers))
+                if not throttled:
+                    if response.status_code < 500:
+                        raise error
+                    delay = rate_limiter.backoff(attempt)
+            if attempt == MAX_RETRIES:
+                raise error
+            if delay:
+                time.sleep(delay)
+
+    def iter_pages(self, industry: Optional[str], keywords: List[str], limit: int, credential: str) -> Iterator[Page]:
+        """Yield raw pages until limit ads were returned or the provider runs out."""
+        remaining = limit
+        cursor = None
+        while remaining > 0:
+            page = self.fetch_page(industry, keywords, credential, min(remaining, self.page_size), cursor)
+            yield page
+            remaining -= len(page.ads)
+            cursor = page.cursor
+            if not cursor or not page.ads:
+                break
+
+    def iter_ads(self, industry: Optional[str], keywords: List[str], limit: int, credential: str) -> Iterator[Dict]:
+        """Yield up to limit normalized ads, one page at a time."""
+        remaining = limit
+        for page in self.iter_pages(industry, keywords, limit, credential):
+            for ad in page.ads[:remaining]:
+                yield self.normalize(ad)
+            remaining -= min(len(page.ads), remaining)
+
+class MetaAdLibraryProvider(AdProvider):
+    """Meta Ad Library API (ads_archive), paged by the response's next links."""
+
+    name = "meta"
+    page_size = 500
+    # Graph API standard access: 200 calls per user per hour
+    rate_limit = RateLimit(200, 3600.0)
+
+    # Graph API error codes for application, user, page and ads API rate limits
+    THROTTLE_CODES = {4, 17, 32, 613} | set(range(80000, 80015))
+
+    FIELDS = ("id,ad_creative_body,ad_delivery_start_time,ad_delivery_stop_time,page_name,spend,impressions,"
+              "demographic_distribution,region_distribution")
+
+    def fetch_page(self, industry: Optional[str], keywords: List[str], credential: str, limit: int,
+                   cursor: Optional[str] = None) -> Page:
+        if cursor:
+            # The next link already carries the query, including the access token
+            response = self._get(cursor, None, credential)
+        else:
+            response = self._get(self.base_url, {
+                "access_token": credential,
+                "search_terms": " OR ".join(keywords[:MAX_QUERY_KEYWORDS]),
+                "ad_reached_countries": ["US"],
+                "ad_active_status": "ALL",
+                "limit": limit,
+                "fields": self.FIELDS
+            }, credential)
+        data = self._json(response)
+        ads = data.get("data") or []
+        paging = data.get("paging")
+        cursor = paging.get("next") if isinstance(paging, dict) else None
+        if not isinstance(ads, list) or not all(isinstance(ad, dict) for ad in ads):
+            raise ProviderError("meta API returned malformed data", response.status_code, dict(response.headers))
+        return Page(ads, cursor, dict(response.headers))
+
+    def is_throttled(self, response: requests.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code not in (400, 403):
+            return False
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+        error = data.get("error") if isinstance(data, dict) else None
+        return isinstance(error, dict) and error.get("code") in self.THROTTLE_CODES
+
+    def normalize(self, ad: Dict) -> Dict:
+        normalized = dict(ad)
+        normalized.setdefault("advertiser_name", ad.get("page_name"))
+        normalized.setdefault("first_shown", ad.get("ad_delivery_start_time"))
+        normalized.setdefault("last_shown", ad.get("ad_delivery_stop_time"))
+        normalized.setdefault("platform", "Meta")
+        return normalized
+
+class GoogleAdsTransparencyProvider(AdProvider):
+    """Google Ads Transparency Center through SerpApi, paged by next_page_token."""
+
+    name = "google"
+    page_size = 100
+    # SerpApi throughput limit on production plans
+    rate_limit = RateLimit(100, 60.0)
+
+    def fetch_page(self, industry: Optional[str], keywords: List[str], credential: str, limit: int,
+                   cursor: Optional[str] = None) -> Page:
+        params = {
+            "engine": "google_ads_transparency_center",
+            "api_key": credential,
+            "text": " ".join(keywords[:MAX_QUERY_KEYWORDS]),
+            "num": limit
+        }
+        if cursor:
+            params["next_page_token"] = cursor
+        response = self._get(self.base_url, params, credential)
+        data = self._json(response)
+        if data.get("error"):
+            raise ProviderError(f"google API request failed: {data['error']}", response.status_code, dict(response.headers))
+        ads = data.get("ad_creatives") or []
+        pagination = data.get("serpapi_pagination")
+        cursor = pagination.get("next_page_token") if isinstance(pagination, dict) else None
+        if not isinstance(ads, list) or not all(isinstance(ad, dict) for ad in ads):
+            raise ProviderError("google API returned malformed ad_creatives", response.status_code, dict(response.headers))
+        return Page(ads, cursor, dict(response.headers))
+
+    def normalize(self, ad: Dict) -> Dict:
+        normalized = dict(ad)
+        normalized.setdefault("id", ad.get("ad_creative_id"))
+        normalized.setdefault("advertiser_name", ad.get("advertiser"))
+        normalized.setdefault("ad_title", ad.get("title"))
+        normalized.setdefault("ad_description", ad.get("snippet"))
+        normalized["first_shown"] = _isoformat(ad.get("first_shown"))
+        normalized["last_shown"] = _isoformat(ad.get("last_shown"))
+        normalized.setdefault("platform", "Google Ads")
+        return normalized
+
+# Provider name -> factory; register_provider adds or replaces one
+PROVIDER_FACTORIES = {
+    "meta": lambda: MetaAdLibraryProvider(META_ADS_API_URL),
+    "google": lambda: GoogleAdsTransparencyProvider(GOOGLE_ADS_API_URL)
+}
+
+_providers: Dict[str, AdProvider] = {}
+_providers_lock = threading.Lock()
+
+def register_provider(name: str, provider: AdProvider) -> None:
+    """Plug in a provider instance, replacing any provider of that name.
+
+    The server's ad tools fetch only through "meta" and "google", so registering
+    under those names swaps the source behind them (a fixture server, a proxy).
+    A provider under a new name is listed by provider_names() and reported in
+    quotas, but no tool fetches from it.
+    """
+    with _providers_lock:
+        _providers[name] = provider
+
+def provider_names() -> List[str]:
+    """Names of the built-in and registered providers."""
+    with _providers_lock:
+        return list(PROVIDER_FACTORIES) + [name for name in _providers if name not in PROVIDER_FACTORIES]
+
+def get_provider(name: str) -> AdProvider:
+    """Get the provider registered under name, creating the built-in one on first use.
+
+    Raises:
+        KeyError: If no provider of that name exists
+    """
+    with _providers_lock:
+        provider = _providers.get(name)
+        if provider is None:
+            provider = _providers[name] = PROVIDER_FACTORIES[name]()
+        return provider
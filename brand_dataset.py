@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Versioned columnar brand dataset file
+
+Stores the Belgian and French brand database outside the code as a binary file
+that is memory-mapped read-only and decoded one industry at a time. Worker
+processes mapping the same file share its pages through the OS page cache.
+
+Layout (little-endian):
+    header    magic "BRDS", format version (u16), reserved (u16),
+              dataset version (u32), manifest length (u64)
+    manifest  UTF-8 JSON describing each industry's row count and columns
+    columns   8-byte aligned column blocks, offsets relative to the data start
+
+Numeric columns are packed int64 or float64 arrays. String columns (brand
+names, and per-row JSON for non-numeric fields) are a u32 offsets array of
+rows + 1 entries followed by the UTF-8 blob.
+
+The shipped data/brands.bin is built from the reviewable data/brands.json
+source, {"version": N, "industries": {industry: {brand: row}}}:
+
+    python brand_dataset.py data/brands.json [--output data/brands.bin]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from datetime import datetime
+from typing import Dict, List
+
+MAGIC = b"BRDS"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIQ")
+
+NAME_COLUMN = "brand_name"
+EXTRA_COLUMN = "extra"
+
+def _align(size: int) -> int:
+    """Round a byte size up to the next multiple of 8."""
+    return (size + 7) & ~7
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _pack_array(code: str, values) -> bytes:
+    """Pack numbers as a little-endian array of the given typecode."""
+    packed = array(code, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+def _pack_strings(values: List[str]) -> bytes:
+    blobs = list(map(str.encode, values))
+    offsets = accumulate(map(len, blobs), initial=0)
+    return _pack_array("I", offsets) + b"".join(blobs)
+
+def _industry_columns(rows: Dict[str, Dict]) -> Dict:
+    """Split an industry's rows into names, numeric columns and per-row JSON extras."""
+    names = list(rows)
+    records = [rows[name] for name in names]
+
+    # Fields numeric in every row become packed columns, in first-row order
+    numeric_fields = [
+        field for field in (records[0] if records else {})
+        if all(_is_number(record.get(field)) for record in records)
+    ]
+    extras = [
+        {field: value for field, value in record.items() if field not in numeric_fields}
+        for record in records
+    ]
+    return {
+        "names": names,
+        "numeric": {field: [record[field] for record in records] for field in numeric_fields},
+        "extras": [json.dumps(extra, separators=(",", ":")) for extra in extras] if any(extras) else None
+    }
+
+def _encode_columns(columns: Dict) -> List[tuple]:
+    """Encode industry columns into (column name, type, bytes) blocks."""
+    blocks = [(NAME_COLUMN, "str", _pack_strings(columns["names"]))]
+    for field, values in columns["numeric"].items():
+        try:
+            integers = list(map(int, values))
+        except (OverflowError, ValueError):
+            integers = None
+        # Whole-number columns are stored as int64, compared elementwise at C speed
+        if integers is not None and integers == list(values):
+            blocks.append((field, "int64", _pack_array("q", integers)))
+        else:
+            blocks.append((field, "float64", _pack_array("d", values)))
+    if columns.get("extras") is not None:
+        blocks.append((EXTRA_COLUMN, "json", _pack_strings(columns["extras"])))
+    return blocks
+
+def write_brand_dataset(path: str, brands: Dict[str, Dict[str, Dict]], version: int) -> Dict:
+    """Write brands to a dataset file, atomically replacing any existing file.
+
+    Readers that already mapped the old file keep reading it until they close it.
+
+    Args:
+        path: Destination file path
+        brands: Industry -> brand name -> row mapping
+        version: Dataset version stored in the header
+
+    Returns:
+        Dict with path, version, industries and total rows written
+    """
+    return write_brand_columns(path, {industry: _industry_columns(dict(rows)) for industry, rows in brands.items()}, version)
+
+def write_brand_columns(path: str, industries: Dict[str, Dict], version: int) -> Dict:
+    """Write prebuilt industry columns to a dataset file, atomically replacing any existing file.
+
+    Args:
+        path: Destination file path
+        industries: Industry -> {"names", "numeric": {field: values}, "extras": JSON strings or None}
+        version: Dataset version stored in the header
+
+    Returns:
+        Dict with path, version, industries, total rows and bytes written
+    """
+    manifest = {"created_at": datetime.now().isoformat(), "industries": {}}
+    chunks = []
+    offset = 0
+    for industry, industry_columns in industries.items():
+        columns = {}
+        for name, column_type, data in _encode_columns(industry_columns):
+            columns[name] = {"type": column_type, "offset": offset, "size": len(data)}
+            padded = data + b"\0" * (_align(len(data)) - len(data))
+            chunks.append(padded)
+            offset += len(padded)
+        manifest["industries"][industry] = {"rows": len(industry_columns["names"]), "columns": columns}
+
+    manifest_bytes = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, version, len(manifest_bytes))
+    preamble = header + manifest_bytes
+    preamble += b"\0" * (_align(len(preamble)) - len(preamble))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(preamble)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(temp_path, path)
+
+    return {
+        "path": path,
+        "version": version,
+        "industries": len(industries),
+        "rows": sum(len(columns["names"]) for columns in industries.values()),
+        "bytes": len(preamble) + offset
+    }
+
+class BrandDataset:
+    """Read-only memory-mapped view of a dataset file, decoded per industry on demand."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mtime = stat.st_mtime
+
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"Brand dataset {path} is truncated")
+        magic, format_version, _, version, manifest_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a brand dataset file")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported brand dataset format version {format_version}")
+
+        self.version = version
+        self.manifest = json.loads(self._mmap[HEADER.size:HEADER.size + manifest_size].decode("utf-8"))
+        self._data_start = _align(HEADER.size + manifest_size)
+
+    def industries(self) -> List[str]:
+        return list(self.manifest["industries"])
+
+    def _read_strings(self, column: Dict, rows: int) -> List[str]:
+        start = self._data_start + column["offset"]
+        offsets = struct.unpack_from(f"<{rows + 1}I", self._mmap, start)
+        blob_start = start + 4 * (rows + 1)
+        return [
+            self._mmap[blob_start + offsets[i]:blob_start + offsets[i + 1]].decode("utf-8")
+            for i in range(rows)
+        ]
+
+    def load_columns(self, industry: str) -> Dict:
+        """Decode one industry's columns without building per-row dicts."""
+        meta = self.manifest["industries"][industry]
+        rows = meta["rows"]
+
+        columns = {"names": [], "numeric": {}, "extras": None}
+        for name, column in meta["columns"].items():
+            if column["type"] == "str":
+                columns["names"] = self._read_strings(column, rows)
+            elif column["type"] == "json":
+                columns["extras"] = self._read_strings(column, rows)
+            else:
+                code = "q" if column["type"] == "int64" else "d"
+                columns["numeric"][name] = struct.unpack_from(f"<{rows}{code}", self._mmap, self._data_start + column["offset"])
+        return columns
+
+    def load_industry(self, industry: str) -> Dict[str, Dict]:
+        """Decode one industry's rows into brand name -> row dicts."""
+        columns = self.load_columns(industry)
+        numeric = columns["numeric"]
+        extras = columns["extras"]
+
+        brands = {}
+        for i, brand_name in enumerate(columns["names"]):
+            row = {field: values[i] for field, values in numeric.items()}
+            if extras is not None:
+                row.update(json.loads(extras[i]))
+            brands[brand_name] = row
+        return brands
+
+def build_from_source(source_path: str, output_path: str) -> Dict:
+    """Write a dataset file from a JSON source of {"version", "industries": {industry: {brand: row}}}."""
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    return write_brand_dataset(output_path, source["industries"], source["version"])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the brand dataset file from its JSON source")
+    parser.add_argument("source", help="JSON source, e.g. data/brands.json")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "brands.bin"))
+    args = parser.parse_args()
+    print(json.dumps(build_from_source(args.source, args.output), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
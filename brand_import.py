@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Bulk importer for brand spend data
+
+Streams CSV or JSONL spend updates in chunks, validates every row and writes
+a new version of the columnar brand dataset straight from the parsed columns,
+without building a dict per row.
+
+Usage:
+    python brand_import.py spend.csv [--format csv|jsonl] [--mode merge|replace] [--output data/brands.bin]
+
+CSV files need a header row. Columns: industry, brand_name, belgium_ad_spend_eur,
+france_ad_spend_eur, market_share_be, market_share_fr, and optionally total_spend
+(checked against the country sum) and platforms ("Meta|Google").
+"""
+
+import argparse
+import csv
+import gc
+import io
+import json
+import logging
+import math
+import operator
+import os
+import re
+import sys
+import threading
+import time
+from itertools import compress, islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from brand_dataset import BrandDataset, write_brand_columns
+
+logger = logging.getLogger(__name__)
+
+# Rows parsed between progress reports
+CHUNK_ROWS = 50000
+
+# Validation errors listed in a report before the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Allowed gap between total_spend and the sum of country spend, in EUR
+TOTAL_SPEND_TOLERANCE = 1.0
+
+NUMERIC_FIELDS = ["belgium_ad_spend_eur", "france_ad_spend_eur", "market_share_be", "market_share_fr"]
+# Packed columns in the order rows are rebuilt with
+STORED_FIELDS = ["belgium_ad_spend_eur", "france_ad_spend_eur", "total_spend", "market_share_be", "market_share_fr"]
+DEFAULT_EXTRA = '{"platforms":["Meta","Google"]}'
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_MODES = ("merge", "replace")
+
+INDUSTRY_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
+
+# One import at a time, so two imports never build on the same dataset version
+import_lock = threading.Lock()
+
+class IndustryBuilder:
+    """Accumulates one industry's columns, upserting by brand name."""
+
+    def __init__(self, base: Optional[Dict] = None):
+        self.names: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.numeric: Dict[str, List[float]] = {field: [] for field in STORED_FIELDS}
+        self.extras: List[str] = []
+        self.inserted = 0
+        self.updated = 0
+
+        if base is not None:
+            self.names = list(base["names"])
+            self.positions = {name: i for i, name in enumerate(self.names)}
+            for field in STORED_FIELDS:
+                self.numeric[field] = list(base["numeric"].get(field, [0] * len(self.names)))
+            self.extras = list(base["extras"]) if base["extras"] is not None else ["{}"] * len(self.names)
+
+    def extend(self, names: List[str], numeric: Dict[str, List[float]], extras: List[Optional[str]]) -> None:
+        """Append a block of rows, falling back to per-row upserts when names repeat."""
+        if not self.positions.keys() & set(names) and len(set(names)) == len(names):
+            start = len(self.names)
+            self.names.extend(names)
+            self.positions.update(zip(names, range(start, start + len(names))))
+            for field in STORED_FIELDS:
+                self.numeric[field].extend(numeric[field])
+            self.extras.extend(extra or DEFAULT_EXTRA for extra in extras)
+            self.inserted += len(names)
+            return
+
+        for i, brand_name in enumerate(names):
+            position = self.positions.get(brand_name)
+            if position is None:
+                self.positions[brand_name] = len(self.names)
+                self.names.append(brand_name)
+                for field in STORED_FIELDS:
+                    self.numeric[field].append(numeric[field][i])
+                self.extras.append(extras[i] or DEFAULT_EXTRA)
+                self.inserted += 1
+                continue
+
+            for field in STORED_FIELDS:
+                self.numeric[field][position] = numeric[field][i]
+            if extras[i] is not None:
+                # Keep the brand's other non-numeric fields, such as ad_types
+                extra = json.loads(self.extras[position])
+                extra.update(json.loads(extras[i]))
+                self.extras[position] = json.dumps(extra, separators=(",", ":"))
+            self.updated += 1
+
+    def columns(self) -> Dict:
+        return {"names": self.names, "numeric": self.numeric, "extras": self.extras}
+
+def _csv_chunks(stream) -> Iterator[tuple]:
+    """Yield (first line number, field -> column values) for each chunk of a CSV file."""
+    reader = csv.reader(stream)
+    header = [name.strip() for name in next(reader, [])]
+    line = 2
+    while True:
+        rows = list(islice(reader, CHUNK_ROWS))
+        if not rows:
+            return
+        # Short or long rows are reported by validation rather than silently misaligned
+        width = len(header)
+        columns = {name: [] for name in header}
+        if set(map(len, rows)) == {width}:
+            columns = dict(zip(header, map(list, zip(*rows))))
+        else:
+            for row in rows:
+                padded = row if len(row) == width else [None] * width
+                for name, value in zip(header, padded):
+                    columns[name].append(value)
+            columns["_malformed"] = [len(row) != width for row in rows]
+        yield line, len(rows), columns
+        line += len(rows)
+
+def _jsonl_chunks(stream) -> Iterator[tuple]:
+    """Yield (first line number, field -> column values) for each chunk of a JSONL file."""
+    line = 1
+    lines = iter(stream)
+    while True:
+        raw = list(islice(lines, CHUNK_ROWS))
+        if not raw:
+            return
+        records = []
+        for text in raw:
+            try:
+                record = json.loads(text) if text.strip() else {}
+            except json.JSONDecodeError:
+                record = None
+            records.append(record if isinstance(record, dict) else {"_malformed": True})
+        fields = ["industry", "brand_name", "total_spend", "platforms", "_malformed"] + NUMERIC_FIELDS
+        yield line, len(raw), {field: [record.get(field) for record in records] for field in fields}
+        line += len(raw)
+
+def _parse_column(values: List, field: str, errors: Dict[int, str]) -> List[float]:
+    """Convert a column to floats, recording per-row errors by row index."""
+    try:
+        numbers = list(map(float, values))
+    except (TypeError, ValueError):
+        numbers = []
+        for i, value in enumerate(values):
+            try:
+                numbers.append(float(value))
+            except (TypeError, ValueError):
+                errors.setdefault(i, f"{field} is not a number: {value!r}")
+                numbers.append(0.0)
+    if numbers and (min(numbers) < 0 or not all(map(math.isfinite, numbers))):
+        for i, number in enumerate(numbers):
+            if not math.isfinite(number):
+                errors.setdefault(i, f"{field} must be a finite number: {values[i]!r}")
+            elif number < 0:
+                errors.setdefault(i, f"{field} must be non-negative: {values[i]!r}")
+    return numbers
+
+def _platform_extra(platforms, cache: Dict) -> Optional[str]:
+    """Encode a row's platforms as its JSON extra, memoized per distinct value."""
+    if platforms is None or platforms == "":
+        return None
+    if isinstance(platforms, list) and not all(isinstance(name, str) for name in platforms):
+        raise ValueError("platforms must be a list of names")
+    key = platforms if isinstance(platforms, str) else tuple(platforms) if isinstance(platforms, list) else None
+    if key is None:
+        raise ValueError("platforms must be a list of names")
+    extra = cache.get(key)
+    if extra is None:
+        names = [p.strip() for p in platforms.split("|") if p.strip()] if isinstance(platforms, str) else platforms
+        extra = cache[key] = json.dumps({"platforms": names}, separators=(",", ":"))
+    return extra
+
+def _text_column(values: List, lower: bool = False) -> List[str]:
+    """Strip a text column, treating missing values as empty strings."""
+    try:
+        stripped = list(map(str.strip, values))
+    except TypeError:
+        stripped = [str(value or "").strip() for value in values]
+    return list(map(str.lower, stripped)) if lower else stripped
+
+def _totals_match(totals: List, computed: List[float]) -> bool:
+    """Fast check that every total_spend is present and matches the country sum."""
+    try:
+        gaps = map(abs, map(operator.sub, map(float, totals), computed))
+        return max(gaps, default=0) <= TOTAL_SPEND_TOLERANCE
+    except (TypeError, ValueError):
+        return False
+
+def _validate_chunk(rows: int, columns: Dict, platform_cache: Dict) -> tuple:
+    """Validate a chunk column by column.
+
+    Returns:
+        (industries, names, numeric columns, extras, errors by row index)
+    """
+    errors: Dict[int, str] = {}
+    for field in ["industry", "brand_name"] + NUMERIC_FIELDS:
+        if field not in columns:
+            return None, None, None, None, {i: f"missing {field} column" for i in range(rows)}
+
+    for i, malformed in enumerate(columns.get("_malformed") or []):
+        if malformed:
+            errors[i] = "malformed row"
+
+    industries = _text_column(columns["industry"], lower=True)
+    for industry in set(industries):
+        if not INDUSTRY_PATTERN.match(industry):
+            for i, value in enumerate(industries):
+                if value == industry:
+                    errors.setdefault(i, f"invalid industry: {columns['industry'][i]!r}")
+
+    names = _text_column(columns["brand_name"])
+    if not all(names):
+        for i, name in enumerate(names):
+            if not name:
+                errors.setdefault(i, "missing brand_name")
+
+    numeric = {field: _parse_column(columns[field], field, errors) for field in NUMERIC_FIELDS}
+    computed = list(map(operator.add, numeric["belgium_ad_spend_eur"], numeric["france_ad_spend_eur"]))
+    totals = columns.get("total_spend")
+    if totals is not None and not _totals_match(totals, computed):
+        for i, value in enumerate(totals):
+            if value in (None, ""):
+                continue
+            try:
+                total = float(value)
+            except (TypeError, ValueError):
+                errors.setdefault(i, f"total_spend is not a number: {value!r}")
+                continue
+            if abs(total - computed[i]) > TOTAL_SPEND_TOLERANCE:
+                errors.setdefault(i, f"total_spend {total:g} does not match Belgium + France spend {computed[i]:g}")
+    numeric["total_spend"] = computed
+
+    platforms_column = columns.get("platforms") or [None] * rows
+    extras = []
+    try:
+        # Few distinct values per file, so encode each once
+        distinct = {value: _platform_extra(value, platform_cache) for value in set(platforms_column)}
+        extras = list(map(distinct.__getitem__, platforms_column))
+    except (TypeError, ValueError):
+        for i, platforms in enumerate(platforms_column):
+            try:
+                extras.append(_platform_extra(platforms, platform_cache))
+            except ValueError as e:
+                errors.setdefault(i, str(e))
+                extras.append(None)
+    return industries, names, numeric, extras, errors
+
+def import_brand_spend(stream: Iterable[str], output_path: str, import_format: str = "csv", mode: str = "merge") -> Dict:
+    """Validate a CSV or JSONL spend file and write it as a new dataset version.
+
+    Rows are validated and appended a column at a time per chunk. Nothing is
+    written if any row fails validation.
+
+    Args:
+        stream: Text stream or iterable of lines
+        output_path: Dataset file to build on and replace
+        import_format: csv or jsonl
+        mode: merge (upsert brands into existing industries) or replace (imported industries replace existing ones)
+
+    Returns:
+        Import report with row counts, throughput and the written dataset version, or a dict with "error"
+    """
+    if import_format not in IMPORT_FORMATS:
+        return {"error": f"Unsupported format '{import_format}'", "available_formats": list(IMPORT_FORMATS)}
+    if mode not in IMPORT_MODES:
+        return {"error": f"Unsupported mode '{mode}'", "available_modes": list(IMPORT_MODES)}
+
+    with import_lock:
+        return _import_locked(stream, output_path, import_format, mode)
+
+def _import_locked(stream: Iterable[str], output_path: str, import_format: str, mode: str) -> Dict:
+    """Run an import while holding import_lock."""
+    started = time.perf_counter()
+    base = BrandDataset(output_path) if os.path.exists(output_path) else None
+
+    builders: Dict[str, IndustryBuilder] = {}
+    platform_cache: Dict = {}
+    errors = []
+    error_count = 0
+    rows = 0
+    chunks = _csv_chunks(stream) if import_format == "csv" else _jsonl_chunks(stream)
+
+    for first_line, chunk_rows, columns in chunks:
+        rows += chunk_rows
+        industries, names, numeric, extras, chunk_errors = _validate_chunk(chunk_rows, columns, platform_cache)
+        if chunk_errors or error_count:
+            error_count += len(chunk_errors)
+            for i in sorted(chunk_errors)[:MAX_REPORTED_ERRORS - len(errors)]:
+                errors.append({"line": first_line + i, "error": chunk_errors[i]})
+            continue
+
+        # Append each industry's rows of the chunk as one block
+        distinct = set(industries)
+        for industry in distinct:
+            builder = builders.get(industry)
+            if builder is None:
+                has_base = mode == "merge" and base is not None and industry in base.manifest["industries"]
+                builder = builders[industry] = IndustryBuilder(base.load_columns(industry) if has_base else None)
+            if len(distinct) == 1:
+                builder.extend(names, numeric, extras)
+            else:
+                selected = list(map(industry.__eq__, industries))
+                builder.extend(
+                    list(compress(names, selected)),
+                    {field: list(compress(values, selected)) for field, values in numeric.items()},
+                    list(compress(extras, selected))
+                )
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Parsed {rows} rows ({rows / elapsed:,.0f} rows/s)")
+
+    parse_seconds = time.perf_counter() - started
+    if error_count:
+        return {
+            "error": f"{error_count} invalid rows, nothing imported",
+            "rows": rows,
+            "invalid_rows": error_count,
+            "errors": errors
+        }
+    if not rows:
+        return {"error": "No rows to import"}
+
+    # Industries missing from the import are carried over unchanged, in file order
+    industries = {}
+    for industry in (base.industries() if base is not None else []):
+        builder = builders.get(industry)
+        industries[industry] = builder.columns() if builder else base.load_columns(industry)
+    for industry, builder in builders.items():
+        industries.setdefault(industry, builder.columns())
+
+    written = write_brand_columns(output_path, industries, (base.version if base else 0) + 1)
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "inserted": sum(builder.inserted for builder in builders.values()),
+        "updated": sum(builder.updated for builder in builders.values()),
+        "industries": sorted(builders),
+        "mode": mode,
+        "dataset_version": written["version"],
+        "bytes_written": written["bytes"],
+        "parse_seconds": round(parse_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed) if elapsed else rows
+    }
+
+def main() -> int:
+    default_output = os.environ.get(
+        "BRANDS_DATASET_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "brands.bin")
+    )
+    parser = argparse.ArgumentParser(description="Import brand spend data into the columnar brand dataset")
+    parser.add_argument("path", help="CSV or JSONL file, or - for stdin")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Input format (default: from the file extension)")
+    parser.add_argument("--mode", choices=IMPORT_MODES, default="merge")
+    parser.add_argument("--output", default=default_output, help="Dataset file to update")
+    args = parser.parse_args()
+    # Progress is logged per chunk; show it on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+
+    import_format = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+    # The import allocates millions of acyclic objects; cyclic GC passes over them
+    # would dominate the run time. Only the CLI pauses it, since it owns the process
+    gc.disable()
+    try:
+        if args.path == "-":
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+            report = import_brand_spend(stream, args.output, import_format, args.mode)
+        else:
+            with open(args.path, encoding="utf-8", newline="") as stream:
+                report = import_brand_spend(stream, args.output, import_format, args.mode)
+    finally:
+        gc.enable()
+
+    print(json.dumps(report, indent=2))
+    return 1 if "error" in report else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Ad-hoc analytical queries over the brand store
+
+Queries run against a long-format fact table with one row per brand, country
+and platform, held as parallel column lists. A query is compiled once per
+shape (filter fields and operators, group-by, aggregates, ordering) into a
+plan that evaluates filters a column at a time with map/compress, then groups
+and aggregates per brand. Filter values are bound at execution, so queries
+that differ only in values share a cached plan.
+
+Query format:
+    {
+        "filters": [{"field": "country", "op": "==", "value": "belgium"}, ...],
+        "group_by": ["industry", "platform"],
+        "aggregates": [{"fn": "sum", "field": "spend"}, {"fn": "hhi", "field": "spend"}, {"fn": "count"}],
+        "order_by": [{"field": "sum_spend", "desc": true}],
+        "limit": 10
+    }
+"""
+
+import operator
+import threading
+from collections import OrderedDict
+from itertools import compress, repeat
+from typing import Dict, List, Tuple
+
+# Fact table columns: group-by dimensions, per-fact measures and brand-level attributes
+DIMENSIONS = ["industry", "brand_name", "country", "platform", "trait"]
+MEASURES = ["spend", "market_share"]
+BRAND_ATTRIBUTES = ["total_spend", "belgium_spend", "france_spend"]
+FILTER_FIELDS = DIMENSIONS + MEASURES + BRAND_ATTRIBUTES
+NUMERIC_FIELDS = set(MEASURES + BRAND_ATTRIBUTES)
+
+# Measures scaled by currency and date range when reported
+SCALED_MEASURES = {"spend"}
+
+AGGREGATES = ["count", "sum", "mean", "min", "max", "share", "hhi"]
+
+FILTER_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "in": lambda value, allowed: value in allowed,
+    "not_in": lambda value, allowed: value not in allowed,
+    "contains": lambda value, text: text in value.lower()
+}
+ORDERING_OPERATORS = {">", ">=", "<", "<="}
+
+# Operators comparing a brand's set of traits against the filter value
+TRAIT_OPERATORS = {
+    "==": operator.contains,
+    "!=": lambda traits, trait: trait not in traits,
+    "in": lambda traits, allowed: not allowed.isdisjoint(traits),
+    "not_in": lambda traits, allowed: allowed.isdisjoint(traits)
+}
+
+# Label for brands without any trait when grouping by trait
+NO_TRAIT = "general"
+
+MAX_QUERY_LIMIT = 500
+PLAN_CACHE_SIZE = 128
+
+class QueryError(ValueError):
+    """Raised for a malformed query."""
+
+def _check_filter_value(field: str, op: str, value) -> None:
+    """Check that a filter value fits its field's type and operator.
+
+    Raises:
+        QueryError: If the value cannot be compared with the field
+    """
+    numeric = field in NUMERIC_FIELDS
+    if op == "contains" and numeric:
+        raise QueryError(f"Operator 'contains' needs a text field; '{field}' is numeric")
+    if op in ORDERING_OPERATORS and not numeric:
+        raise QueryError(f"Operator '{op}' needs a numeric field; '{field}' is text")
+
+    expected = "a number" if numeric else "a string"
+    members = value if op in ("in", "not_in") else [value]
+    for member in members:
+        is_number = isinstance(member, (int, float)) and not isinstance(member, bool)
+        if numeric and not is_number or not numeric and not isinstance(member, str):
+            target = f"Members of '{op}'" if op in ("in", "not_in") else f"Operator '{op}'"
+            raise QueryError(f"{target} on '{field}' must be {expected}, got {member!r}")
+
+def normalize_query(query: Dict) -> Tuple[tuple, List]:
+    """Split a query into its cacheable shape and the filter values bound at execution.
+
+    Raises:
+        QueryError: If a field, operator or aggregate is unknown, or a filter
+            value does not fit its field's type
+    """
+    if not isinstance(query, dict):
+        raise QueryError("Query must be an object")
+
+    filters = query.get("filters") or []
+    if not isinstance(filters, list) or not all(isinstance(item, dict) for item in filters):
+        raise QueryError("filters must be a list of objects")
+
+    filter_shape = []
+    params = []
+    for item in filters:
+        field, op = item.get("field"), item.get("op", "==")
+        if field not in FILTER_FIELDS:
+            raise QueryError(f"Cannot filter on '{field}'. Available fields: {', '.join(FILTER_FIELDS)}")
+        operators = TRAIT_OPERATORS if field == "trait" else FILTER_OPERATORS
+        if not isinstance(op, str) or op not in operators:
+            raise QueryError(f"Operator '{op}' is not supported for '{field}'. Available operators: {', '.join(operators)}")
+        value = item.get("value")
+        if op in ("in", "not_in") and not isinstance(value, list):
+            raise QueryError(f"Operator '{op}' needs a list value")
+        _check_filter_value(field, op, value)
+        if op in ("in", "not_in"):
+            value = frozenset(v.lower() if isinstance(v, str) and field != "brand_name" else v for v in value)
+        elif op == "contains":
+            value = value.lower()
+        elif isinstance(value, str) and field != "brand_name":
+            value = value.lower()
+        filter_shape.append((field, op))
+        params.append(value)
+
+    group_by = query.get("group_by") or []
+    if not isinstance(group_by, list):
+        raise QueryError("group_by must be a list of dimensions")
+    group_by = tuple(group_by)
+    for dimension in group_by:
+        if dimension not in DIMENSIONS:
+            raise QueryError(f"Cannot group by '{dimension}'. Available dimensions: {', '.join(DIMENSIONS)}")
+
+    aggregate_items = query.get("aggregates") or [{"fn": "sum", "field": "spend"}]
+    if not isinstance(aggregate_items, list) or not all(isinstance(item, dict) for item in aggregate_items):
+        raise QueryError("aggregates must be a list of objects")
+
+    aggregates = []
+    for item in aggregate_items:
+        fn, field = item.get("fn"), item.get("field", "spend")
+        if fn not in AGGREGATES:
+            raise QueryError(f"Unknown aggregate '{fn}'. Available aggregates: {', '.join(AGGREGATES)}")
+        if fn != "count" and field not in MEASURES:
+            raise QueryError(f"Cannot aggregate '{field}'. Available measures: {', '.join(MEASURES)}")
+        alias = item.get("as") or ("count" if fn == "count" else f"{fn}_{field}")
+        if not isinstance(alias, str):
+            raise QueryError(f"Aggregate alias must be a string, got {alias!r}")
+        aggregates.append((fn, None if fn == "count" else field, alias))
+
+    outputs = set(group_by) | {alias for _, _, alias in aggregates}
+    order_items = query.get("order_by") or []
+    if not isinstance(order_items, list) or not all(isinstance(item, dict) for item in order_items):
+        raise QueryError("order_by must be a list of objects")
+
+    order_by = []
+    for item in order_items:
+        key = item.get("field")
+        if not isinstance(key, str) or key not in outputs:
+            raise QueryError(f"Cannot order by '{key}'. Order by a group-by dimension or aggregate alias")
+        order_by.append((key, bool(item.get("desc", False))))
+
+    return (tuple(filter_shape), group_by, tuple(aggregates), tuple(order_by)), params
+
+class QueryPlan:
+    """A compiled query shape, executable against any fact table with bound filter values."""
+
+    def __init__(self, shape: tuple):
+        filter_shape, self.group_by, self.aggregates, self.order_by = shape
+        self.filters = [
+            (field, (TRAIT_OPERATORS if field == "trait" else FILTER_OPERATORS)[op])
+            for field, op in filter_shape
+        ]
+        self.explode_traits = "trait" in self.group_by
+        self.measures = sorted({field for _, field, _ in self.aggregates if field})
+
+    def _select(self, table: Dict[str, List], params: List) -> List[int]:
+        """Evaluate filters column by column into the matching row indices."""
+        mask = None
+        for (field, predicate), value in zip(self.filters, params):
+            matches = map(predicate, table[field], repeat(value))
+            mask = list(matches) if mask is None else list(map(operator.and_, mask, matches))
+        rows = range(len(table["industry"]))
+        return list(rows) if mask is None else list(compress(rows, mask))
+
+    def execute(self, table: Dict[str, List], params: List, scale: float = 1.0, limit: int = 100) -> Dict:
+        selected = self._select(table, params)
+
+        # Reduce matching facts to per-brand measures within each group
+        dimension_columns = [table[d] for d in self.group_by if d != "trait"]
+        measure_columns = [table[m] for m in self.measures]
+        brands = table["brand_name"]
+        industries = table["industry"]
+        traits = table["trait"]
+        trait_slot = self.group_by.index("trait") if self.explode_traits else None
+
+        groups: Dict[tuple, Dict[tuple, List[List[float]]]] = {}
+        for i in selected:
+            key = [column[i] for column in dimension_columns]
+            keys = [tuple(key)]
+            if self.explode_traits:
+                keys = [tuple(key[:trait_slot] + [trait] + key[trait_slot:]) for trait in (traits[i] or (NO_TRAIT,))]
+            brand_key = (industries[i], brands[i])
+            for group_key in keys:
+                brand_values = groups.setdefault(group_key, {}).get(brand_key)
+                if brand_values is None:
+                    brand_values = groups[group_key][brand_key] = [[] for _ in measure_columns]
+                for values, column in zip(brand_values, measure_columns):
+                    values.append(column[i])
+
+        # Spend adds up across a brand's facts; market shares are averaged
+        brand_totals = {}
+        for group_key, group_brands in groups.items():
+            brand_totals[group_key] = {
+                measure: [
+                    sum(values[m]) if measure == "spend" else sum(values[m]) / len(values[m])
+                    for values in group_brands.values()
+                ]
+                for m, measure in enumerate(self.measures)
+            }
+        overall = {measure: sum(sum(totals[measure]) for totals in brand_totals.values()) for measure in self.measures}
+
+        rows = []
+        for group_key, group_brands in groups.items():
+            row = dict(zip(self.group_by, group_key))
+            for fn, field, alias in self.aggregates:
+                if fn == "count":
+                    row[alias] = len(group_brands)
+                    continue
+                values = brand_totals[group_key][field]
+                factor = scale if field in SCALED_MEASURES else 1.0
+                total = sum(values)
+                if fn == "sum":
+                    row[alias] = round(total * factor, 2)
+                elif fn == "mean":
+                    row[alias] = round(total / len(values) * factor, 2)
+                elif fn == "min":
+                    row[alias] = round(min(values) * factor, 2)
+                elif fn == "max":
+                    row[alias] = round(max(values) * factor, 2)
+                elif fn == "share":
+                    row[alias] = round(total / overall[field] * 100, 2) if overall[field] else 0
+                elif fn == "hhi":
+                    # Herfindahl-Hirschman index of brand shares within the group (0-10000)
+                    row[alias] = round(sum((v / total * 100) ** 2 for v in values), 1) if total else 0
+            rows.append(row)
+
+        # Stable sorts applied from the last key to the first
+        for key, desc in reversed(self.order_by):
+            rows.sort(key=lambda row: row[key], reverse=desc)
+
+        return {
+            "columns": list(self.group_by) + [alias for _, _, alias in self.aggregates],
+            "rows": rows[:max(1, min(MAX_QUERY_LIMIT, int(limit)))],
+            "total_groups": len(rows),
+            "matched_facts": len(selected)
+        }
+
+_plan_cache: "OrderedDict[tuple, QueryPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+plan_cache_stats = {"hits": 0, "misses": 0}
+
+def get_plan(shape: tuple) -> Tuple[QueryPlan, bool]:
+    """Get the compiled plan for a query shape from the LRU cache, compiling on a miss."""
+    with _plan_cache_lock:
+        plan = _plan_cache.get(shape)
+        if plan is not None:
+            _plan_cache.move_to_end(shape)
+            plan_cache_stats["hits"] += 1
+            return plan, True
+        plan_cache_stats["misses"] += 1
+
+    plan = QueryPlan(shape)
+    with _plan_cache_lock:
+        _plan_cache[shape] = plan
+        if len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan, False
+
+def run_query(table: Dict[str, List], query: Dict, scale: float = 1.0) -> Dict:
+    """Compile (or reuse) the plan for a query and run it against a fact table.
+
+    Raises:
+        QueryError: If the query is malformed
+    """
+    shape, params = normalize_query(query)
+    plan, cached = get_plan(shape)
+    try:
+        limit = int(query.get("limit", 100))
+    except (TypeError, ValueError):
+        raise QueryError("limit must be an integer")
+    result = plan.execute(table, params, scale, limit)
+    result["plan_cache"] = "hit" if cached else "miss"
+    return result
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Nearest-neighbour search over brand feature vectors by cosine similarity
+
+Feature vectors are standardized per feature (so a feature every brand shares
+does not dominate), scaled to unit length and stored as one packed column per
+feature. A query is a matrix-vector product computed a column at a time with
+map over the packed arrays, followed by heap selection of the top matches.
+"""
+
+import heapq
+import math
+import operator
+from array import array
+from itertools import repeat
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class SimilarityIndex:
+    """Unit-length standardized feature columns for a set of keys, grouped contiguously."""
+
+    def __init__(self, keys: List[Tuple[Hashable, Hashable]], vectors: List[List[float]]):
+        """
+        Args:
+            keys: (group, name) per row; rows of one group must be adjacent
+            vectors: Raw feature values per row, all of the same length
+        """
+        self.keys = keys
+        self.positions = {key: i for i, key in enumerate(keys)}
+        self.group_ranges: Dict[Hashable, Tuple[int, int]] = {}
+        for i, (group, _) in enumerate(keys):
+            start, _ = self.group_ranges.get(group, (i, i))
+            self.group_ranges[group] = (start, i + 1)
+
+        rows = len(vectors)
+        features = len(vectors[0]) if vectors else 0
+        columns = []
+        for f in range(features):
+            values = [vector[f] for vector in vectors]
+            mean = sum(values) / rows
+            spread = math.sqrt(sum((value - mean) ** 2 for value in values) / rows)
+            columns.append([(value - mean) / spread if spread else 0.0 for value in values])
+
+        norms = [math.sqrt(sum(column[i] ** 2 for column in columns)) for i in range(rows)]
+        self.columns = [
+            array("d", (value / norm if norm else 0.0 for value, norm in zip(column, norms)))
+            for column in columns
+        ]
+
+    def __contains__(self, key) -> bool:
+        return key in self.positions
+
+    def nearest(self, key: Tuple[Hashable, Hashable], top_n: int, group: Optional[Hashable] = None) -> List[Tuple[Tuple, float]]:
+        """Get the rows most similar to key, optionally only within one group.
+
+        Returns:
+            [(key, cosine similarity)] best first, excluding key itself
+        """
+        position = self.positions[key]
+        start, end = self.group_ranges.get(group, (0, 0)) if group is not None else (0, len(self.keys))
+
+        scores = [0.0] * (end - start)
+        for column in self.columns:
+            weight = column[position]
+            if weight:
+                scores = list(map(operator.add, scores, map(operator.mul, column[start:end], repeat(weight))))
+
+        best = heapq.nlargest(top_n + 1, zip(scores, range(start, end)))
+        return [(self.keys[i], round(score, 4)) for score, i in best if i != position][:top_n]
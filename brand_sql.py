@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Read-only SQL over an in-memory SQLite mirror of the brand store and ad archive
+
+The mirror is rebuilt from a brand snapshot when the data version changes and
+synced with the ad caches per cache entry. User statements run with SQLite's
+query_only pragma and an authorizer that only allows reads, under a statement
+timeout enforced by the progress handler and a row cap.
+
+Tables:
+    brands(industry, brand_name, belgium_spend, france_spend, total_spend,
+           market_share_be, market_share_fr, platforms, data)
+    brand_platforms(industry, brand_name, platform)
+    ads(id, platform, industry, cache_key, advertiser_name, title, body,
+        first_shown, last_shown, data)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TIMEOUT_SECONDS = 2.0
+DEFAULT_MAX_ROWS = 1000
+MAX_ROWS_LIMIT = 10000
+STATEMENT_CACHE_SIZE = 256
+
+# Progress handler granularity, in SQLite virtual machine instructions
+PROGRESS_STEPS = 10000
+
+SCHEMA = """
+CREATE TABLE brands (
+    industry TEXT NOT NULL,
+    brand_name TEXT NOT NULL,
+    belgium_spend REAL NOT NULL,
+    france_spend REAL NOT NULL,
+    total_spend REAL NOT NULL,
+    market_share_be REAL NOT NULL,
+    market_share_fr REAL NOT NULL,
+    platforms TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (industry, brand_name)
+);
+CREATE INDEX brands_total_spend ON brands (industry, total_spend DESC);
+CREATE INDEX brands_belgium_spend ON brands (belgium_spend DESC);
+CREATE INDEX brands_france_spend ON brands (france_spend DESC);
+CREATE INDEX brands_name ON brands (brand_name COLLATE NOCASE);
+
+CREATE TABLE brand_platforms (
+    industry TEXT NOT NULL,
+    brand_name TEXT NOT NULL,
+    platform TEXT NOT NULL
+);
+CREATE INDEX brand_platforms_platform ON brand_platforms (platform, industry);
+
+CREATE TABLE ads (
+    id TEXT,
+    platform TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    advertiser_name TEXT,
+    title TEXT,
+    body TEXT,
+    first_shown TEXT,
+    last_shown TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX ads_industry ON ads (industry, platform);
+CREATE INDEX ads_advertiser ON ads (advertiser_name COLLATE NOCASE);
+CREATE INDEX ads_cache_key ON ads (cache_key);
+"""
+
+# Authorizer actions a read-only statement may perform
+READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION}
+if hasattr(sqlite3, "SQLITE_RECURSIVE"):
+    READ_ACTIONS.add(sqlite3.SQLITE_RECURSIVE)
+
+def _read_only_authorizer(action, arg1, arg2, db_name, trigger):
+    return sqlite3.SQLITE_OK if action in READ_ACTIONS else sqlite3.SQLITE_DENY
+
+def _ad_row(ad: Dict, platform: str, industry: str, cache_key: str) -> Tuple:
+    return (
+        ad.get("id"), platform, industry, cache_key,
+        ad.get("advertiser_name") or ad.get("page_name"),
+        ad.get("ad_title") or ad.get("ad_creative_link_title"),
+        ad.get("ad_description") or ad.get("ad_creative_body"),
+        ad.get("first_shown") or ad.get("ad_delivery_start_time"),
+        ad.get("last_shown") or ad.get("ad_delivery_stop_time"),
+        json.dumps(ad, separators=(",", ":"), default=str)
+    )
+
+class BrandSqlMirror:
+    """In-memory SQLite copy of the brand store and ad archive, refreshed by data version."""
+
+    def __init__(self):
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.brands_version = None
+        self._ad_entries: Dict[Tuple[str, str], str] = {}
+
+    def refresh_brands(self, version: int, brands: Iterable[Tuple[str, str, Dict]]) -> bool:
+        """Reload the brand tables unless the mirror already holds this data version.
+
+        Args:
+            version: Brand data version
+            brands: (industry, brand name, row) tuples, read only when a reload is needed
+        """
+        with self._lock:
+            if version == self.brands_version:
+                return False
+            brand_rows = []
+            platform_rows = []
+            for industry, brand_name, data in brands:
+                platforms = list(data.get("platforms", []))
+                brand_rows.append((
+                    industry, brand_name, data["belgium_ad_spend_eur"], data["france_ad_spend_eur"],
+                    data["total_spend"], data["market_share_be"], data["market_share_fr"],
+                    json.dumps(platforms), json.dumps(data, separators=(",", ":"), default=str)
+                ))
+                platform_rows.extend((industry, brand_name, platform.lower()) for platform in platforms)
+            with self._conn:
+                self._conn.execute("DELETE FROM brands")
+                self._conn.execute("DELETE FROM brand_platforms")
+                self._conn.executemany("INSERT INTO brands VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", brand_rows)
+                self._conn.executemany("INSERT INTO brand_platforms VALUES (?, ?, ?)", platform_rows)
+            self._conn.execute("ANALYZE")
+            self.brands_version = version
+            return True
+
+    def sync_ads(self, caches: Dict[str, Dict[str, Dict]]) -> int:
+        """Mirror ad cache entries added or refreshed since the last sync.
+
+        Args:
+            caches: Platform -> ad cache (cache key -> {"data", "timestamp"})
+
+        Returns:
+            Number of cache entries reloaded
+        """
+        with self._lock:
+            current = {
+                (platform, cache_key): entry.get("timestamp")
+                for platform, cache in caches.items() for cache_key, entry in list(cache.items())
+            }
+            changed = [key for key, stamp in current.items() if self._ad_entries.get(key) != stamp]
+            removed = [key for key in self._ad_entries if key not in current]
+            if not changed and not removed:
+                return 0
+            with self._conn:
+                for platform, cache_key in removed + changed:
+                    self._conn.execute("DELETE FROM ads WHERE cache_key = ? AND platform = ?", (cache_key, platform))
+                for platform, cache_key in changed:
+                    entry = caches[platform][cache_key]
+                    self._conn.executemany(
+                        "INSERT INTO ads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [_ad_row(ad, platform, entry.get("industry", ""), cache_key) for ad in entry.get("data", [])]
+                    )
+            self._ad_entries = current
+            return len(changed) + len(removed)
+
+    def query(self, sql: str, params: Optional[List] = None, max_rows: int = DEFAULT_MAX_ROWS,
+              timeout: float = DEFAULT_TIMEOUT_SECONDS) -> Dict:
+        """Run one read-only statement.
+
+        Raises:
+            sqlite3.Error: If the statement is invalid, not read-only or times out
+        """
+        max_rows = max(1, min(MAX_ROWS_LIMIT, int(max_rows)))
+        deadline = time.perf_counter() + timeout
+        with self._lock:
+            self._conn.execute("PRAGMA query_only = ON")
+            self._conn.set_authorizer(_read_only_authorizer)
+            self._conn.set_progress_handler(lambda: time.perf_counter() > deadline, PROGRESS_STEPS)
+            started = time.perf_counter()
+            try:
+                cursor = self._conn.execute(sql, params or [])
+                rows = cursor.fetchmany(max_rows + 1)
+                columns = [column[0] for column in cursor.description or []]
+                cursor.close()
+            except sqlite3.OperationalError as e:
+                if time.perf_counter() > deadline:
+                    raise sqlite3.OperationalError(f"Statement exceeded the {timeout}s timeout") from e
+                raise
+            finally:
+                self._conn.set_progress_handler(None, 0)
+                self._conn.set_authorizer(None)
+                self._conn.execute("PRAGMA query_only = OFF")
+
+        return {
+            "columns": columns,
+            "rows": [list(row) for row in rows[:max_rows]],
+            "row_count": min(len(rows), max_rows),
+            "truncated": len(rows) > max_rows,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
@@ -6,21 +6,61 @@ This server provides HTTP endpoints that bridge between the web dashboard
 and the MCP server, allowing browser-based access to MCP tools.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import queue
+import csv
+import gzip
+import hmac
+import io
 import json
+import os
+import re
 import threading
 import time
 import logging
 from datetime import datetime, timedelta
 
+# Arrow IPC export is optional
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 # Import server functions for direct access when date filtering is needed
 try:
-    from server import _generate_sector_overview, _get_brand_granular_details
+    from server import (
+        _generate_sector_overview, _get_brand_granular_details, _get_brand_details_batch, _generate_subcategory_analysis,
+        _iter_ads_ndjson, event_broker, _get_brand_changes, _reload_brand_dataset, start_brand_dataset_watcher,
+        BRANDS_DATASET_PATH, _export_batches, EXPORT_FIELDS, _run_brand_query,
+        _run_brand_sql, _generate_global_leaderboard, _find_similar_brands,
+        _simulate_budget_shift, _get_spend_anomalies, _generate_industry_matrix, _get_provider_quotas
+    )
+    from brand_import import import_brand_spend
+    from rate_limiter import rate_limiter
 except ImportError:
+    import_brand_spend = None
+    rate_limiter = None
+    _get_provider_quotas = None
+    _run_brand_query = None
+    _run_brand_sql = None
+    _generate_global_leaderboard = None
+    _find_similar_brands = None
+    _simulate_budget_shift = None
+    _get_spend_anomalies = None
+    _generate_industry_matrix = None
+    _export_batches = None
+    _reload_brand_dataset = None
+    start_brand_dataset_watcher = None
+    _get_brand_changes = None
+    event_broker = None
+    _iter_ads_ndjson = None
     _generate_sector_overview = None
     _get_brand_granular_details = None
+    _get_brand_details_batch = None
+    _generate_subcategory_analysis = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -36,16 +76,50 @@ mcp_tools = {
     'analyze_ad_trends': 'mcp__ads-transparency__analyze_ad_trends', 
     'get_top_advertisers': 'mcp__ads-transparency__get_top_advertisers',
     'compare_industries': 'mcp__ads-transparency__compare_industries',
+    'compare_industries_matrix': 'mcp__ads-transparency__compare_industries_matrix',
     'search_google_ads_by_industry': 'mcp__ads-transparency__search_google_ads_by_industry',
     'get_all_brands_by_industry': 'mcp__ads-transparency__get_all_brands_by_industry',
     'compare_meta_vs_google_ads': 'mcp__ads-transparency__compare_meta_vs_google_ads',
     'analyze_brand_advertising_strategy': 'mcp__ads-transparency__analyze_brand_advertising_strategy',
     'get_sector_overview_eur': 'mcp__ads-transparency__get_sector_overview_eur',
     'get_brand_details_eur': 'mcp__ads-transparency__get_brand_details_eur',
+    'get_brand_details_batch_eur': 'mcp__ads-transparency__get_brand_details_batch_eur',
     'get_country_brand_analysis_eur': 'mcp__ads-transparency__get_country_brand_analysis_eur',
-    'get_subcategory_analysis_eur': 'mcp__ads-transparency__get_subcategory_analysis_eur'
+    'get_subcategory_analysis_eur': 'mcp__ads-transparency__get_subcategory_analysis_eur',
+    'get_global_leaderboard_eur': 'mcp__ads-transparency__get_global_leaderboard_eur',
+    'query_brands_eur': 'mcp__ads-transparency__query_brands_eur',
+    'query_brands_sql': 'mcp__ads-transparency__query_brands_sql',
+    'find_similar_brands': 'mcp__ads-transparency__find_similar_brands',
+    'simulate_budget_shift': 'mcp__ads-transparency__simulate_budget_shift',
+    'get_spend_anomalies': 'mcp__ads-transparency__get_spend_anomalies',
+    'get_provider_quotas': 'mcp__ads-transparency__get_provider_quotas'
 }
 
+# Bounded worker pool for endpoints that compute several results concurrently
+worker_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='bridge-worker')
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+# Upper bound on sub-requests accepted by /api/batch
+MAX_BATCH_ITEMS = 100
+
+# Longest trend history accepted by /api/ads/trends, matching the server's cap
+MAX_TREND_DAYS = 365
+
+# Shared secret for /api/admin endpoints; they refuse every request while it is unset
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Export formats: query value -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows')
+}
+
+# Idle seconds before the live event feed sends a keep-alive comment
+SSE_HEARTBEAT_SECONDS = 15
+
 def start_mcp_server():
     """Start the MCP server process"""
     global mcp_process
@@ -78,7 +152,8 @@ def call_mcp_tool(tool_name, **kwargs):
         elif tool_name == 'analyze_ad_trends':
             return server.analyze_ad_trends(
                 kwargs.get('industry', 'technology'),
-                kwargs.get('days_back', 7)
+                kwargs.get('days_back', 7),
+                kwargs.get('forecast_days', 7)
             )
         elif tool_name == 'get_top_advertisers':
             return server.get_top_advertisers(
@@ -91,6 +166,11 @@ def call_mcp_tool(tool_name, **kwargs):
                 kwargs.get('industry2', 'automotive'),
                 kwargs.get('metric', 'ad_volume')
             )
+        elif tool_name == 'compare_industries_matrix':
+            return server.compare_industries_matrix(
+                kwargs.get('metric', 'ad_volume'),
+                kwargs.get('industries')
+            )
         elif tool_name == 'search_google_ads_by_industry':
             return server.search_google_ads_by_industry(
                 kwargs.get('industry', 'technology'),
@@ -105,7 +185,9 @@ def call_mcp_tool(tool_name, **kwargs):
         elif tool_name == 'compare_meta_vs_google_ads':
             return server.compare_meta_vs_google_ads(
                 kwargs.get('industry', 'technology'),
-                kwargs.get('metric', 'reach')
+                kwargs.get('metric', 'reach'),
+                kwargs.get('access_token'),
+                kwargs.get('google_api_key')
             )
         elif tool_name == 'analyze_brand_advertising_strategy':
             return server.analyze_brand_advertising_strategy(
@@ -117,26 +199,117 @@ def call_mcp_tool(tool_name, **kwargs):
             return server.get_sector_overview_eur(
                 kwargs.get('industry', 'technology'),
                 kwargs.get('currency', 'EUR'),
-                kwargs.get('country_filter', 'all')
+                kwargs.get('country_filter', 'all'),
+                kwargs.get('date_from'),
+                kwargs.get('date_to'),
+                kwargs.get('top_n', 10),
+                kwargs.get('offset', 0),
+                kwargs.get('cursor'),
+                kwargs.get('sort_by', 'total_spend'),
+                kwargs.get('fields'),
+                kwargs.get('format', 'both')
             )
         elif tool_name == 'get_brand_details_eur':
             return server.get_brand_details_eur(
                 kwargs.get('brand_name', 'SAP'),
                 kwargs.get('industry', 'technology'),
                 kwargs.get('currency', 'EUR'),
-                kwargs.get('country_filter', 'all')
+                kwargs.get('country_filter', 'all'),
+                kwargs.get('date_from'),
+                kwargs.get('date_to'),
+                kwargs.get('fields'),
+                kwargs.get('format', 'both')
+            )
+        elif tool_name == 'get_brand_details_batch_eur':
+            return server.get_brand_details_batch_eur(
+                kwargs.get('brand_names', []),
+                kwargs.get('industry', 'technology'),
+                kwargs.get('currency', 'EUR'),
+                kwargs.get('country_filter', 'all'),
+                kwargs.get('date_from'),
+                kwargs.get('date_to'),
+                kwargs.get('fields'),
+                kwargs.get('format', 'both')
             )
         elif tool_name == 'get_country_brand_analysis_eur':
             return server.get_country_brand_analysis_eur(
-                kwargs.get('country', 'Germany'),
-                kwargs.get('currency', 'EUR')
+                kwargs.get('country', 'Belgium'),
+                kwargs.get('currency', 'EUR'),
+                kwargs.get('top_n', 15),
+                kwargs.get('offset', 0),
+                kwargs.get('cursor'),
+                kwargs.get('sort_by', 'annual_ad_spend'),
+                kwargs.get('fields'),
+                kwargs.get('format', 'both')
             )
         elif tool_name == 'get_subcategory_analysis_eur':
             return server.get_subcategory_analysis_eur(
                 kwargs.get('industry', 'technology'),
                 kwargs.get('subcategory', 'enterprise'),
                 kwargs.get('currency', 'EUR'),
-                kwargs.get('country_filter', 'all')
+                kwargs.get('country_filter', 'all'),
+                kwargs.get('top_n', 50),
+                kwargs.get('offset', 0),
+                kwargs.get('cursor'),
+                kwargs.get('sort_by', 'annual_ad_spend'),
+                kwargs.get('fields'),
+                kwargs.get('format', 'both')
+            )
+        elif tool_name == 'query_brands_eur':
+            return server.query_brands_eur(
+                kwargs.get('group_by'),
+                kwargs.get('aggregates'),
+                kwargs.get('filters'),
+                kwargs.get('order_by'),
+                kwargs.get('limit', 100),
+                kwargs.get('currency', 'EUR'),
+                kwargs.get('date_from'),
+                kwargs.get('date_to')
+            )
+        elif tool_name == 'get_global_leaderboard_eur':
+            return server.get_global_leaderboard_eur(
+                kwargs.get('country_filter', 'all'),
+                kwargs.get('currency', 'EUR'),
+                kwargs.get('date_from'),
+                kwargs.get('date_to'),
+                kwargs.get('top_n', 50),
+                kwargs.get('offset', 0),
+                kwargs.get('cursor'),
+                kwargs.get('sort_by', 'total_spend'),
+                kwargs.get('fields'),
+                kwargs.get('format', 'both')
+            )
+        elif tool_name == 'find_similar_brands':
+            return server.find_similar_brands(
+                kwargs.get('brand_name', ''),
+                kwargs.get('industry', 'technology'),
+                kwargs.get('scope', 'industry'),
+                kwargs.get('top_n', 10)
+            )
+        elif tool_name == 'simulate_budget_shift':
+            return server.simulate_budget_shift(
+                kwargs.get('industry', 'technology'),
+                kwargs.get('brand_name'),
+                kwargs.get('scenarios'),
+                kwargs.get('grid'),
+                kwargs.get('currency', 'EUR')
+            )
+        elif tool_name == 'get_spend_anomalies':
+            return server.get_spend_anomalies(
+                kwargs.get('industry'),
+                kwargs.get('advertiser'),
+                kwargs.get('platform'),
+                kwargs.get('metric'),
+                kwargs.get('since', 0),
+                kwargs.get('limit', 50)
+            )
+        elif tool_name == 'get_provider_quotas':
+            return server.get_provider_quotas(kwargs.get('provider'))
+        elif tool_name == 'query_brands_sql':
+            return server.query_brands_sql(
+                kwargs.get('sql', ''),
+                kwargs.get('params'),
+                kwargs.get('max_rows', 1000)
             )
         else:
             return json.dumps({"error": f"Unknown tool: {tool_name}"})
@@ -145,6 +318,60 @@ def call_mcp_tool(tool_name, **kwargs):
         logger.error(f"Error calling MCP tool {tool_name}: {e}")
         return json.dumps({"error": str(e)})
 
+def parse_tool_output(result):
+    """Extract the JSON payload from an MCP tool's text output.
+    
+    Tools report validation failures as plain text, which is raised as ValueError.
+    """
+    if not isinstance(result, str):
+        return result
+    json_match = re.search(r'\{.*\}|\[.*\]', result, re.DOTALL)
+    if not json_match:
+        raise ValueError(result)
+    return json.loads(json_match.group())
+
+def compressed_json(payload, status=200):
+    """Serialize a payload once and gzip it when the client accepts it."""
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    response = app.response_class(body, status=status, mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    if len(body) >= MIN_COMPRESS_BYTES and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response.set_data(gzip.compress(body, compresslevel=5))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def admin_authorized():
+    """Check the X-Admin-Token header against ADMIN_TOKEN; nothing is authorized without one configured."""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def run_panels(panels):
+    """Run named panel callables concurrently on the worker pool.
+    
+    Each panel reports its own status and timing, so one failing panel does
+    not fail the others. Used for dashboard panels and batched tool calls.
+    """
+    def timed(panel):
+        started = time.perf_counter()
+        try:
+            data = panel()
+            if isinstance(data, dict) and 'error' in data:
+                status, error = 'error', data['error']
+            else:
+                status, error = 'ok', None
+        except Exception as e:
+            logger.error(f"Panel failed: {e}")
+            data, status, error = None, 'error', str(e)
+        result = {'status': status, 'elapsed_ms': round((time.perf_counter() - started) * 1000, 2), 'data': data}
+        if error:
+            result['error'] = error
+        return result
+    
+    futures = {name: worker_pool.submit(timed, panel) for name, panel in panels.items()}
+    return {name: future.result() for name, future in futures.items()}
+
 @app.route('/api/ads/search', methods=['POST'])
 def search_ads():
     """Search for ads by industry"""
@@ -153,13 +380,18 @@ def search_ads():
         industry = data.get('industry', 'technology')
         platform = data.get('platform', 'meta')
         limit = data.get('limit', 50)
+        credential = data.get('google_api_key') if platform == 'google' else data.get('meta_access_token')
+        
+        stream = data.get('stream') or 'application/x-ndjson' in request.headers.get('Accept', '')
+        if stream and _iter_ads_ndjson:
+            return stream_ads(industry, platform, limit, credential)
         
         if platform == 'google':
             result = call_mcp_tool('search_google_ads_by_industry', 
-                                 industry=industry, limit=limit)
+                                 industry=industry, limit=limit, google_api_key=credential)
         else:
             result = call_mcp_tool('search_ads_by_industry', 
-                                 industry=industry, limit=limit)
+                                 industry=industry, limit=limit, access_token=credential)
         
         # Parse the result if it's a string
         if isinstance(result, str):
@@ -182,16 +414,39 @@ def search_ads():
         logger.error(f"Error in search_ads: {e}")
         return jsonify({"error": str(e)}), 500
 
+def stream_ads(industry, platform, limit, credential=None):
+    """Stream ads as newline-delimited JSON straight from the provider pages, or demo ads without a credential."""
+    try:
+        lines = _iter_ads_ndjson(industry, limit, platform, credential)
+        first_line = next(lines, '')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    def generate():
+        yield first_line
+        try:
+            yield from lines
+        except Exception as e:
+            # Headers are already sent, so report the failure as a final line
+            logger.error(f"Error streaming ads: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/ads/trends', methods=['POST'])
 def analyze_trends():
     """Analyze ad trends for industry"""
     try:
         data = request.get_json()
         industry = data.get('industry', 'technology')
-        days_back = data.get('days_back', 7)
+        forecast_days = data.get('forecast_days', 7)
+        try:
+            days_back = max(1, min(MAX_TREND_DAYS, int(data.get('days_back', 7))))
+        except (TypeError, ValueError):
+            return jsonify({"error": "days_back must be an integer"}), 400
         
         result = call_mcp_tool('analyze_ad_trends', 
-                             industry=industry, days_back=days_back)
+                             industry=industry, days_back=days_back, forecast_days=forecast_days)
         
         # Parse and return result
         if isinstance(result, str):
@@ -277,7 +532,8 @@ def compare_platforms():
         metric = data.get('metric', 'reach')
         
         result = call_mcp_tool('compare_meta_vs_google_ads', 
-                             industry=industry, metric=metric)
+                             industry=industry, metric=metric, access_token=data.get('meta_access_token'),
+                             google_api_key=data.get('google_api_key'))
         
         # Parse and return result
         if isinstance(result, str):
@@ -359,6 +615,26 @@ def compare_industries_endpoint():
         logger.error(f"Error in compare_industries: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/ads/compare-industries/matrix', methods=['POST'])
+def compare_industries_matrix():
+    """Compare every pair of industries on one metric in a single request"""
+    try:
+        data = request.get_json(silent=True) or {}
+        metric = data.get('metric', 'ad_volume')
+        industries = data.get('industries')
+        
+        if _generate_industry_matrix:
+            result = _generate_industry_matrix(metric, industries)
+        else:
+            result = parse_tool_output(call_mcp_tool('compare_industries_matrix', metric=metric, industries=industries))
+        if "error" in result:
+            return jsonify(result), 400
+        return compressed_json(result)
+        
+    except Exception as e:
+        logger.error(f"Error in compare_industries_matrix: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/brands/sector-overview', methods=['POST'])
 def get_sector_overview():
     """Get comprehensive sector overview with European brands in EUR"""
@@ -369,16 +645,25 @@ def get_sector_overview():
         country_filter = data.get('country_filter', 'all')
         date_from = data.get('date_from')
         date_to = data.get('date_to')
+        top_n = data.get('top_n', 10)
+        offset = data.get('offset', 0)
+        cursor = data.get('cursor')
+        sort_by = data.get('sort_by', 'total_spend')
+        fields = data.get('fields')
+        response_format = data.get('format', 'both')
         
         # Use direct function call when date filtering is requested or server functions are available
         if (date_from and date_to and _generate_sector_overview) or _generate_sector_overview:
-            result = _generate_sector_overview(industry, currency, country_filter, date_from, date_to)
+            result = _generate_sector_overview(industry, currency, country_filter, date_from, date_to,
+                                               top_n, offset, cursor, sort_by, fields, response_format)
             return jsonify(result)
         
         # Fallback to MCP tool call for backwards compatibility
         result = call_mcp_tool('get_sector_overview_eur', 
                              industry=industry, currency=currency, country_filter=country_filter,
-                             date_from=date_from, date_to=date_to)
+                             date_from=date_from, date_to=date_to,
+                             top_n=top_n, offset=offset, cursor=cursor, sort_by=sort_by,
+                             fields=fields, format=response_format)
         
         # Parse and return result
         if isinstance(result, str):
@@ -398,6 +683,133 @@ def get_sector_overview():
         logger.error(f"Error in get_sector_overview: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/brands/leaderboard', methods=['POST'])
+def get_global_leaderboard():
+    """Get the top advertisers across all industries, optionally per country and date range"""
+    try:
+        data = request.get_json(silent=True) or {}
+        args = {
+            'country_filter': data.get('country_filter', 'all'),
+            'currency': data.get('currency', 'EUR'),
+            'date_from': data.get('date_from'),
+            'date_to': data.get('date_to'),
+            'top_n': data.get('top_n', 50),
+            'offset': data.get('offset', 0),
+            'cursor': data.get('cursor'),
+            'sort_by': data.get('sort_by', 'total_spend'),
+            'fields': data.get('fields')
+        }
+        response_format = data.get('format', 'both')
+        
+        if _generate_global_leaderboard:
+            result = _generate_global_leaderboard(response_format=response_format, **args)
+        else:
+            result = parse_tool_output(call_mcp_tool('get_global_leaderboard_eur', format=response_format, **args))
+        if "error" in result:
+            return jsonify(result), 400
+        return compressed_json(result)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in get_global_leaderboard: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/brands/similar', methods=['POST'])
+def find_similar_brands():
+    """Find brands with the most similar advertising profile, within an industry or across all of them"""
+    try:
+        data = request.get_json(silent=True) or {}
+        brand_name = data.get('brand_name', '')
+        industry = data.get('industry', 'technology')
+        scope = data.get('scope', 'industry')
+        top_n = data.get('top_n', 10)
+        
+        if _find_similar_brands:
+            result = _find_similar_brands(brand_name, industry, scope, top_n)
+        else:
+            result = parse_tool_output(call_mcp_tool('find_similar_brands', brand_name=brand_name, industry=industry,
+                                                     scope=scope, top_n=top_n))
+        if "error" in result:
+            return jsonify(result), 404 if "not found" in result["error"] else 400
+        return compressed_json(result)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in find_similar_brands: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/brands/simulate-budget-shift', methods=['POST'])
+def simulate_budget_shift():
+    """Evaluate a batch of budget what-if scenarios for a brand or a whole industry"""
+    try:
+        data = request.get_json(silent=True) or {}
+        industry = data.get('industry', 'technology')
+        brand_name = data.get('brand_name')
+        scenarios = data.get('scenarios')
+        grid = data.get('grid')
+        currency = data.get('currency', 'EUR')
+        
+        if _simulate_budget_shift:
+            result = _simulate_budget_shift(industry, brand_name, scenarios, grid, currency)
+        else:
+            result = parse_tool_output(call_mcp_tool('simulate_budget_shift', industry=industry, brand_name=brand_name,
+                                                     scenarios=scenarios, grid=grid, currency=currency))
+        if "error" in result:
+            return jsonify(result), 400
+        return compressed_json(result)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in simulate_budget_shift: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/anomalies', methods=['GET'])
+def get_spend_anomalies():
+    """Get spikes and drops flagged in ingested spend and ad-volume series; poll with since=<last_seq>"""
+    try:
+        filters = {key: request.args.get(key) for key in ('industry', 'advertiser', 'platform', 'metric')}
+        # Passed through unconverted so malformed values are rejected rather than defaulted
+        since = request.args.get('since', 0)
+        limit = request.args.get('limit', 50)
+        
+        if _get_spend_anomalies:
+            result = _get_spend_anomalies(since=since, limit=limit, **filters)
+        else:
+            result = parse_tool_output(call_mcp_tool('get_spend_anomalies', since=since, limit=limit, **filters))
+        if "error" in result:
+            return jsonify(result), 400
+        return compressed_json(result)
+        
+    except Exception as e:
+        logger.error(f"Error in get_spend_anomalies: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/metrics/rate-limits', methods=['GET'])
+def get_rate_limit_metrics():
+    """Get ad provider rate-limit buckets as JSON, or as Prometheus text with format=prometheus"""
+    try:
+        provider = request.args.get('provider')
+        
+        if request.args.get('format') == 'prometheus':
+            if not rate_limiter:
+                return jsonify({"error": "Prometheus format requires the server module"}), 500
+            return Response(rate_limiter.prometheus(), mimetype='text/plain; version=0.0.4')
+        
+        if _get_provider_quotas:
+            result = _get_provider_quotas(provider)
+        else:
+            result = parse_tool_output(call_mcp_tool('get_provider_quotas', provider=provider))
+        if "error" in result:
+            return jsonify(result), 400
+        return compressed_json(result)
+        
+    except Exception as e:
+        logger.error(f"Error in get_rate_limit_metrics: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/brands/brand-details', methods=['POST'])
 def get_brand_details():
     """Get detailed brand information in EUR"""
@@ -409,16 +821,19 @@ def get_brand_details():
         country_filter = data.get('country_filter', 'all')
         date_from = data.get('date_from')
         date_to = data.get('date_to')
+        fields = data.get('fields')
+        response_format = data.get('format', 'both')
         
         # Use direct function call when date filtering is requested or server functions are available
         if (date_from and date_to and _get_brand_granular_details) or _get_brand_granular_details:
-            result = _get_brand_granular_details(brand_name, industry, currency, country_filter, date_from, date_to)
+            result = _get_brand_granular_details(brand_name, industry, currency, country_filter, date_from, date_to,
+                                                 fields, response_format)
             return jsonify(result)
         
         # Fallback to MCP tool call for backwards compatibility
         result = call_mcp_tool('get_brand_details_eur',
                              brand_name=brand_name, industry=industry, currency=currency, country_filter=country_filter,
-                             date_from=date_from, date_to=date_to)
+                             date_from=date_from, date_to=date_to, fields=fields, format=response_format)
         
         # Parse and return result
         if isinstance(result, str):
@@ -438,16 +853,179 @@ def get_brand_details():
         logger.error(f"Error in get_brand_details: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/brands/brand-details/batch', methods=['POST'])
+def get_brand_details_batch():
+    """Get detailed information for many brands of one industry in EUR"""
+    try:
+        data = request.get_json()
+        brand_names = data.get('brand_names', [])
+        industry = data.get('industry', 'technology')
+        currency = data.get('currency', 'EUR')
+        country_filter = data.get('country_filter', 'all')
+        date_from = data.get('date_from')
+        date_to = data.get('date_to')
+        fields = data.get('fields')
+        response_format = data.get('format', 'both')
+        
+        if _get_brand_details_batch:
+            result = _get_brand_details_batch(brand_names, industry, currency, country_filter, date_from, date_to,
+                                              fields, response_format)
+            if "error" in result:
+                return jsonify(result), 400
+            return jsonify(result)
+        
+        # Fallback to MCP tool call when server functions cannot be imported
+        result = call_mcp_tool('get_brand_details_batch_eur',
+                             brand_names=brand_names, industry=industry, currency=currency, country_filter=country_filter,
+                             date_from=date_from, date_to=date_to, fields=fields, format=response_format)
+        
+        # Parse and return result
+        if isinstance(result, str):
+            import re
+            json_match = re.search(r'\{.*\}', result, re.DOTALL)
+            if json_match:
+                return jsonify(json.loads(json_match.group()))
+            return jsonify({"error": result}), 400
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error in get_brand_details_batch: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/brands/changes', methods=['GET'])
+def get_brand_changes():
+    """Get brand rows changed since a data version, for delta sync"""
+    try:
+        if _get_brand_changes is None:
+            return jsonify({"error": "Delta sync requires the MCP server module"}), 503
+        
+        since = request.args.get('since', type=int)
+        if since is None:
+            return jsonify({"error": "Query parameter 'since' must be an integer version"}), 400
+        
+        result = _get_brand_changes(since, request.args.get('industry'))
+        if "error" in result:
+            return jsonify(result), 410 if result.get("full_resync") else 400
+        return compressed_json(result)
+        
+    except Exception as e:
+        logger.error(f"Error in get_brand_changes: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/brands/query', methods=['POST'])
+def query_brands():
+    """Run an ad-hoc aggregate query (filters, group_by, aggregates, order_by, limit) over brand spend"""
+    try:
+        data = request.get_json(silent=True) or {}
+        query = {key: data.get(key) for key in ('filters', 'group_by', 'aggregates', 'order_by')}
+        query['limit'] = data.get('limit', 100)
+        currency = data.get('currency', 'EUR')
+        date_from = data.get('date_from')
+        date_to = data.get('date_to')
+        
+        if _run_brand_query:
+            result = _run_brand_query(query, currency, date_from, date_to)
+        else:
+            result = parse_tool_output(call_mcp_tool('query_brands_eur', currency=currency, date_from=date_from,
+                                                     date_to=date_to, **query))
+        if "error" in result:
+            return jsonify(result), 400
+        return compressed_json(result)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in query_brands: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/sql', methods=['POST'])
+def query_sql():
+    """Run a read-only SQL SELECT over the brand store and ad archive (opt-in via BRAND_SQL_ENABLED)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        sql = data.get('sql', '')
+        params = data.get('params')
+        max_rows = data.get('max_rows', 1000)
+        
+        if _run_brand_sql:
+            result = _run_brand_sql(sql, params, max_rows, data.get('timeout', 2.0))
+        else:
+            result = parse_tool_output(call_mcp_tool('query_brands_sql', sql=sql, params=params, max_rows=max_rows))
+        if "error" in result:
+            return jsonify(result), 403 if "disabled" in result["error"] else 400
+        return compressed_json(result)
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in query_sql: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/admin/brands/reload', methods=['POST'])
+def reload_brand_dataset():
+    """Swap in a new version of the brand dataset file without a restart"""
+    try:
+        if not admin_authorized():
+            return jsonify({"error": "Invalid admin token" if ADMIN_TOKEN else "Admin endpoints are disabled; set ADMIN_TOKEN"}), 403
+        if _reload_brand_dataset is None:
+            return jsonify({"error": "Dataset reload requires the MCP server module"}), 503
+        
+        data = request.get_json(silent=True) or {}
+        result = _reload_brand_dataset(bool(data.get('force', False)))
+        if "error" in result:
+            return jsonify(result), 500
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error in reload_brand_dataset: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/admin/brands/import', methods=['POST'])
+def import_brand_data():
+    """Bulk import a CSV or JSONL spend file as a new brand dataset version"""
+    try:
+        if not admin_authorized():
+            return jsonify({"error": "Invalid admin token" if ADMIN_TOKEN else "Admin endpoints are disabled; set ADMIN_TOKEN"}), 403
+        if import_brand_spend is None:
+            return jsonify({"error": "Brand import requires the MCP server module"}), 503
+        
+        upload = request.files.get('file')
+        import_format = request.args.get('format')
+        if not import_format:
+            filename = upload.filename if upload else ''
+            content_type = upload.content_type if upload else request.content_type or ''
+            is_jsonl = filename.endswith(('.jsonl', '.ndjson')) or 'ndjson' in content_type or 'jsonl' in content_type
+            import_format = 'jsonl' if is_jsonl else 'csv'
+        mode = request.args.get('mode', 'merge')
+        
+        # Decode the upload as it is read instead of buffering it
+        raw = upload.stream if upload else request.stream
+        stream = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        report = import_brand_spend(stream, BRANDS_DATASET_PATH, import_format, mode)
+        if "error" in report:
+            return jsonify(report), 400
+        
+        report["reload"] = _reload_brand_dataset()
+        return jsonify(report)
+        
+    except Exception as e:
+        logger.error(f"Error in import_brand_data: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/brands/country-analysis', methods=['POST'])
 def get_country_analysis():
     """Get analysis of brands from a specific country"""
     try:
         data = request.get_json()
-        country = data.get('country', 'Germany')
+        country = data.get('country', 'Belgium')
         currency = data.get('currency', 'EUR')
         
         result = call_mcp_tool('get_country_brand_analysis_eur',
-                             country=country, currency=currency)
+                             country=country, currency=currency,
+                             top_n=data.get('top_n', 15), offset=data.get('offset', 0),
+                             cursor=data.get('cursor'), sort_by=data.get('sort_by', 'annual_ad_spend'),
+                             fields=data.get('fields'), format=data.get('format', 'both'))
         
         # Parse and return result
         if isinstance(result, str):
@@ -478,7 +1056,10 @@ def get_subcategory_analysis():
         country_filter = data.get('country_filter', 'all')
         
         result = call_mcp_tool('get_subcategory_analysis_eur',
-                             industry=industry, subcategory=subcategory, currency=currency, country_filter=country_filter)
+                             industry=industry, subcategory=subcategory, currency=currency, country_filter=country_filter,
+                             top_n=data.get('top_n', 50), offset=data.get('offset', 0),
+                             cursor=data.get('cursor'), sort_by=data.get('sort_by', 'annual_ad_spend'),
+                             fields=data.get('fields'), format=data.get('format', 'both'))
         
         # Parse and return result
         if isinstance(result, str):
@@ -498,6 +1079,255 @@ def get_subcategory_analysis():
         logger.error(f"Error in get_subcategory_analysis: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/dashboard/bootstrap', methods=['POST'])
+def dashboard_bootstrap():
+    """Compute every dashboard panel concurrently and return them in one response"""
+    try:
+        started = time.perf_counter()
+        data = request.get_json() or {}
+        industry = data.get('industry', 'technology')
+        currency = data.get('currency', 'EUR')
+        countries = data.get('countries', 'all')
+        country_filter = data.get('country_filter', 'all' if ',' in countries else countries)
+        platform = data.get('platform', 'both')
+        brand_name = data.get('brand_name')
+        subcategory = data.get('subcategory', 'luxury')
+        date_from = data.get('date_from')
+        date_to = data.get('date_to')
+        limit = data.get('limit', 20)
+        
+        def campaigns():
+            result = {}
+            if platform in ('meta', 'both'):
+                result['meta'] = parse_tool_output(call_mcp_tool(
+                    'search_ads_by_industry', industry=industry, limit=limit, access_token=data.get('meta_access_token')))
+            if platform in ('google', 'both'):
+                result['google'] = parse_tool_output(call_mcp_tool(
+                    'search_google_ads_by_industry', industry=industry, limit=limit))
+            return result
+        
+        def sector_overview():
+            if _generate_sector_overview:
+                return _generate_sector_overview(industry, currency, country_filter, date_from, date_to,
+                                                 data.get('top_n', 10))
+            return parse_tool_output(call_mcp_tool('get_sector_overview_eur', industry=industry, currency=currency,
+                                                   country_filter=country_filter, date_from=date_from, date_to=date_to))
+        
+        def brand_details():
+            if _get_brand_granular_details:
+                return _get_brand_granular_details(brand_name, industry, currency, country_filter, date_from, date_to)
+            return parse_tool_output(call_mcp_tool('get_brand_details_eur', brand_name=brand_name, industry=industry,
+                                                   currency=currency, country_filter=country_filter,
+                                                   date_from=date_from, date_to=date_to))
+        
+        def subcategory_analysis():
+            if _generate_subcategory_analysis:
+                return _generate_subcategory_analysis(industry, subcategory, currency, country_filter)
+            return parse_tool_output(call_mcp_tool('get_subcategory_analysis_eur', industry=industry, subcategory=subcategory,
+                                                   currency=currency, country_filter=country_filter))
+        
+        panels = {
+            'campaigns': campaigns,
+            'sector_overview': sector_overview,
+            'subcategory_analysis': subcategory_analysis
+        }
+        if brand_name:
+            panels['brand_details'] = brand_details
+        
+        requested = data.get('panels')
+        if requested:
+            panels = {name: panel for name, panel in panels.items() if name in requested}
+        
+        results = run_panels(panels)
+        failed = sum(1 for panel in results.values() if panel['status'] == 'error')
+        if not failed:
+            status = 'ok'
+        elif failed < len(results):
+            status = 'partial'
+        else:
+            status = 'error'
+        
+        return compressed_json({
+            'status': status,
+            'industry': industry,
+            'currency': currency,
+            'country_filter': country_filter,
+            'panels': results,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+            'generated_at': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in dashboard_bootstrap: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/batch', methods=['POST'])
+def batch_tool_calls():
+    """Dispatch many MCP tool calls in one request"""
+    try:
+        started = time.perf_counter()
+        data = request.get_json() or {}
+        items = data.get('requests', data) if isinstance(data, dict) else data
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Expected a non-empty list of {tool, args} requests"}), 400
+        if len(items) > MAX_BATCH_ITEMS:
+            return jsonify({"error": f"At most {MAX_BATCH_ITEMS} requests can be batched"}), 400
+        
+        # Identical sub-requests share one call, keyed by their canonical JSON
+        item_keys = []
+        calls = {}
+        invalid = {}
+        for index, item in enumerate(items):
+            tool = item.get('tool') if isinstance(item, dict) else None
+            args = item.get('args', {}) if isinstance(item, dict) else None
+            if not isinstance(tool, str) or tool not in mcp_tools:
+                invalid[index] = f"Unknown tool: {tool}"
+                item_keys.append(None)
+                continue
+            if not isinstance(args, dict):
+                invalid[index] = "args must be an object"
+                item_keys.append(None)
+                continue
+            
+            key = json.dumps([tool, args], sort_keys=True)
+            if key not in calls:
+                calls[key] = lambda tool=tool, args=args: parse_tool_output(call_mcp_tool(tool, **args))
+            item_keys.append(key)
+        
+        outcomes = run_panels(calls)
+        
+        results = []
+        for index, key in enumerate(item_keys):
+            if key is None:
+                results.append({'index': index, 'status': 'error', 'error': invalid[index]})
+            else:
+                results.append({'index': index, 'tool': items[index]['tool'], **outcomes[key]})
+        
+        failed = sum(1 for result in results if result['status'] == 'error')
+        return compressed_json({
+            'status': 'ok' if not failed else ('partial' if failed < len(results) else 'error'),
+            'results': results,
+            'unique_calls': len(calls),
+            'deduplicated': len(items) - len(invalid) - len(calls),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in batch_tool_calls: {e}")
+        return jsonify({"error": str(e)}), 500
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to a streaming response."""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def export_csv(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        batch['platforms'] = ['|'.join(platforms) for platforms in batch['platforms']]
+        writer.writerows(zip(*(batch[field] for field in EXPORT_FIELDS)))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def export_jsonl(batches):
+    for batch in batches:
+        rows = (dict(zip(EXPORT_FIELDS, values)) for values in zip(*(batch[field] for field in EXPORT_FIELDS)))
+        yield ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows)
+
+def export_arrow(batches):
+    schema = pyarrow.schema([
+        ('industry', pyarrow.string()), ('brand_name', pyarrow.string()),
+        ('belgium_spend', pyarrow.float64()), ('france_spend', pyarrow.float64()), ('total_spend', pyarrow.float64()),
+        ('market_share_be', pyarrow.float64()), ('market_share_fr', pyarrow.float64()),
+        ('platforms', pyarrow.list_(pyarrow.string())), ('currency', pyarrow.string())
+    ])
+    sink = ChunkSink()
+    with pyarrow.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(pyarrow.record_batch([batch[field] for field in EXPORT_FIELDS], schema=schema))
+            yield sink.drain()
+    # Closing the writer appends the end-of-stream marker
+    yield sink.drain()
+
+@app.route('/api/export', methods=['GET', 'POST'])
+def export_brands():
+    """Stream a brand view as CSV, JSONL or Arrow IPC"""
+    if _export_batches is None:
+        return jsonify({"error": "Export requires the MCP server module"}), 503
+    
+    params = request.args.to_dict()
+    if request.method == 'POST':
+        params.update(request.get_json(silent=True) or {})
+    
+    export_format = params.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported export format '{export_format}'", "available_formats": list(EXPORT_FORMATS)}), 400
+    if export_format == 'arrow' and pyarrow is None:
+        return jsonify({"error": "Arrow export requires the optional pyarrow package"}), 501
+    
+    industry = params.get('industry', 'all')
+    try:
+        batches = _export_batches(industry, params.get('country_filter', 'all'), params.get('currency', 'EUR'),
+                                  params.get('date_from'), params.get('date_to'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    serializer = {'csv': export_csv, 'jsonl': export_jsonl, 'arrow': export_arrow}[export_format]
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    response = Response(stream_with_context(serializer(batches)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=brands_{industry.lower()}.{extension}'
+    return response
+
+@app.route('/api/events', methods=['GET'])
+def live_events():
+    """Server-Sent Events feed of sector, ad and cache-refresh updates"""
+    if event_broker is None:
+        return jsonify({"error": "Live events require the MCP server module"}), 503
+    
+    topics = [t for t in request.args.get('topics', '').split(',') if t] or None
+    subscription = event_broker.subscribe(topics)
+    
+    def generate():
+        try:
+            yield f"retry: {SSE_HEARTBEAT_SECONDS * 1000}\n\n"
+            while True:
+                try:
+                    event = subscription.queue.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    if subscription.dropped:
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: {event['topic']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+                if subscription.dropped and subscription.queue.empty():
+                    break
+            # Tell the client it fell behind so it can refetch full state
+            yield "event: dropped\ndata: {\"reason\": \"slow consumer\"}\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/')
 def dashboard():
     """Serve the main dashboard"""
@@ -837,11 +1667,13 @@ def _generate_demo_subcategory_analysis(industry, subcategory, currency):
     }
 
 if __name__ == "__main__":
-    import os
     port = int(os.environ.get('PORT', 3000))
     debug_mode = os.environ.get('FLASK_ENV') != 'production'
     
     logger.info(f"Starting HTTP Bridge Server on port {port}...")
     
+    if start_brand_dataset_watcher:
+        start_brand_dataset_watcher()
+    
     # Start the bridge server
     app.run(host='0.0.0.0', port=port, debug=debug_mode)
\ No newline at end of file
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Incrementally maintained market concentration for one market slice
+
+A slice (an industry, country or subcategory) keeps the running sum of its
+members' spend and of their squared spend, plus its members in two persistent
+treaps: one ordered by spend, whose nodes carry their subtree's size and
+spend, and one ordered by name to look up a member's current spend. The
+Herfindahl index is sum(spend^2) / total^2, so updating one member adjusts
+the two sums and replaces one path in each treap, and top-N share sums the
+first N members down one path: both O(log n).
+
+Updates copy the nodes on the changed paths instead of modifying them, so a
+copy of a slice shares every node with the original and costs O(1).
+"""
+
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class _Node:
+    """Treap node holding a member's spend; never modified once linked into a tree."""
+
+    __slots__ = ("key", "value", "priority", "left", "right", "size", "spend")
+
+    def __init__(self, key: Hashable, value: float, priority: int, left: Optional["_Node"], right: Optional["_Node"]):
+        self.key = key
+        self.value = value
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        self.spend = value + (left.spend if left else 0.0) + (right.spend if right else 0.0)
+
+    def with_children(self, left: Optional["_Node"], right: Optional["_Node"]) -> "_Node":
+        return _Node(self.key, self.value, self.priority, left, right)
+
+def _priority(name: str) -> int:
+    # Derived from the name, so tree shapes and float sums are the same on every run
+    return zlib.crc32(name.encode("utf-8"))
+
+def _split(node: Optional[_Node], key) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split into nodes ordered before key and the rest, copying the split path."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        return node.with_children(node.left, left), right
+    left, right = _split(node.left, key)
+    return left, node.with_children(right, node.right)
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Join two treaps where every key of left orders before every key of right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority >= right.priority:
+        return left.with_children(left.left, _merge(left.right, right))
+    return right.with_children(_merge(left, right.left), right.right)
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    """Add a node whose key is not in the treap yet."""
+    if node is None or new.priority > node.priority:
+        left, right = _split(node, new.key)
+        return new.with_children(left, right)
+    if new.key < node.key:
+        return node.with_children(_insert(node.left, new), node.right)
+    return node.with_children(node.left, _insert(node.right, new))
+
+def _delete(node: Optional[_Node], key) -> Optional[_Node]:
+    if node is None:
+        return None
+    if key == node.key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        return node.with_children(_delete(node.left, key), node.right)
+    return node.with_children(node.left, _delete(node.right, key))
+
+def _find(node: Optional[_Node], key) -> Optional[_Node]:
+    while node is not None and node.key != key:
+        node = node.left if key < node.key else node.right
+    return node
+
+def _build(entries: List[Tuple[Hashable, float, str]]) -> Optional[_Node]:
+    """Build a treap from (key, value, name) entries sorted by key, in linear time."""
+    # Cartesian tree construction on mutable [key, value, priority, left, right] lists,
+    # converted to nodes bottom-up once the shape is final
+    spine: List[list] = []
+    for key, value, name in entries:
+        entry = [key, value, _priority(name), None, None]
+        last = None
+        while spine and spine[-1][2] < entry[2]:
+            last = spine.pop()
+        entry[3] = last
+        if spine:
+            spine[-1][4] = entry
+        spine.append(entry)
+
+    def freeze(entry):
+        if entry is None:
+            return None
+        return _Node(entry[0], entry[1], entry[2], freeze(entry[3]), freeze(entry[4]))
+
+    return freeze(spine[0]) if spine else None
+
+class ConcentrationSlice:
+    """Running spend totals and persistent spend- and name-ordered member treaps for one market slice."""
+
+    __slots__ = ("total", "sum_squares", "_ranked", "_members")
+
+    def __init__(self):
+        self.total = 0.0
+        self.sum_squares = 0.0
+        # Keys (-spend, name) ascending, i.e. spend descending with ties by name
+        self._ranked: Optional[_Node] = None
+        # Keys are member names
+        self._members: Optional[_Node] = None
+
+    @classmethod
+    def from_values(cls, values: Dict[str, float]) -> "ConcentrationSlice":
+        """Build a slice from member spends in one sort; zero spends are not members."""
+        slice_ = cls()
+        members = {name: value for name, value in values.items() if value > 0}
+        slice_._ranked = _build(sorted(((-value, name), value, name) for name, value in members.items()))
+        slice_._members = _build(sorted((name, value, name) for name, value in members.items()))
+        slice_.total = sum(members.values())
+        slice_.sum_squares = sum(value * value for value in members.values())
+        return slice_
+
+    def copy(self) -> "ConcentrationSlice":
+        slice_ = ConcentrationSlice()
+        slice_.total = self.total
+        slice_.sum_squares = self.sum_squares
+        slice_._ranked = self._ranked
+        slice_._members = self._members
+        return slice_
+
+    def __len__(self) -> int:
+        return self._members.size if self._members else 0
+
+    def update(self, name: str, value: float) -> None:
+        """Set a member's spend; zero removes it from the slice."""
+        old = self.value(name)
+        if old > 0:
+            self._ranked = _delete(self._ranked, (-old, name))
+            self._members = _delete(self._members, name)
+            self.total -= old
+            self.sum_squares -= old * old
+        if value > 0:
+            priority = _priority(name)
+            self._ranked = _insert(self._ranked, _Node((-value, name), value, priority, None, None))
+            self._members = _insert(self._members, _Node(name, value, priority, None, None))
+            self.total += value
+            self.sum_squares += value * value
+        if self._members is None:
+            # Drop accumulated rounding error once the slice is empty
+            self.total = 0.0
+            self.sum_squares = 0.0
+
+    def ranked(self) -> List[str]:
+        """Member names by spend, largest first."""
+        names = []
+        stack = []
+        node = self._ranked
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            names.append(node.key[1])
+            node = node.right
+        return names
+
+    def value(self, name: str) -> float:
+        node = _find(self._members, name)
+        return node.value if node else 0
+
+    def top_share(self, n: int) -> float:
+        """Combined spend share of the n largest members, in percent."""
+        if self.total <= 0:
+            return 0.0
+        spend = 0.0
+        node = self._ranked
+        while node is not None and n > 0:
+            left = node.left.size if node.left else 0
+            if n <= left:
+                node = node.left
+                continue
+            spend += (node.left.spend if node.left else 0.0) + node.value
+            n -= left + 1
+            node = node.right
+        return spend / self.total * 100
+
+    def herfindahl_index(self) -> float:
+        """Sum of squared spend shares, from 0 (fragmented) to 1 (monopoly)."""
+        return self.sum_squares / (self.total * self.total) if self.total > 0 else 0.0
+
+    def metrics(self) -> Dict:
+        return {
+            "brands": len(self),
+            "top_3_share": round(self.top_share(3), 2),
+            "top_5_share": round(self.top_share(5), 2),
+            "herfindahl_index": round(self.herfindahl_index(), 4)
+        }
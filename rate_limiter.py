@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Outbound request pacing per ad provider and credential
+
+Each (provider, credential) pair gets a token bucket sized to the provider's
+published limit: a full bucket allows a burst up to the quota, after which
+requests are paced at the refill rate. Usage headers returned by the provider
+shrink the bucket to what the provider reports is left, so pacing tracks the
+provider's own accounting. A rate-limit rejection blocks the bucket until
+its Retry-After has passed; without one, the bucket is emptied and blocked
+for an exponential backoff with full jitter.
+
+Credentials are identified by a digest and never stored. Buckets of the least
+recently used credentials are evicted once there are MAX_BUCKETS of them.
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+# Longest a request waits for a token before giving up
+MAX_WAIT_SECONDS = 30.0
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+# Retries after a throttled, failed or unreachable request
+MAX_RETRIES = 4
+# Least recently used buckets are evicted beyond this many (one per client-supplied credential)
+MAX_BUCKETS = 10000
+
+# Meta usage headers: JSON percentages of the rolling allowance already used
+META_USAGE_HEADERS = ("x-app-usage", "x-ad-account-usage", "x-business-use-case-usage")
+USAGE_FIELDS = ("call_count", "total_cputime", "total_time", "acc_id_util_pct")
+
+class QuotaExhausted(Exception):
+    """No request allowance within the wait limit."""
+
+    def __init__(self, wait_seconds: float):
+        super().__init__(f"No request allowance for {wait_seconds:.1f}s")
+        self.wait_seconds = wait_seconds
+
+def credential_id(credential: Optional[str]) -> str:
+    """Short digest naming a credential in metrics without revealing it."""
+    if not credential:
+        return "anonymous"
+    return hashlib.sha256(credential.encode("utf-8")).hexdigest()[:12]
+
+def _header_seconds(headers: Mapping[str, str], name: str) -> float:
+    """A numeric header's value, or 0 when it is missing or malformed."""
+    try:
+        value = float(headers.get(name) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if math.isfinite(value) else 0.0
+
+def _usage_from_headers(headers: Mapping[str, str]) -> Tuple[Optional[float], Optional[float]]:
+    """Fraction of the allowance used and seconds until access is regained, from Meta usage headers."""
+    used = None
+    regain = None
+    for name in META_USAGE_HEADERS:
+        raw = headers.get(name)
+        if not raw:
+            continue
+        try:
+            usage = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(usage, dict):
+            continue
+        # Business use case usage nests a list of entries per business id
+        if name == "x-business-use-case-usage":
+            entries = [entry for group in usage.values() if isinstance(group, list) for entry in group]
+        else:
+            entries = [usage]
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            for field in USAGE_FIELDS:
+                if isinstance(entry.get(field), (int, float)):
+                    used = max(used or 0.0, entry[field] / 100)
+            minutes = entry.get("estimated_time_to_regain_access")
+            if isinstance(minutes, (int, float)) and minutes > 0:
+                regain = max(regain or 0.0, minutes * 60)
+    return used, regain
+
+class TokenBucket:
+    """Request tokens for one provider and credential."""
+
+    __slots__ = ("capacity", "refill_per_second", "tokens", "updated", "blocked_until",
+                 "requests", "throttled", "retries", "waited_seconds")
+
+    def __init__(self, capacity: int, per_seconds: float, now: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = capacity / per_seconds
+        self.tokens = float(capacity)
+        self.updated = now
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.waited_seconds = 0.0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take a token if one is available; otherwise return the seconds until one will be."""
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.requests += 1
+            return 0.0
+        return (1 - self.tokens) / self.refill_per_second
+
+    def available_in(self, now: float) -> float:
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.refill_per_second
+
+    def limit_tokens(self, remaining: float) -> None:
+        """Never hold more tokens than the provider says are left."""
+        self.tokens = max(0.0, min(self.tokens, remaining))
+
+    def block(self, until: float) -> None:
+        self.blocked_until = max(self.blocked_until, until)
+
+class RateLimiter:
+    """Token buckets per (provider, credential), adapted to provider responses."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None):
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, provider: str, credential: Optional[str], capacity: int, per_seconds: float) -> TokenBucket:
+        key = (provider, credential_id(credential))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(capacity, per_seconds, self.clock())
+            if len(self._buckets) > MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def acquire(self, provider: str, credential: Optional[str], capacity: int, per_seconds: float,
+                max_wait: float = MAX_WAIT_SECONDS) -> float:
+        """Wait for a request token.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            QuotaExhausted: If no token would be available within max_wait
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._bucket(provider, credential, capacity, per_seconds)
+                wait = bucket.reserve(self.clock())
+                if wait == 0:
+                    bucket.waited_seconds += waited
+                    return waited
+                if waited + wait > max_wait:
+                    raise QuotaExhausted(wait)
+            self.sleep(wait)
+            waited += wait
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for a retry attempt (0 for the first retry)."""
+        return self.rng.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def record(self, provider: str, credential: Optional[str], capacity: int, per_seconds: float,
+               headers: Mapping[str, str], throttled: bool = False, attempt: int = 0) -> None:
+        """Adapt a bucket to a provider response's usage headers and throttling.
+
+        Args:
+            headers: Response headers (any key case)
+            throttled: The provider rejected the request for exceeding its rate limit
+            attempt: Retries already made for this request, scaling the backoff
+        """
+        headers = {name.lower(): value for name, value in headers.items()}
+        with self._lock:
+            bucket = self._bucket(provider, credential, capacity, per_seconds)
+            now = self.clock()
+            bucket.refill(now)
+
+            used, regain = _usage_from_headers(headers)
+            if used is not None:
+                bucket.limit_tokens(bucket.capacity * (1 - used))
+            if regain:
+                bucket.block(now + regain)
+
+            try:
+                remaining = float(headers["x-ratelimit-remaining"])
+            except (KeyError, TypeError, ValueError):
+                remaining = None
+            if remaining is not None and not math.isnan(remaining):
+                bucket.limit_tokens(remaining)
+                reset = _header_seconds(headers, "x-ratelimit-reset")
+                if remaining < 1 and reset > 0:
+                    # Reset is seconds from now, or a Unix time when it is that large
+                    bucket.block(now + (reset - time.time() if reset > 1e9 else reset))
+
+            if throttled:
+                bucket.throttled += 1
+                retry_after = _header_seconds(headers, "retry-after")
+                if retry_after > 0:
+                    # Jitter on top of Retry-After keeps clients sharing a credential from retrying in lockstep
+                    bucket.block(now + retry_after + self.rng.uniform(0, BACKOFF_BASE_SECONDS))
+                else:
+                    # Without a stated wait the allowance is spent: back off, then pace at the refill rate
+                    bucket.tokens = 0.0
+                    bucket.block(now + self.backoff(attempt))
+            if attempt:
+                bucket.retries += 1
+
+    def quota(self, provider: str, credential: Optional[str], capacity: int, per_seconds: float) -> Dict:
+        """Remaining allowance of one bucket, for callers deciding what to fetch."""
+        with self._lock:
+            bucket = self._bucket(provider, credential, capacity, per_seconds)
+            return self._describe(bucket, self.clock())
+
+    @staticmethod
+    def _describe(bucket: TokenBucket, now: float) -> Dict:
+        available_in = bucket.available_in(now)
+        return {
+            "capacity": int(bucket.capacity),
+            "remaining": round(bucket.tokens, 2),
+            "refill_per_second": round(bucket.refill_per_second, 4),
+            "available_in_seconds": round(available_in, 2),
+            "blocked": now < bucket.blocked_until,
+            "requests": bucket.requests,
+            "throttled": bucket.throttled,
+            "retries": bucket.retries,
+            "waited_seconds": round(bucket.waited_seconds, 3)
+        }
+
+    def metrics(self) -> List[Dict]:
+        """State of every bucket, labelled by provider and credential digest."""
+        with self._lock:
+            now = self.clock()
+            return [
+                dict(self._describe(bucket, now), provider=provider, credential=credential)
+                for (provider, credential), bucket in sorted(self._buckets.items())
+            ]
+
+    def prometheus(self) -> str:
+        """Bucket state in the Prometheus text exposition format."""
+        gauges = [
+            ("remaining", "gauge", "Request tokens left"),
+            ("capacity", "gauge", "Request tokens when the bucket is full"),
+            ("available_in_seconds", "gauge", "Seconds until the next request may be sent"),
+            ("requests", "counter", "Requests sent"),
+            ("throttled", "counter", "Requests rejected by the provider as rate limited"),
+            ("retries", "counter", "Retried requests"),
+            ("waited_seconds", "counter", "Seconds spent waiting for tokens")
+        ]
+        buckets = self.metrics()
+        lines = []
+        for field, kind, description in gauges:
+            name = f"ad_provider_rate_limit_{field}"
+            if kind == "counter" and not name.endswith("_total"):
+                name += "_total"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for bucket in buckets:
+                lines.append(f'{name}{{provider="{bucket["provider"]}",credential="{bucket["credential"]}"}} {bucket[field]}')
+        return "\n".join(lines) + "\n"
+
+# Shared by every provider so all fetches for a credential draw from one bucket
+rate_limiter = RateLimiter()
@@ -5,14 +5,37 @@ Simple MCP Server Example
 This server provides basic tools and resources for demonstration purposes.
 """
 
+import base64
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import OrderedDict, deque
+import heapq
+from bisect import bisect_right
+from itertools import accumulate, islice, product
 import json
+import math
+import operator
+import os
 import platform
+import queue
+import sqlite3
 import sys
-import requests
+import threading
 import time
+import zlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Callable, Mapping, Union
+from typing import Dict, Iterator, List, Optional
 from mcp.server import FastMCP
+from brand_dataset import BrandDataset
+from brand_query import QueryError, run_query
+from brand_sql import BrandSqlMirror, DEFAULT_MAX_ROWS, DEFAULT_TIMEOUT_SECONDS
+from market_concentration import ConcentrationSlice
+from brand_similarity import SimilarityIndex
+from spend_anomalies import AnomalyDetector, METRICS as ANOMALY_METRICS
+from spend_forecast import fit_batch
+from ad_providers import ProviderError, get_provider, provider_names
+from rate_limiter import rate_limiter
 import logging
 
 # Set up logging
@@ -29,6 +52,97 @@ notes_storage: Dict[str, Dict[str, str]] = {}
 ad_cache: Dict[str, Dict] = {}
 google_ads_cache: Dict[str, Dict] = {}
 brands_cache: Dict[str, List] = {}
+# Bumped whenever fetched ads are cached, so models fitted on the archive know when they are stale
+ad_archive_version = 0
+
+# Fitted trend models per (ad archive version, window, day), least recently used evicted first
+TREND_MODEL_CACHE_SIZE = 16
+trend_model_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+trend_model_lock = threading.Lock()
+
+# (brand data version, ad archive version) and the industry comparison built for it
+industry_comparison_cache: Optional[tuple] = None
+
+# Changed (industry, brand) rows per data version, oldest first, for delta sync
+BRAND_CHANGELOG_SIZE = 10000
+brand_changelog: deque = deque(maxlen=BRAND_CHANGELOG_SIZE)
+# Oldest version from which the changelog still holds every change
+brand_changelog_floor = 1
+# Serializes writers building the next brand snapshot; readers never take it
+brand_store_lock = threading.Lock()
+
+# Events buffered per live-feed subscriber before it is dropped as a slow consumer
+EVENT_QUEUE_SIZE = 256
+
+class EventSubscription:
+    """A live-feed subscriber: a bounded queue plus the topics it listens to."""
+    
+    def __init__(self, topics: Optional[List[str]], maxsize: int):
+        self.topics = set(topics) if topics else None
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.dropped = False
+
+class EventBroker:
+    """In-process pub/sub fanning events out to bounded per-subscriber queues.
+    
+    Publishing never blocks. A subscriber whose queue is full is dropped, so a
+    slow client cannot hold back publishers or other subscribers.
+    """
+    
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.sequence = 0
+        self.dropped_subscribers = 0
+        self._subscribers: List[EventSubscription] = []
+        self._lock = threading.Lock()
+    
+    def subscribe(self, topics: Optional[List[str]] = None) -> EventSubscription:
+        subscription = EventSubscription(topics, self.queue_size)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+    
+    def publish(self, topic: str, data: Dict) -> Dict:
+        with self._lock:
+            self.sequence += 1
+            event = {
+                "id": self.sequence,
+                "topic": topic,
+                "data": data,
+                "published_at": datetime.now().isoformat()
+            }
+            for subscription in list(self._subscribers):
+                if subscription.topics is not None and topic not in subscription.topics:
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                except queue.Full:
+                    subscription.dropped = True
+                    self._subscribers.remove(subscription)
+                    self.dropped_subscribers += 1
+                    logger.warning(f"Dropped slow event subscriber after {self.queue_size} queued events")
+        return event
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self.sequence,
+                "dropped_subscribers": self.dropped_subscribers
+            }
+
+event_broker = EventBroker()
+
+# Provider fetches run here so one slow platform never delays the other
+platform_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="platform-fetch")
+
+# Running spend and ad-volume statistics per (industry, advertiser, platform), fed at ingest
+anomaly_detector = AnomalyDetector()
 
 # Industry keywords mapping for ad filtering
 INDUSTRY_KEYWORDS = {
@@ -45,376 +159,94 @@ INDUSTRY_KEYWORDS = {
 }
 
 # Comprehensive brand database for Belgian and French market advertising spend
-# All brands (global and local) spending on Meta and Google ads targeting Belgian and French consumers
-BELGIUM_FRANCE_BRANDS_DATABASE = {
-    "automotive": {
-        # Global luxury brands advertising in Belgium & France
-        "Mercedes-Benz": {"belgium_ad_spend_eur": 45000000, "france_ad_spend_eur": 180000000, "total_spend": 225000000, "market_share_be": 8.2, "market_share_fr": 12.5, "platforms": ["Meta", "Google"], "ad_types": {"video": 65, "display": 35, "video_spend_eur": 146250000, "display_spend_eur": 78750000}},
-        "BMW": {"belgium_ad_spend_eur": 42000000, "france_ad_spend_eur": 165000000, "total_spend": 207000000, "market_share_be": 7.8, "market_share_fr": 11.8, "platforms": ["Meta", "Google"], "ad_types": {"video": 70, "display": 30, "video_spend_eur": 144900000, "display_spend_eur": 62100000}},
-        "Audi": {"belgium_ad_spend_eur": 38000000, "france_ad_spend_eur": 155000000, "total_spend": 193000000, "market_share_be": 7.1, "market_share_fr": 10.2, "platforms": ["Meta", "Google"], "ad_types": {"video": 68, "display": 32, "video_spend_eur": 131240000, "display_spend_eur": 61760000}},
-        "Tesla": {"belgium_ad_spend_eur": 15000000, "france_ad_spend_eur": 75000000, "total_spend": 90000000, "market_share_be": 2.8, "market_share_fr": 4.2, "platforms": ["Meta", "Google"], "ad_types": {"video": 80, "display": 20, "video_spend_eur": 72000000, "display_spend_eur": 18000000}},
-        "Toyota": {"belgium_ad_spend_eur": 28000000, "france_ad_spend_eur": 120000000, "total_spend": 148000000, "market_share_be": 9.5, "market_share_fr": 8.9, "platforms": ["Meta", "Google"], "ad_types": {"video": 55, "display": 45, "video_spend_eur": 81400000, "display_spend_eur": 66600000}},
-        "Volkswagen": {"belgium_ad_spend_eur": 35000000, "france_ad_spend_eur": 145000000, "total_spend": 180000000, "market_share_be": 12.5, "market_share_fr": 15.2, "platforms": ["Meta", "Google"], "ad_types": {"video": 58, "display": 42, "video_spend_eur": 104400000, "display_spend_eur": 75600000}},
-        "Renault": {"belgium_ad_spend_eur": 22000000, "france_ad_spend_eur": 185000000, "total_spend": 207000000, "market_share_be": 6.8, "market_share_fr": 18.5, "platforms": ["Meta", "Google"], "ad_types": {"video": 62, "display": 38, "video_spend_eur": 128340000, "display_spend_eur": 78660000}},
-        "Peugeot": {"belgium_ad_spend_eur": 25000000, "france_ad_spend_eur": 165000000, "total_spend": 190000000, "market_share_be": 7.5, "market_share_fr": 16.2, "platforms": ["Meta", "Google"]},
-        "Citroën": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 125000000, "total_spend": 143000000, "market_share_be": 5.2, "market_share_fr": 12.8, "platforms": ["Meta", "Google"]},
-        "Ford": {"belgium_ad_spend_eur": 20000000, "france_ad_spend_eur": 85000000, "total_spend": 105000000, "market_share_be": 6.1, "market_share_fr": 6.5, "platforms": ["Meta", "Google"]},
-        "Opel": {"belgium_ad_spend_eur": 16000000, "france_ad_spend_eur": 68000000, "total_spend": 84000000, "market_share_be": 4.8, "market_share_fr": 5.9, "platforms": ["Meta", "Google"]},
-        "Hyundai": {"belgium_ad_spend_eur": 14000000, "france_ad_spend_eur": 58000000, "total_spend": 72000000, "market_share_be": 4.2, "market_share_fr": 4.8, "platforms": ["Meta", "Google"]},
-        "Kia": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 52000000, "total_spend": 64000000, "market_share_be": 3.8, "market_share_fr": 4.2, "platforms": ["Meta", "Google"]},
-        "Nissan": {"belgium_ad_spend_eur": 11000000, "france_ad_spend_eur": 48000000, "total_spend": 59000000, "market_share_be": 3.2, "market_share_fr": 3.8, "platforms": ["Meta", "Google"]},
-        "Volvo": {"belgium_ad_spend_eur": 9000000, "france_ad_spend_eur": 42000000, "total_spend": 51000000, "market_share_be": 2.8, "market_share_fr": 3.2, "platforms": ["Meta", "Google"]},
-        "Mazda": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 35000000, "total_spend": 43000000, "market_share_be": 2.4, "market_share_fr": 2.8, "platforms": ["Meta", "Google"]},
-        "Honda": {"belgium_ad_spend_eur": 10000000, "france_ad_spend_eur": 45000000, "total_spend": 55000000, "market_share_be": 3.1, "market_share_fr": 3.5, "platforms": ["Meta", "Google"]},
-        "Porsche": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 38000000, "total_spend": 46000000, "market_share_be": 1.2, "market_share_fr": 2.1, "platforms": ["Meta", "Google"]},
-        "Jaguar": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 25000000, "total_spend": 30000000, "market_share_be": 0.8, "market_share_fr": 1.2, "platforms": ["Meta", "Google"]},
-        "Land Rover": {"belgium_ad_spend_eur": 7000000, "france_ad_spend_eur": 32000000, "total_spend": 39000000, "market_share_be": 1.5, "market_share_fr": 1.8, "platforms": ["Meta", "Google"]},
-        # Local Belgian car dealers
-        "D'Ieteren Group": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 0, "total_spend": 3500000, "market_share_be": 2.1, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Kroymans": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 0, "total_spend": 1200000, "market_share_be": 0.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Autoscoop": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 0, "total_spend": 800000, "market_share_be": 0.5, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        # Local French car dealers 
-        "Groupe PSA Retail": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 25000000, "total_spend": 25000000, "market_share_be": 0, "market_share_fr": 5.2, "platforms": ["Meta", "Google"]},
-        "Groupe Maurin": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 8000000, "total_spend": 8000000, "market_share_be": 0, "market_share_fr": 1.8, "platforms": ["Meta", "Google"]},
-        "Groupe Bernard": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 6500000, "total_spend": 6500000, "market_share_be": 0, "market_share_fr": 1.5, "platforms": ["Meta", "Google"]},
-        # More automotive brands
-        "Lexus": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 28000000, "total_spend": 34000000, "market_share_be": 1.8, "market_share_fr": 2.4, "platforms": ["Meta", "Google"], "ad_types": {"video": 75, "display": 25, "video_spend_eur": 25500000, "display_spend_eur": 8500000}},
-        "Infiniti": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 18000000, "total_spend": 21500000, "market_share_be": 1.1, "market_share_fr": 1.5, "platforms": ["Meta", "Google"], "ad_types": {"video": 68, "display": 32, "video_spend_eur": 14620000, "display_spend_eur": 6880000}},
-        "Acura": {"belgium_ad_spend_eur": 2800000, "france_ad_spend_eur": 15000000, "total_spend": 17800000, "market_share_be": 0.9, "market_share_fr": 1.2, "platforms": ["Meta", "Google"], "ad_types": {"video": 65, "display": 35, "video_spend_eur": 11570000, "display_spend_eur": 6230000}},
-        "Genesis": {"belgium_ad_spend_eur": 2200000, "france_ad_spend_eur": 12000000, "total_spend": 14200000, "market_share_be": 0.7, "market_share_fr": 1.0, "platforms": ["Meta", "Google"], "ad_types": {"video": 72, "display": 28, "video_spend_eur": 10224000, "display_spend_eur": 3976000}},
-        "Subaru": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 22000000, "total_spend": 27000000, "market_share_be": 1.6, "market_share_fr": 1.8, "platforms": ["Meta", "Google"], "ad_types": {"video": 58, "display": 42, "video_spend_eur": 15660000, "display_spend_eur": 11340000}},
-        "Mitsubishi": {"belgium_ad_spend_eur": 3800000, "france_ad_spend_eur": 16000000, "total_spend": 19800000, "market_share_be": 1.2, "market_share_fr": 1.3, "platforms": ["Meta", "Google"], "ad_types": {"video": 52, "display": 48, "video_spend_eur": 10296000, "display_spend_eur": 9504000}},
-        "Isuzu": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 8500000, "total_spend": 10300000, "market_share_be": 0.6, "market_share_fr": 0.7, "platforms": ["Meta", "Google"], "ad_types": {"video": 45, "display": 55, "video_spend_eur": 4635000, "display_spend_eur": 5665000}},
-        "Suzuki": {"belgium_ad_spend_eur": 4200000, "france_ad_spend_eur": 18500000, "total_spend": 22700000, "market_share_be": 1.3, "market_share_fr": 1.5, "platforms": ["Meta", "Google"], "ad_types": {"video": 48, "display": 52, "video_spend_eur": 10896000, "display_spend_eur": 11804000}},
-        "Dacia": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 45000000, "total_spend": 53000000, "market_share_be": 2.5, "market_share_fr": 3.8, "platforms": ["Meta", "Google"], "ad_types": {"video": 40, "display": 60, "video_spend_eur": 21200000, "display_spend_eur": 31800000}},
-        "Skoda": {"belgium_ad_spend_eur": 6500000, "france_ad_spend_eur": 32000000, "total_spend": 38500000, "market_share_be": 2.0, "market_share_fr": 2.7, "platforms": ["Meta", "Google"], "ad_types": {"video": 55, "display": 45, "video_spend_eur": 21175000, "display_spend_eur": 17325000}}
-    },
-    "fashion": {
-        # Global luxury brands advertising in Belgium & France
-        "LVMH": {"belgium_ad_spend_eur": 25000000, "france_ad_spend_eur": 285000000, "total_spend": 310000000, "market_share_be": 18.5, "market_share_fr": 22.8, "platforms": ["Meta", "Google"]},
-        "Chanel": {"belgium_ad_spend_eur": 20000000, "france_ad_spend_eur": 195000000, "total_spend": 215000000, "market_share_be": 15.2, "market_share_fr": 18.5, "platforms": ["Meta", "Google"]},
-        "Hermès": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 165000000, "total_spend": 183000000, "market_share_be": 12.8, "market_share_fr": 16.2, "platforms": ["Meta", "Google"]},
-        "Gucci": {"belgium_ad_spend_eur": 15000000, "france_ad_spend_eur": 125000000, "total_spend": 140000000, "market_share_be": 10.5, "market_share_fr": 12.8, "platforms": ["Meta", "Google"]},
-        "Prada": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 95000000, "total_spend": 107000000, "market_share_be": 8.5, "market_share_fr": 9.8, "platforms": ["Meta", "Google"]},
-        "Burberry": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 65000000, "total_spend": 73000000, "market_share_be": 5.8, "market_share_fr": 6.5, "platforms": ["Meta", "Google"]},
-        # Global fast fashion brands
-        "Zara": {"belgium_ad_spend_eur": 22000000, "france_ad_spend_eur": 145000000, "total_spend": 167000000, "market_share_be": 15.8, "market_share_fr": 18.2, "platforms": ["Meta", "Google"]},
-        "H&M": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 125000000, "total_spend": 143000000, "market_share_be": 12.5, "market_share_fr": 15.8, "platforms": ["Meta", "Google"]},
-        "Uniqlo": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 55000000, "total_spend": 63000000, "market_share_be": 5.2, "market_share_fr": 6.8, "platforms": ["Meta", "Google"]},
-        "Mango": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 42000000, "total_spend": 48000000, "market_share_be": 4.2, "market_share_fr": 5.1, "platforms": ["Meta", "Google"]},
-        # Global sportswear brands
-        "Nike": {"belgium_ad_spend_eur": 35000000, "france_ad_spend_eur": 185000000, "total_spend": 220000000, "market_share_be": 25.8, "market_share_fr": 28.5, "platforms": ["Meta", "Google"]},
-        "Adidas": {"belgium_ad_spend_eur": 28000000, "france_ad_spend_eur": 155000000, "total_spend": 183000000, "market_share_be": 20.5, "market_share_fr": 22.8, "platforms": ["Meta", "Google"]},
-        "Puma": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 85000000, "total_spend": 97000000, "market_share_be": 8.5, "market_share_fr": 9.8, "platforms": ["Meta", "Google"]},
-        "Under Armour": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 35000000, "total_spend": 40000000, "market_share_be": 3.5, "market_share_fr": 4.2, "platforms": ["Meta", "Google"]},
-        "Lululemon": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 28000000, "total_spend": 32000000, "market_share_be": 2.8, "market_share_fr": 3.5, "platforms": ["Meta", "Google"]},
-        # Belgian fashion brands/retailers
-        "JBC": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 0, "total_spend": 3500000, "market_share_be": 5.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "CKS": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 0, "total_spend": 1800000, "market_share_be": 2.5, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "ZEB": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 0, "total_spend": 1200000, "market_share_be": 1.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Mayerline": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 0, "total_spend": 800000, "market_share_be": 1.2, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Terre Bleue": {"belgium_ad_spend_eur": 650000, "france_ad_spend_eur": 0, "total_spend": 650000, "market_share_be": 0.9, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        # French fashion brands/retailers
-        "Lacoste": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 45000000, "total_spend": 48000000, "market_share_be": 2.2, "market_share_fr": 5.8, "platforms": ["Meta", "Google"]},
-        "Galeries Lafayette": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 35000000, "total_spend": 35000000, "market_share_be": 0, "market_share_fr": 4.5, "platforms": ["Meta", "Google"]},
-        "Printemps": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 28000000, "total_spend": 28000000, "market_share_be": 0, "market_share_fr": 3.8, "platforms": ["Meta", "Google"]},
-        "La Redoute": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 25000000, "total_spend": 26500000, "market_share_be": 1.1, "market_share_fr": 3.2, "platforms": ["Meta", "Google"]},
-        "3 Suisses": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 12000000, "total_spend": 12800000, "market_share_be": 0.6, "market_share_fr": 1.5, "platforms": ["Meta", "Google"]},
-        "Kiabi": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 22000000, "total_spend": 24500000, "market_share_be": 1.8, "market_share_fr": 2.8, "platforms": ["Meta", "Google"]},
-        "Celio": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 18000000, "total_spend": 19200000, "market_share_be": 0.9, "market_share_fr": 2.2, "platforms": ["Meta", "Google"]}
-    },
-    "technology": {
-        # Global tech giants advertising in Belgium & France
-        "Apple": {"belgium_ad_spend_eur": 25000000, "france_ad_spend_eur": 125000000, "total_spend": 150000000, "market_share_be": 28.5, "market_share_fr": 25.8, "platforms": ["Meta", "Google"]},
-        "Google": {"belgium_ad_spend_eur": 22000000, "france_ad_spend_eur": 115000000, "total_spend": 137000000, "market_share_be": 25.2, "market_share_fr": 22.5, "platforms": ["Meta"]},
-        "Microsoft": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 95000000, "total_spend": 113000000, "market_share_be": 20.5, "market_share_fr": 18.8, "platforms": ["Meta", "Google"]},
-        "Meta": {"belgium_ad_spend_eur": 15000000, "france_ad_spend_eur": 85000000, "total_spend": 100000000, "market_share_be": 18.2, "market_share_fr": 16.5, "platforms": ["Google"]},
-        "Samsung": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 75000000, "total_spend": 87000000, "market_share_be": 15.8, "market_share_fr": 14.2, "platforms": ["Meta", "Google"]},
-        "Amazon": {"belgium_ad_spend_eur": 10000000, "france_ad_spend_eur": 65000000, "total_spend": 75000000, "market_share_be": 12.5, "market_share_fr": 12.8, "platforms": ["Meta", "Google"]},
-        "Netflix": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 55000000, "total_spend": 63000000, "market_share_be": 8.5, "market_share_fr": 9.2, "platforms": ["Meta", "Google"]},
-        "Spotify": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 42000000, "total_spend": 48000000, "market_share_be": 6.8, "market_share_fr": 7.5, "platforms": ["Meta", "Google"]},
-        "Adobe": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 32000000, "total_spend": 36000000, "market_share_be": 4.2, "market_share_fr": 5.1, "platforms": ["Meta", "Google"]},
-        "Salesforce": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 28000000, "total_spend": 31500000, "market_share_be": 3.8, "market_share_fr": 4.5, "platforms": ["Meta", "Google"]},
-        # European tech companies
-        "SAP": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 35000000, "total_spend": 40000000, "market_share_be": 5.2, "market_share_fr": 6.8, "platforms": ["Meta", "Google"]},
-        "Philips": {"belgium_ad_spend_eur": 4500000, "france_ad_spend_eur": 32000000, "total_spend": 36500000, "market_share_be": 4.8, "market_share_fr": 6.2, "platforms": ["Meta", "Google"]},
-        "ASML": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 18000000, "total_spend": 20000000, "market_share_be": 2.1, "market_share_fr": 3.2, "platforms": ["Meta", "Google"]},
-        "Nokia": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 15000000, "total_spend": 16800000, "market_share_be": 1.9, "market_share_fr": 2.8, "platforms": ["Meta", "Google"]},
-        "Siemens": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 25000000, "total_spend": 28000000, "market_share_be": 3.2, "market_share_fr": 4.8, "platforms": ["Meta", "Google"]},
-        # Fintech companies
-        "Klarna": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 28000000, "total_spend": 31500000, "market_share_be": 8.5, "market_share_fr": 12.5, "platforms": ["Meta", "Google"]},
-        "Revolut": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 25000000, "total_spend": 28000000, "market_share_be": 7.2, "market_share_fr": 10.8, "platforms": ["Meta", "Google"]},
-        "N26": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 22000000, "total_spend": 24500000, "market_share_be": 6.1, "market_share_fr": 9.5, "platforms": ["Meta", "Google"]},
-        "Wise": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 18000000, "total_spend": 20000000, "market_share_be": 4.8, "market_share_fr": 7.8, "platforms": ["Meta", "Google"]},
-        "PayPal": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 32000000, "total_spend": 36000000, "market_share_be": 9.8, "market_share_fr": 15.2, "platforms": ["Meta", "Google"]},
-        # Belgian tech companies
-        "Odoo": {"belgium_ad_spend_eur": 2800000, "france_ad_spend_eur": 5000000, "total_spend": 7800000, "market_share_be": 3.2, "market_share_fr": 1.8, "platforms": ["Meta", "Google"]},
-        "Collibra": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 2000000, "total_spend": 3500000, "market_share_be": 1.8, "market_share_fr": 0.8, "platforms": ["Meta", "Google"]},
-        "Showpad": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 1200000, "total_spend": 2000000, "market_share_be": 0.9, "market_share_fr": 0.5, "platforms": ["Meta", "Google"]},
-        # French tech companies
-        "Criteo": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 15000000, "total_spend": 16200000, "market_share_be": 1.4, "market_share_fr": 5.8, "platforms": ["Meta", "Google"]},
-        "Dassault Systèmes": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 12000000, "total_spend": 12800000, "market_share_be": 0.9, "market_share_fr": 4.5, "platforms": ["Meta", "Google"]},
-        "Atos": {"belgium_ad_spend_eur": 1000000, "france_ad_spend_eur": 8000000, "total_spend": 9000000, "market_share_be": 1.1, "market_share_fr": 3.2, "platforms": ["Meta", "Google"]},
-        # More global tech companies
-        "Adobe": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 18000000, "total_spend": 22000000, "market_share_be": 4.6, "market_share_fr": 6.8, "platforms": ["Meta", "Google"], "ad_types": {"video": 72, "display": 28, "video_spend_eur": 15840000, "display_spend_eur": 6160000}},
-        "Oracle": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 16000000, "total_spend": 19500000, "market_share_be": 4.1, "market_share_fr": 6.1, "platforms": ["Meta", "Google"], "ad_types": {"video": 45, "display": 55, "video_spend_eur": 8775000, "display_spend_eur": 10725000}},
-        "Salesforce": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 22000000, "total_spend": 27000000, "market_share_be": 5.8, "market_share_fr": 8.3, "platforms": ["Meta", "Google"], "ad_types": {"video": 65, "display": 35, "video_spend_eur": 17550000, "display_spend_eur": 9450000}},
-        "ServiceNow": {"belgium_ad_spend_eur": 2800000, "france_ad_spend_eur": 12000000, "total_spend": 14800000, "market_share_be": 3.2, "market_share_fr": 4.5, "platforms": ["Meta", "Google"], "ad_types": {"video": 58, "display": 42, "video_spend_eur": 8584000, "display_spend_eur": 6216000}},
-        "Workday": {"belgium_ad_spend_eur": 2200000, "france_ad_spend_eur": 9500000, "total_spend": 11700000, "market_share_be": 2.5, "market_share_fr": 3.6, "platforms": ["Meta", "Google"], "ad_types": {"video": 52, "display": 48, "video_spend_eur": 6084000, "display_spend_eur": 5616000}},
-        "Palantir": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 8000000, "total_spend": 9800000, "market_share_be": 2.1, "market_share_fr": 3.0, "platforms": ["Meta", "Google"], "ad_types": {"video": 75, "display": 25, "video_spend_eur": 7350000, "display_spend_eur": 2450000}},
-        "Snowflake": {"belgium_ad_spend_eur": 3200000, "france_ad_spend_eur": 14000000, "total_spend": 17200000, "market_share_be": 3.7, "market_share_fr": 5.3, "platforms": ["Meta", "Google"], "ad_types": {"video": 68, "display": 32, "video_spend_eur": 11696000, "display_spend_eur": 5504000}},
-        "MongoDB": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 6500000, "total_spend": 8000000, "market_share_be": 1.7, "market_share_fr": 2.5, "platforms": ["Meta", "Google"], "ad_types": {"video": 60, "display": 40, "video_spend_eur": 4800000, "display_spend_eur": 3200000}},
-        "Atlassian": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 11000000, "total_spend": 13500000, "market_share_be": 2.9, "market_share_fr": 4.2, "platforms": ["Meta", "Google"], "ad_types": {"video": 55, "display": 45, "video_spend_eur": 7425000, "display_spend_eur": 6075000}},
-        "Slack": {"belgium_ad_spend_eur": 2800000, "france_ad_spend_eur": 12500000, "total_spend": 15300000, "market_share_be": 3.2, "market_share_fr": 4.7, "platforms": ["Meta", "Google"], "ad_types": {"video": 70, "display": 30, "video_spend_eur": 10710000, "display_spend_eur": 4590000}},
-        "Zoom": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 15000000, "total_spend": 18500000, "market_share_be": 4.1, "market_share_fr": 5.7, "platforms": ["Meta", "Google"], "ad_types": {"video": 80, "display": 20, "video_spend_eur": 14800000, "display_spend_eur": 3700000}},
-        "Dropbox": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 7500000, "total_spend": 9300000, "market_share_be": 2.1, "market_share_fr": 2.8, "platforms": ["Meta", "Google"], "ad_types": {"video": 50, "display": 50, "video_spend_eur": 4650000, "display_spend_eur": 4650000}}
-    },
-    "finance": {
-        # Major European banks advertising in Belgium & France
-        "BNP Paribas": {"belgium_ad_spend_eur": 15000000, "france_ad_spend_eur": 95000000, "total_spend": 110000000, "market_share_be": 18.5, "market_share_fr": 22.8, "platforms": ["Meta", "Google"]},
-        "Crédit Agricole": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 85000000, "total_spend": 93000000, "market_share_be": 9.8, "market_share_fr": 20.5, "platforms": ["Meta", "Google"]},
-        "Société Générale": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 75000000, "total_spend": 81000000, "market_share_be": 7.2, "market_share_fr": 18.2, "platforms": ["Meta", "Google"]},
-        "ING": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 25000000, "total_spend": 37000000, "market_share_be": 14.5, "market_share_fr": 6.1, "platforms": ["Meta", "Google"]},
-        "KBC": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 0, "total_spend": 18000000, "market_share_be": 22.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Belfius": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 0, "total_spend": 12000000, "market_share_be": 15.2, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Deutsche Bank": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 18000000, "total_spend": 21000000, "market_share_be": 3.8, "market_share_fr": 4.2, "platforms": ["Meta", "Google"]},
-        "Santander": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 15000000, "total_spend": 17000000, "market_share_be": 2.5, "market_share_fr": 3.6, "platforms": ["Meta", "Google"]},
-        # Insurance companies
-        "AXA": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 65000000, "total_spend": 73000000, "market_share_be": 15.8, "market_share_fr": 18.5, "platforms": ["Meta", "Google"]},
-        "Allianz": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 35000000, "total_spend": 41000000, "market_share_be": 12.2, "market_share_fr": 9.8, "platforms": ["Meta", "Google"]},
-        "Generali": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 28000000, "total_spend": 32000000, "market_share_be": 8.5, "market_share_fr": 7.8, "platforms": ["Meta", "Google"]},
-        "AG Insurance": {"belgium_ad_spend_eur": 5500000, "france_ad_spend_eur": 0, "total_spend": 5500000, "market_share_be": 11.2, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Ethias": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 0, "total_spend": 3000000, "market_share_be": 6.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Zurich": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 12000000, "total_spend": 14500000, "market_share_be": 5.1, "market_share_fr": 3.4, "platforms": ["Meta", "Google"]},
-        # Investment/Trading platforms
-        "DEGIRO": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 8000000, "total_spend": 10000000, "market_share_be": 8.5, "market_share_fr": 6.2, "platforms": ["Meta", "Google"]},
-        "eToro": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 12000000, "total_spend": 15000000, "market_share_be": 12.8, "market_share_fr": 9.8, "platforms": ["Meta", "Google"]},
-        "Plus500": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 6000000, "total_spend": 7500000, "market_share_be": 6.4, "market_share_fr": 4.8, "platforms": ["Meta", "Google"]},
-        "XTB": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 5000000, "total_spend": 6200000, "market_share_be": 5.1, "market_share_fr": 3.9, "platforms": ["Meta", "Google"]},
-        # Cryptocurrency platforms
-        "Binance": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 15000000, "total_spend": 17500000, "market_share_be": 18.5, "market_share_fr": 22.8, "platforms": ["Meta", "Google"]},
-        "Coinbase": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 12000000, "total_spend": 13800000, "market_share_be": 13.2, "market_share_fr": 18.2, "platforms": ["Meta", "Google"]},
-        "Crypto.com": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 10000000, "total_spend": 11500000, "market_share_be": 11.1, "market_share_fr": 15.1, "platforms": ["Meta", "Google"]},
-        # Belgian financial services
-        "Keytrade Bank": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 0, "total_spend": 1200000, "market_share_be": 3.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Argenta": {"belgium_ad_spend_eur": 2800000, "france_ad_spend_eur": 0, "total_spend": 2800000, "market_share_be": 8.9, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "VDK Spaarbank": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 0, "total_spend": 800000, "market_share_be": 2.5, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        # French financial services
-        "Boursorama": {"belgium_ad_spend_eur": 500000, "france_ad_spend_eur": 25000000, "total_spend": 25500000, "market_share_be": 1.6, "market_share_fr": 15.8, "platforms": ["Meta", "Google"]},
-        "Fortuneo": {"belgium_ad_spend_eur": 300000, "france_ad_spend_eur": 18000000, "total_spend": 18300000, "market_share_be": 0.9, "market_share_fr": 11.4, "platforms": ["Meta", "Google"]},
-        "Hello bank!": {"belgium_ad_spend_eur": 400000, "france_ad_spend_eur": 15000000, "total_spend": 15400000, "market_share_be": 1.3, "market_share_fr": 9.5, "platforms": ["Meta", "Google"]}
-    },
-    "food": {
-        # Major global food brands advertising in Belgium & France - the user specifically mentioned these missing brands
-        "Coca-Cola": {"belgium_ad_spend_eur": 35000000, "france_ad_spend_eur": 185000000, "total_spend": 220000000, "market_share_be": 28.5, "market_share_fr": 25.8, "platforms": ["Meta", "Google"], "ad_types": {"video": 75, "display": 25, "video_spend_eur": 165000000, "display_spend_eur": 55000000}},
-        "McDonald's": {"belgium_ad_spend_eur": 25000000, "france_ad_spend_eur": 165000000, "total_spend": 190000000, "market_share_be": 22.8, "market_share_fr": 22.5, "platforms": ["Meta", "Google"]},
-        "Nestlé": {"belgium_ad_spend_eur": 22000000, "france_ad_spend_eur": 145000000, "total_spend": 167000000, "market_share_be": 18.5, "market_share_fr": 20.1, "platforms": ["Meta", "Google"]},
-        "Unilever": {"belgium_ad_spend_eur": 20000000, "france_ad_spend_eur": 135000000, "total_spend": 155000000, "market_share_be": 16.8, "market_share_fr": 18.8, "platforms": ["Meta", "Google"]},
-        "Danone": {"belgium_ad_spend_eur": 15000000, "france_ad_spend_eur": 125000000, "total_spend": 140000000, "market_share_be": 12.5, "market_share_fr": 17.4, "platforms": ["Meta", "Google"]},
-        "PepsiCo": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 95000000, "total_spend": 113000000, "market_share_be": 15.2, "market_share_fr": 13.2, "platforms": ["Meta", "Google"]},
-        "Ferrero": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 85000000, "total_spend": 97000000, "market_share_be": 10.1, "market_share_fr": 11.8, "platforms": ["Meta", "Google"]},
-        "Mars": {"belgium_ad_spend_eur": 10000000, "france_ad_spend_eur": 75000000, "total_spend": 85000000, "market_share_be": 8.5, "market_share_fr": 10.4, "platforms": ["Meta", "Google"]},
-        "Mondelez": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 65000000, "total_spend": 73000000, "market_share_be": 6.8, "market_share_fr": 9.0, "platforms": ["Meta", "Google"]},
-        "Kellogg's": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 45000000, "total_spend": 51000000, "market_share_be": 5.1, "market_share_fr": 6.2, "platforms": ["Meta", "Google"]},
-        "General Mills": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 32000000, "total_spend": 36000000, "market_share_be": 3.4, "market_share_fr": 4.4, "platforms": ["Meta", "Google"]},
-        "Kraft Heinz": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 38000000, "total_spend": 43000000, "market_share_be": 4.2, "market_share_fr": 5.3, "platforms": ["Meta", "Google"]},
-        "Dr. Oetker": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 28000000, "total_spend": 31500000, "market_share_be": 2.9, "market_share_fr": 3.9, "platforms": ["Meta", "Google"]},
-        "Haribo": {"belgium_ad_spend_eur": 4500000, "france_ad_spend_eur": 35000000, "total_spend": 39500000, "market_share_be": 3.8, "market_share_fr": 4.9, "platforms": ["Meta", "Google"]},
-        "Red Bull": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 55000000, "total_spend": 63000000, "market_share_be": 6.8, "market_share_fr": 7.6, "platforms": ["Meta", "Google"]},
-        # Major supermarket chains - the user specifically mentioned these missing brands
-        "Lidl": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 125000000, "total_spend": 143000000, "market_share_be": 22.8, "market_share_fr": 18.5, "platforms": ["Meta", "Google"], "ad_types": {"video": 45, "display": 55, "video_spend_eur": 64350000, "display_spend_eur": 78650000}},
-        "ALDI": {"belgium_ad_spend_eur": 15000000, "france_ad_spend_eur": 85000000, "total_spend": 100000000, "market_share_be": 18.9, "market_share_fr": 12.6, "platforms": ["Meta", "Google"], "ad_types": {"video": 40, "display": 60, "video_spend_eur": 40000000, "display_spend_eur": 60000000}},
-        "Delhaize": {"belgium_ad_spend_eur": 28000000, "france_ad_spend_eur": 0, "total_spend": 28000000, "market_share_be": 35.4, "market_share_fr": 0, "platforms": ["Meta", "Google"], "ad_types": {"video": 50, "display": 50, "video_spend_eur": 14000000, "display_spend_eur": 14000000}},
-        "Carrefour": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 155000000, "total_spend": 167000000, "market_share_be": 15.2, "market_share_fr": 22.9, "platforms": ["Meta", "Google"]},
-        "Leclerc": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 95000000, "total_spend": 97000000, "market_share_be": 2.5, "market_share_fr": 14.1, "platforms": ["Meta", "Google"]},
-        "Intermarché": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 65000000, "total_spend": 66500000, "market_share_be": 1.9, "market_share_fr": 9.6, "platforms": ["Meta", "Google"]},
-        "Casino": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 45000000, "total_spend": 45800000, "market_share_be": 1.0, "market_share_fr": 6.7, "platforms": ["Meta", "Google"]},
-        "Monoprix": {"belgium_ad_spend_eur": 600000, "france_ad_spend_eur": 35000000, "total_spend": 35600000, "market_share_be": 0.8, "market_share_fr": 5.2, "platforms": ["Meta", "Google"]},
-        "Franprix": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 28000000, "total_spend": 28000000, "market_share_be": 0, "market_share_fr": 4.1, "platforms": ["Meta", "Google"]},
-        "Super U": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 42000000, "total_spend": 42000000, "market_share_be": 0, "market_share_fr": 6.2, "platforms": ["Meta", "Google"]},
-        # Belgian supermarket chains
-        "Colruyt": {"belgium_ad_spend_eur": 22000000, "france_ad_spend_eur": 0, "total_spend": 22000000, "market_share_be": 27.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Carrefour Belgium": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 0, "total_spend": 8000000, "market_share_be": 10.1, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Cora": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 12000000, "total_spend": 15500000, "market_share_be": 4.4, "market_share_fr": 1.8, "platforms": ["Meta", "Google"]},
-        # Food delivery platforms
-        "Uber Eats": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 55000000, "total_spend": 63000000, "market_share_be": 35.8, "market_share_fr": 28.5, "platforms": ["Meta", "Google"]},
-        "Deliveroo": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 42000000, "total_spend": 47000000, "market_share_be": 22.4, "market_share_fr": 21.8, "platforms": ["Meta", "Google"]},
-        "Just Eat Takeaway": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 28000000, "total_spend": 32000000, "market_share_be": 17.9, "market_share_fr": 14.5, "platforms": ["Meta", "Google"]},
-        "Domino's": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 25000000, "total_spend": 28500000, "market_share_be": 15.7, "market_share_fr": 13.0, "platforms": ["Meta", "Google"]},
-        "Pizza Hut": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 18000000, "total_spend": 20500000, "market_share_be": 11.2, "market_share_fr": 9.3, "platforms": ["Meta", "Google"]},
-        # Beer and beverages - Belgium is famous for beer
-        "AB InBev": {"belgium_ad_spend_eur": 25000000, "france_ad_spend_eur": 65000000, "total_spend": 90000000, "market_share_be": 45.5, "market_share_fr": 18.2, "platforms": ["Meta", "Google"]},
-        "Heineken": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 55000000, "total_spend": 63000000, "market_share_be": 14.5, "market_share_fr": 15.4, "platforms": ["Meta", "Google"]},
-        "Carlsberg": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 35000000, "total_spend": 39000000, "market_share_be": 7.3, "market_share_fr": 9.8, "platforms": ["Meta", "Google"]},
-        "Duvel Moortgat": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 8000000, "total_spend": 11500000, "market_share_be": 6.4, "market_share_fr": 2.2, "platforms": ["Meta", "Google"]},
-        "Groupe Castel": {"belgium_ad_spend_eur": 500000, "france_ad_spend_eur": 28000000, "total_spend": 28500000, "market_share_be": 0.9, "market_share_fr": 7.8, "platforms": ["Meta", "Google"]}
-    },
-    "healthcare": {
-        # Major pharmaceutical companies advertising in Belgium & France
-        "Sanofi": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 95000000, "total_spend": 103000000, "market_share_be": 18.5, "market_share_fr": 22.8, "platforms": ["Meta", "Google"]},
-        "Novartis": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 65000000, "total_spend": 71000000, "market_share_be": 13.9, "market_share_fr": 15.6, "platforms": ["Meta", "Google"]},
-        "Roche": {"belgium_ad_spend_eur": 5500000, "france_ad_spend_eur": 58000000, "total_spend": 63500000, "market_share_be": 12.7, "market_share_fr": 13.9, "platforms": ["Meta", "Google"]},
-        "Bayer": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 52000000, "total_spend": 57000000, "market_share_be": 11.6, "market_share_fr": 12.5, "platforms": ["Meta", "Google"]},
-        "AstraZeneca": {"belgium_ad_spend_eur": 4500000, "france_ad_spend_eur": 48000000, "total_spend": 52500000, "market_share_be": 10.4, "market_share_fr": 11.5, "platforms": ["Meta", "Google"]},
-        "GSK": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 42000000, "total_spend": 46000000, "market_share_be": 9.3, "market_share_fr": 10.1, "platforms": ["Meta", "Google"]},
-        "Pfizer": {"belgium_ad_spend_eur": 6500000, "france_ad_spend_eur": 55000000, "total_spend": 61500000, "market_share_be": 15.0, "market_share_fr": 13.2, "platforms": ["Meta", "Google"]},
-        "Johnson & Johnson": {"belgium_ad_spend_eur": 5800000, "france_ad_spend_eur": 48000000, "total_spend": 53800000, "market_share_be": 13.4, "market_share_fr": 11.5, "platforms": ["Meta", "Google"]},
-        "Merck": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 32000000, "total_spend": 35500000, "market_share_be": 8.1, "market_share_fr": 7.7, "platforms": ["Meta", "Google"]},
-        "Boehringer Ingelheim": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 28000000, "total_spend": 31000000, "market_share_be": 6.9, "market_share_fr": 6.7, "platforms": ["Meta", "Google"]},
-        # Medical devices and healthcare technology
-        "Philips Healthcare": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 35000000, "total_spend": 39000000, "market_share_be": 12.8, "market_share_fr": 10.5, "platforms": ["Meta", "Google"]},
-        "Siemens Healthineers": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 28000000, "total_spend": 31500000, "market_share_be": 11.2, "market_share_fr": 8.4, "platforms": ["Meta", "Google"]},
-        "Medtronic": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 22000000, "total_spend": 24500000, "market_share_be": 8.0, "market_share_fr": 6.6, "platforms": ["Meta", "Google"]},
-        "Abbott": {"belgium_ad_spend_eur": 2200000, "france_ad_spend_eur": 18000000, "total_spend": 20200000, "market_share_be": 7.0, "market_share_fr": 5.4, "platforms": ["Meta", "Google"]},
-        # Belgian healthcare companies
-        "UCB": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 8000000, "total_spend": 11500000, "market_share_be": 11.2, "market_share_fr": 2.4, "platforms": ["Meta", "Google"]},
-        "Galapagos": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 2500000, "total_spend": 4300000, "market_share_be": 5.8, "market_share_fr": 0.8, "platforms": ["Meta", "Google"]},
-        "Janssen Pharmaceutica": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 5000000, "total_spend": 7500000, "market_share_be": 8.0, "market_share_fr": 1.5, "platforms": ["Meta", "Google"]},
-        # French healthcare companies
-        "Servier": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 25000000, "total_spend": 26200000, "market_share_be": 3.8, "market_share_fr": 7.5, "platforms": ["Meta", "Google"]},
-        "Pierre Fabre": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 18000000, "total_spend": 18800000, "market_share_be": 2.6, "market_share_fr": 5.4, "platforms": ["Meta", "Google"]},
-        "Ipsen": {"belgium_ad_spend_eur": 600000, "france_ad_spend_eur": 12000000, "total_spend": 12600000, "market_share_be": 1.9, "market_share_fr": 3.6, "platforms": ["Meta", "Google"]},
-        # Health insurance and services
-        "Mutualités Libres": {"belgium_ad_spend_eur": 2800000, "france_ad_spend_eur": 0, "total_spend": 2800000, "market_share_be": 15.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Mutualités Chrétiennes": {"belgium_ad_spend_eur": 2200000, "france_ad_spend_eur": 0, "total_spend": 2200000, "market_share_be": 12.4, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "CPAM": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 35000000, "total_spend": 35000000, "market_share_be": 0, "market_share_fr": 18.5, "platforms": ["Meta", "Google"]},
-        "Harmonie Mutuelle": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 22000000, "total_spend": 22000000, "market_share_be": 0, "market_share_fr": 11.6, "platforms": ["Meta", "Google"]}
-    },
-    "travel": {
-        # Major airlines advertising in Belgium & France
-        "Air France-KLM": {"belgium_ad_spend_eur": 15000000, "france_ad_spend_eur": 125000000, "total_spend": 140000000, "market_share_be": 28.5, "market_share_fr": 35.8, "platforms": ["Meta", "Google"]},
-        "Brussels Airlines": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 8000000, "total_spend": 20000000, "market_share_be": 22.8, "market_share_fr": 2.3, "platforms": ["Meta", "Google"]},
-        "Lufthansa": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 35000000, "total_spend": 43000000, "market_share_be": 15.2, "market_share_fr": 10.0, "platforms": ["Meta", "Google"]},
-        "Ryanair": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 45000000, "total_spend": 51000000, "market_share_be": 11.4, "market_share_fr": 12.9, "platforms": ["Meta", "Google"]},
-        "British Airways": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 28000000, "total_spend": 32000000, "market_share_be": 7.6, "market_share_fr": 8.0, "platforms": ["Meta", "Google"]},
-        "easyJet": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 42000000, "total_spend": 45500000, "market_share_be": 6.7, "market_share_fr": 12.0, "platforms": ["Meta", "Google"]},
-        "Turkish Airlines": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 18000000, "total_spend": 20500000, "market_share_be": 4.8, "market_share_fr": 5.1, "platforms": ["Meta", "Google"]},
-        "Emirates": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 25000000, "total_spend": 28000000, "market_share_be": 5.7, "market_share_fr": 7.1, "platforms": ["Meta", "Google"]},
-        # Online travel agencies and booking platforms
-        "Booking.com": {"belgium_ad_spend_eur": 18000000, "france_ad_spend_eur": 95000000, "total_spend": 113000000, "market_share_be": 35.8, "market_share_fr": 28.5, "platforms": ["Meta", "Google"]},
-        "Expedia": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 55000000, "total_spend": 63000000, "market_share_be": 15.9, "market_share_fr": 16.5, "platforms": ["Meta", "Google"]},
-        "Airbnb": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 85000000, "total_spend": 97000000, "market_share_be": 23.9, "market_share_fr": 25.5, "platforms": ["Meta", "Google"]},
-        "Hotels.com": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 32000000, "total_spend": 36000000, "market_share_be": 8.0, "market_share_fr": 9.6, "platforms": ["Meta", "Google"]},
-        "Skyscanner": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 28000000, "total_spend": 31500000, "market_share_be": 7.0, "market_share_fr": 8.4, "platforms": ["Meta", "Google"]},
-        "Kayak": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 22000000, "total_spend": 24500000, "market_share_be": 5.0, "market_share_fr": 6.6, "platforms": ["Meta", "Google"]},
-        "Momondo": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 15000000, "total_spend": 16800000, "market_share_be": 3.6, "market_share_fr": 4.5, "platforms": ["Meta", "Google"]},
-        # Tour operators and travel companies
-        "TUI": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 35000000, "total_spend": 41000000, "market_share_be": 18.2, "market_share_fr": 12.5, "platforms": ["Meta", "Google"]},
-        "Thomas Cook": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 18000000, "total_spend": 21000000, "market_share_be": 9.1, "market_share_fr": 6.4, "platforms": ["Meta", "Google"]},
-        "Club Med": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 45000000, "total_spend": 47500000, "market_share_be": 7.6, "market_share_fr": 16.1, "platforms": ["Meta", "Google"]},
-        "Pierre & Vacances": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 28000000, "total_spend": 29500000, "market_share_be": 4.5, "market_share_fr": 10.0, "platforms": ["Meta", "Google"]},
-        "Center Parcs": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 22000000, "total_spend": 26000000, "market_share_be": 12.1, "market_share_fr": 7.9, "platforms": ["Meta", "Google"]},
-        # Belgian travel companies
-        "Connections": {"belgium_ad_spend_eur": 2200000, "france_ad_spend_eur": 0, "total_spend": 2200000, "market_share_be": 6.7, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Jetair": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 0, "total_spend": 1800000, "market_share_be": 5.5, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Sunweb": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 8000000, "total_spend": 10500000, "market_share_be": 7.6, "market_share_fr": 2.9, "platforms": ["Meta", "Google"]},
-        # French travel companies
-        "Nouvelles Frontières": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 15000000, "total_spend": 15000000, "market_share_be": 0, "market_share_fr": 5.4, "platforms": ["Meta", "Google"]},
-        "Promovacances": {"belgium_ad_spend_eur": 500000, "france_ad_spend_eur": 12000000, "total_spend": 12500000, "market_share_be": 1.5, "market_share_fr": 4.3, "platforms": ["Meta", "Google"]},
-        "Lastminute.com": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 18000000, "total_spend": 19200000, "market_share_be": 3.6, "market_share_fr": 6.4, "platforms": ["Meta", "Google"]}
-    },
-    "education": {
-        # Online learning platforms advertising in Belgium & France
-        "Coursera": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 18000000, "total_spend": 20500000, "market_share_be": 22.8, "market_share_fr": 15.8, "platforms": ["Meta", "Google"]},
-        "Udemy": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 15000000, "total_spend": 17000000, "market_share_be": 18.2, "market_share_fr": 13.2, "platforms": ["Meta", "Google"]},
-        "LinkedIn Learning": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 12000000, "total_spend": 13800000, "market_share_be": 16.4, "market_share_fr": 10.5, "platforms": ["Meta", "Google"]},
-        "Skillshare": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 8000000, "total_spend": 9200000, "market_share_be": 10.9, "market_share_fr": 7.0, "platforms": ["Meta", "Google"]},
-        "MasterClass": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 6000000, "total_spend": 6800000, "market_share_be": 7.3, "market_share_fr": 5.3, "platforms": ["Meta", "Google"]},
-        "Duolingo": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 12000000, "total_spend": 13500000, "market_share_be": 13.6, "market_share_fr": 10.5, "platforms": ["Meta", "Google"]},
-        "Babbel": {"belgium_ad_spend_eur": 1000000, "france_ad_spend_eur": 8500000, "total_spend": 9500000, "market_share_be": 9.1, "market_share_fr": 7.5, "platforms": ["Meta", "Google"]},
-        # Traditional education and publishers
-        "Pearson": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 6000000, "total_spend": 6800000, "market_share_be": 12.5, "market_share_fr": 8.8, "platforms": ["Meta", "Google"]},
-        "McGraw-Hill": {"belgium_ad_spend_eur": 600000, "france_ad_spend_eur": 4500000, "total_spend": 5100000, "market_share_be": 9.4, "market_share_fr": 6.6, "platforms": ["Meta", "Google"]},
-        "Cambridge University Press": {"belgium_ad_spend_eur": 500000, "france_ad_spend_eur": 3500000, "total_spend": 4000000, "market_share_be": 7.8, "market_share_fr": 5.1, "platforms": ["Meta", "Google"]},
-        # Belgian education institutions and services
-        "KU Leuven": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 0, "total_spend": 1200000, "market_share_be": 10.9, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "UCLouvain": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 0, "total_spend": 800000, "market_share_be": 7.3, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "UGent": {"belgium_ad_spend_eur": 600000, "france_ad_spend_eur": 0, "total_spend": 600000, "market_share_be": 5.5, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "EPHEC": {"belgium_ad_spend_eur": 400000, "france_ad_spend_eur": 0, "total_spend": 400000, "market_share_be": 3.6, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "HEC Liège": {"belgium_ad_spend_eur": 350000, "france_ad_spend_eur": 0, "total_spend": 350000, "market_share_be": 3.2, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        # French education institutions and services
-        "Sorbonne Université": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 3500000, "total_spend": 3500000, "market_share_be": 0, "market_share_fr": 5.1, "platforms": ["Meta", "Google"]},
-        "HEC Paris": {"belgium_ad_spend_eur": 200000, "france_ad_spend_eur": 2800000, "total_spend": 3000000, "market_share_be": 1.8, "market_share_fr": 4.1, "platforms": ["Meta", "Google"]},
-        "INSEAD": {"belgium_ad_spend_eur": 300000, "france_ad_spend_eur": 2200000, "total_spend": 2500000, "market_share_be": 2.7, "market_share_fr": 3.2, "platforms": ["Meta", "Google"]},
-        "Sciences Po": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 1800000, "total_spend": 1800000, "market_share_be": 0, "market_share_fr": 2.6, "platforms": ["Meta", "Google"]},
-        "CNED": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 4500000, "total_spend": 4500000, "market_share_be": 0, "market_share_fr": 6.6, "platforms": ["Meta", "Google"]},
-        # Private training and certification companies
-        "OpenClassrooms": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 8000000, "total_spend": 8800000, "market_share_be": 7.3, "market_share_fr": 11.8, "platforms": ["Meta", "Google"]},
-        "Le Wagon": {"belgium_ad_spend_eur": 600000, "france_ad_spend_eur": 4500000, "total_spend": 5100000, "market_share_be": 5.5, "market_share_fr": 6.6, "platforms": ["Meta", "Google"]},
-        "Wild Code School": {"belgium_ad_spend_eur": 400000, "france_ad_spend_eur": 3200000, "total_spend": 3600000, "market_share_be": 3.6, "market_share_fr": 4.7, "platforms": ["Meta", "Google"]},
-        "BeCode": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 200000, "total_spend": 1000000, "market_share_be": 7.3, "market_share_fr": 0.3, "platforms": ["Meta", "Google"]}
-    },
-    "real_estate": {
-        # Real estate portals and platforms advertising in Belgium & France
-        "Immoweb": {"belgium_ad_spend_eur": 8000000, "france_ad_spend_eur": 0, "total_spend": 8000000, "market_share_be": 45.7, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Logic-immo.com": {"belgium_ad_spend_eur": 500000, "france_ad_spend_eur": 12000000, "total_spend": 12500000, "market_share_be": 2.9, "market_share_fr": 18.5, "platforms": ["Meta", "Google"]},
-        "SeLoger.com": {"belgium_ad_spend_eur": 300000, "france_ad_spend_eur": 15000000, "total_spend": 15300000, "market_share_be": 1.7, "market_share_fr": 23.1, "platforms": ["Meta", "Google"]},
-        "Leboncoin": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 18000000, "total_spend": 19200000, "market_share_be": 6.9, "market_share_fr": 27.7, "platforms": ["Meta", "Google"]},
-        "PAP.fr": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 8000000, "total_spend": 8000000, "market_share_be": 0, "market_share_fr": 12.3, "platforms": ["Meta", "Google"]},
-        "Bien'ici": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 6500000, "total_spend": 6500000, "market_share_be": 0, "market_share_fr": 10.0, "platforms": ["Meta", "Google"]},
-        # Belgian real estate companies and services
-        "Zimmo": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 0, "total_spend": 3500000, "market_share_be": 20.0, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Realo": {"belgium_ad_spend_eur": 2200000, "france_ad_spend_eur": 0, "total_spend": 2200000, "market_share_be": 12.6, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Era Belgium": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 0, "total_spend": 1800000, "market_share_be": 10.3, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Century 21 Belgium": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 0, "total_spend": 1500000, "market_share_be": 8.6, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Engel & Völkers Belgium": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 0, "total_spend": 800000, "market_share_be": 4.6, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Dewaele": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 0, "total_spend": 1200000, "market_share_be": 6.9, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        # French real estate companies and services
-        "Century 21 France": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 12000000, "total_spend": 12000000, "market_share_be": 0, "market_share_fr": 18.5, "platforms": ["Meta", "Google"]},
-        "Orpi": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 10000000, "total_spend": 10000000, "market_share_be": 0, "market_share_fr": 15.4, "platforms": ["Meta", "Google"]},
-        "Guy Hoêet l'Immobilier": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 8500000, "total_spend": 8500000, "market_share_be": 0, "market_share_fr": 13.1, "platforms": ["Meta", "Google"]},
-        "Foncia": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 7000000, "total_spend": 7000000, "market_share_be": 0, "market_share_fr": 10.8, "platforms": ["Meta", "Google"]},
-        "Laforêt": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 5500000, "total_spend": 5500000, "market_share_be": 0, "market_share_fr": 8.5, "platforms": ["Meta", "Google"]},
-        "Square Habitat": {"belgium_ad_spend_eur": 0, "france_ad_spend_eur": 4500000, "total_spend": 4500000, "market_share_be": 0, "market_share_fr": 6.9, "platforms": ["Meta", "Google"]},
-        # Property developers and investment companies
-        "Unibail-Rodamco-Westfield": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 18000000, "total_spend": 20500000, "market_share_be": 8.5, "market_share_fr": 12.8, "platforms": ["Meta", "Google"]},
-        "Klepierre": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 12000000, "total_spend": 13500000, "market_share_be": 5.1, "market_share_fr": 8.5, "platforms": ["Meta", "Google"]},
-        "Cofinimmo": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 800000, "total_spend": 2800000, "market_share_be": 6.8, "market_share_fr": 0.6, "platforms": ["Meta", "Google"]},
-        "Montea": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 1200000, "total_spend": 2000000, "market_share_be": 2.7, "market_share_fr": 0.9, "platforms": ["Meta", "Google"]},
-        # Construction and home improvement
-        "Ikea": {"belgium_ad_spend_eur": 12000000, "france_ad_spend_eur": 65000000, "total_spend": 77000000, "market_share_be": 25.8, "market_share_fr": 22.3, "platforms": ["Meta", "Google"]},
-        "Leroy Merlin": {"belgium_ad_spend_eur": 6000000, "france_ad_spend_eur": 45000000, "total_spend": 51000000, "market_share_be": 12.9, "market_share_fr": 15.4, "platforms": ["Meta", "Google"]},
-        "Brico": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 0, "total_spend": 4000000, "market_share_be": 8.6, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Castorama": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 35000000, "total_spend": 37000000, "market_share_be": 4.3, "market_share_fr": 12.0, "platforms": ["Meta", "Google"]},
-        "Bricoman": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 28000000, "total_spend": 29500000, "market_share_be": 3.2, "market_share_fr": 9.6, "platforms": ["Meta", "Google"]}
-    },
-    "gaming": {
-        # Major gaming companies advertising in Belgium & France
-        "Ubisoft": {"belgium_ad_spend_eur": 5000000, "france_ad_spend_eur": 85000000, "total_spend": 90000000, "market_share_be": 22.8, "market_share_fr": 28.5, "platforms": ["Meta", "Google"]},
-        "EA": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 55000000, "total_spend": 59000000, "market_share_be": 18.2, "market_share_fr": 18.5, "platforms": ["Meta", "Google"]},
-        "Activision Blizzard": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 48000000, "total_spend": 51500000, "market_share_be": 15.9, "market_share_fr": 16.1, "platforms": ["Meta", "Google"]},
-        "Epic Games": {"belgium_ad_spend_eur": 3000000, "france_ad_spend_eur": 42000000, "total_spend": 45000000, "market_share_be": 13.6, "market_share_fr": 14.1, "platforms": ["Meta", "Google"]},
-        "Riot Games": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 35000000, "total_spend": 37500000, "market_share_be": 11.4, "market_share_fr": 11.7, "platforms": ["Meta", "Google"]},
-        "Sony PlayStation": {"belgium_ad_spend_eur": 4500000, "france_ad_spend_eur": 58000000, "total_spend": 62500000, "market_share_be": 20.5, "market_share_fr": 19.5, "platforms": ["Meta", "Google"]},
-        "Microsoft Xbox": {"belgium_ad_spend_eur": 4000000, "france_ad_spend_eur": 52000000, "total_spend": 56000000, "market_share_be": 18.2, "market_share_fr": 17.5, "platforms": ["Meta", "Google"]},
-        "Nintendo": {"belgium_ad_spend_eur": 3500000, "france_ad_spend_eur": 45000000, "total_spend": 48500000, "market_share_be": 15.9, "market_share_fr": 15.1, "platforms": ["Meta", "Google"]},
-        # Mobile gaming companies
-        "King (Candy Crush)": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 28000000, "total_spend": 30500000, "market_share_be": 25.8, "market_share_fr": 22.5, "platforms": ["Meta", "Google"]},
-        "Supercell": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 25000000, "total_spend": 27000000, "market_share_be": 20.6, "market_share_fr": 20.1, "platforms": ["Meta", "Google"]},
-        "Niantic": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 18000000, "total_spend": 19500000, "market_share_be": 15.5, "market_share_fr": 14.5, "platforms": ["Meta", "Google"]},
-        "Zynga": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 15000000, "total_spend": 16200000, "market_share_be": 12.4, "market_share_fr": 12.1, "platforms": ["Meta", "Google"]},
-        "Rovio": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 12000000, "total_spend": 12800000, "market_share_be": 8.2, "market_share_fr": 9.6, "platforms": ["Meta", "Google"]},
-        # Gaming platforms and services
-        "Steam": {"belgium_ad_spend_eur": 2000000, "france_ad_spend_eur": 32000000, "total_spend": 34000000, "market_share_be": 18.2, "market_share_fr": 15.8, "platforms": ["Meta", "Google"]},
-        "Twitch": {"belgium_ad_spend_eur": 1800000, "france_ad_spend_eur": 28000000, "total_spend": 29800000, "market_share_be": 16.4, "market_share_fr": 13.8, "platforms": ["Meta", "Google"]},
-        "Discord": {"belgium_ad_spend_eur": 1500000, "france_ad_spend_eur": 22000000, "total_spend": 23500000, "market_share_be": 13.6, "market_share_fr": 10.8, "platforms": ["Meta", "Google"]},
-        "Google Stadia": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 12000000, "total_spend": 12800000, "market_share_be": 7.3, "market_share_fr": 5.9, "platforms": ["Meta"]},
-        # French gaming companies
-        "Focus Entertainment": {"belgium_ad_spend_eur": 300000, "france_ad_spend_eur": 8000000, "total_spend": 8300000, "market_share_be": 1.4, "market_share_fr": 2.7, "platforms": ["Meta", "Google"]},
-        "Dontnod Entertainment": {"belgium_ad_spend_eur": 200000, "france_ad_spend_eur": 5000000, "total_spend": 5200000, "market_share_be": 0.9, "market_share_fr": 1.7, "platforms": ["Meta", "Google"]},
-        "Quantic Dream": {"belgium_ad_spend_eur": 150000, "france_ad_spend_eur": 4000000, "total_spend": 4150000, "market_share_be": 0.7, "market_share_fr": 1.3, "platforms": ["Meta", "Google"]},
-        # Belgian gaming companies and local esports
-        "Larian Studios": {"belgium_ad_spend_eur": 2500000, "france_ad_spend_eur": 3000000, "total_spend": 5500000, "market_share_be": 11.4, "market_share_fr": 1.0, "platforms": ["Meta", "Google"]},
-        "Appeal Studios": {"belgium_ad_spend_eur": 400000, "france_ad_spend_eur": 0, "total_spend": 400000, "market_share_be": 1.8, "market_share_fr": 0, "platforms": ["Meta", "Google"]},
-        "Team Vitality": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 6000000, "total_spend": 6800000, "market_share_be": 3.6, "market_share_fr": 2.0, "platforms": ["Meta", "Google"]},
-        "G2 Esports": {"belgium_ad_spend_eur": 600000, "france_ad_spend_eur": 4500000, "total_spend": 5100000, "market_share_be": 2.7, "market_share_fr": 1.5, "platforms": ["Meta", "Google"]},
-        # Gaming hardware and accessories
-        "Razer": {"belgium_ad_spend_eur": 1200000, "france_ad_spend_eur": 18000000, "total_spend": 19200000, "market_share_be": 8.5, "market_share_fr": 7.2, "platforms": ["Meta", "Google"]},
-        "Logitech G": {"belgium_ad_spend_eur": 1000000, "france_ad_spend_eur": 15000000, "total_spend": 16000000, "market_share_be": 7.1, "market_share_fr": 6.0, "platforms": ["Meta", "Google"]},
-        "SteelSeries": {"belgium_ad_spend_eur": 800000, "france_ad_spend_eur": 12000000, "total_spend": 12800000, "market_share_be": 5.7, "market_share_fr": 4.8, "platforms": ["Meta", "Google"]},
-        "HyperX": {"belgium_ad_spend_eur": 600000, "france_ad_spend_eur": 9000000, "total_spend": 9600000, "market_share_be": 4.3, "market_share_fr": 3.6, "platforms": ["Meta", "Google"]}
-    }
-}
+# All brands (global and local) spending on Meta and Google ads targeting Belgian and French consumers,
+# stored as a versioned columnar file (see brand_dataset.py) and loaded one industry at a time
+BRANDS_DATASET_PATH = os.environ.get(
+    "BRANDS_DATASET_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "brands.bin")
+)
+
+class BrandIndustries(Mapping):
+    """Read-only industry -> brands mapping that decodes each industry on first access.
+    
+    Sources are brand mappings or loaders returning one; loaded industries are kept.
+    """
+    
+    def __init__(self, sources: Dict[str, Union[Mapping, Callable[[], Dict]]]):
+        self._sources = dict(sources)
+        self._loaded: Dict[str, MappingProxyType] = {}
+    
+    def __getitem__(self, industry: str) -> MappingProxyType:
+        industry_data = self._loaded.get(industry)
+        if industry_data is None:
+            source = self._sources[industry]
+            if callable(source):
+                source = source()
+            industry_data = self._loaded.setdefault(industry, MappingProxyType(dict(source)))
+        return industry_data
+    
+    def __contains__(self, industry) -> bool:
+        return industry in self._sources
+    
+    def __iter__(self):
+        return iter(self._sources)
+    
+    def __len__(self) -> int:
+        return len(self._sources)
+    
+    def loaded(self) -> List[str]:
+        """Industries decoded so far."""
+        return list(self._loaded)
+    
+    def sources(self) -> Dict[str, Union[Mapping, Callable[[], Dict]]]:
+        """Loaded industries or their loaders, for building the next snapshot without decoding."""
+        return {industry: self._loaded.get(industry, source) for industry, source in self._sources.items()}
+
+class BrandSnapshot:
+    """Immutable, versioned view of the brand store and the indexes derived from it.
+    
+    Readers take current_snapshot once per request and use it without locking.
+    Writers build the next snapshot off to the side, sharing untouched industries,
+    and publish it by swapping current_snapshot. A superseded snapshot and its
+    indexes are freed once no request still holds it. Brand rows are never
+    mutated in place; writers replace them with new dicts.
+    """
+    
+    def __init__(self, version: int, brands: Dict[str, Union[Mapping, Callable[[], Dict]]],
+                 dataset_version: int = 0, dataset_mtime: float = 0.0):
+        self.version = version
+        self.dataset_version = dataset_version
+        self.dataset_mtime = dataset_mtime
+        self.brands = BrandIndustries(brands)
+        self._derived: Dict[tuple, object] = {}
+    
+    def derive(self, key: tuple, build):
+        """Memoize an index computed from this snapshot; concurrent builders race harmlessly."""
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived.setdefault(key, build())
+        return value
+    
+    def cached(self, key: tuple):
+        """Get an index already derived from this snapshot, without building it."""
+        return self._derived.get(key)
+
+def _open_brand_snapshot(version: int, path: str = None) -> BrandSnapshot:
+    """Map a brand dataset file into a snapshot whose industries load lazily."""
+    dataset = BrandDataset(path or BRANDS_DATASET_PATH)
+    loaders = {industry: (lambda industry=industry: dataset.load_industry(industry)) for industry in dataset.industries()}
+    return BrandSnapshot(version, loaders, dataset.version, dataset.mtime)
+
+# Snapshot every reader starts from; replaced wholesale, never mutated
+current_snapshot = _open_brand_snapshot(1)
+
+# Seconds between checks of the dataset file for a new version; 0 disables the watcher
+BRANDS_DATASET_WATCH_SECONDS = float(os.environ.get("BRANDS_DATASET_WATCH_SECONDS", "0"))
+
+# Read-only SQL over an in-memory SQLite mirror is opt-in; the mirror is built on first use
+BRAND_SQL_ENABLED = os.environ.get("BRAND_SQL_ENABLED", "").lower() in ("1", "true", "yes")
+brand_sql_mirror: Optional[BrandSqlMirror] = None
+brand_sql_lock = threading.Lock()
 
 # Currency conversion rates (EUR base)
 CURRENCY_RATES = {
@@ -427,6 +259,69 @@ CURRENCY_RATES = {
     "DKK": 7.45
 }
 
+# Numeric brand fields usable as sort keys (output field -> database field)
+SORTABLE_BRAND_FIELDS = {
+    "total_spend": "total_spend",
+    "belgium_spend": "belgium_ad_spend_eur",
+    "france_spend": "france_ad_spend_eur",
+    "market_share_belgium": "market_share_be",
+    "market_share_france": "market_share_fr"
+}
+
+# Per-market spend and market share fields in the brand database
+COUNTRY_FIELDS = {
+    "belgium": {"name": "Belgium", "spend": "belgium_ad_spend_eur", "market_share": "market_share_be"},
+    "france": {"name": "France", "spend": "france_ad_spend_eur", "market_share": "market_share_fr"}
+}
+
+# Country scopes market concentration is maintained for
+CONCENTRATION_SCOPES = ["all"] + list(COUNTRY_FIELDS)
+
+# Numeric row fields usable as sort keys in the country and subcategory listings
+COUNTRY_SORT_FIELDS = ["annual_ad_spend", "total_spend", "market_share"]
+SUBCATEGORY_SORT_FIELDS = ["annual_ad_spend", "market_share", "share_of_category_spend"]
+
+# Response formats: raw numbers, formatted display strings, or both side by side
+RESPONSE_FORMATS = ("raw", "display", "both")
+
+# Fields that can be requested through a fields projection, per view
+SECTOR_BRAND_FIELDS = ["belgium_spend", "france_spend", "total_spend", "market_share_belgium", "market_share_france", "platforms"]
+BRAND_DETAIL_SECTIONS = ["market_presence", "financial_data", "platform_breakdown", "ad_type_breakdown", "competitive_position"]
+COUNTRY_BRAND_FIELDS = ["industry", "annual_ad_spend", "total_spend", "market_share"]
+SUBCATEGORY_BRAND_FIELDS = ["markets", "annual_ad_spend", "market_share", "share_of_category_spend", "subcategories"]
+
+# Upper bound on rows returned in one page of a ranked listing
+MAX_PAGE_SIZE = 500
+
+# Upper bound on brands resolved in one batch details request
+MAX_BATCH_SIZE = 200
+
+# Budget what-if scenario levers, in percent, and the most scenarios evaluated per request
+SCENARIO_FIELDS = ["shift_google_to_meta_pct", "belgium_spend_change_pct", "france_spend_change_pct"]
+MAX_SCENARIOS = 1000
+
+# Metrics compare_industries and compare_industries_matrix rank industries on,
+# and the trend series each one follows
+INDUSTRY_METRICS = {"ad_volume": "ad_count", "spend_estimate": "spend", "avg_duration": None}
+# History window of the trends reported next to industry comparisons
+COMPARISON_TREND_DAYS = 7
+
+# Shared deadline for the concurrent Meta and Google fetches behind a platform comparison
+PLATFORM_COMPARISON_TIMEOUT_SECONDS = float(os.environ.get("PLATFORM_COMPARISON_TIMEOUT_SECONDS", "10"))
+PLATFORM_COMPARISON_LIMIT = 50
+# Metric -> normalized ad column it aggregates and the unit reported
+PLATFORM_METRICS = {"reach": "impressions", "spend": "spend", "engagement": "clicks", "ctr": "clicks"}
+
+# Trend history and forecast horizon bounds, and advertisers forecast alongside an industry
+MAX_TREND_DAYS = 365
+MAX_FORECAST_DAYS = 30
+TOP_ADVERTISER_FORECASTS = 5
+
+# Columns of the flat brand export, and rows per streamed export batch
+EXPORT_FIELDS = ["industry", "brand_name", "belgium_spend", "france_spend", "total_spend",
+                 "market_share_be", "market_share_fr", "platforms", "currency"]
+EXPORT_BATCH_ROWS = 5000
+
 @mcp.resource("notes://all")
 def get_all_notes() -> str:
     """Get all stored notes as JSON."""
@@ -542,38 +437,33 @@ def search_ads_by_industry(industry: str, limit: int = 50, access_token: Optiona
     # If no access token provided, return demo data
     if not access_token:
         demo_ads = _generate_demo_ad_data(industry, limit)
-        ad_cache[cache_key] = {
-            "data": demo_ads,
-            "timestamp": datetime.now().isoformat()
-        }
+        _store_ads(ad_cache, cache_key, industry, "meta", demo_ads)
         return f"Demo Ad Data for {industry}:\n{json.dumps(demo_ads, indent=2)}"
     
     # Real API call (placeholder for actual implementation)
     keywords = INDUSTRY_KEYWORDS[industry.lower()]
     try:
         ads_data = _fetch_meta_ads(keywords, limit, access_token)
-        ad_cache[cache_key] = {
-            "data": ads_data,
-            "timestamp": datetime.now().isoformat()
-        }
+        _store_ads(ad_cache, cache_key, industry, "meta", ads_data)
         return f"Ad Transparency Data for {industry}:\n{json.dumps(ads_data, indent=2)}"
     except Exception as e:
         return f"Error fetching ads: {str(e)}"
 
 @mcp.tool()
-def analyze_ad_trends(industry: str, days_back: int = 7) -> str:
+def analyze_ad_trends(industry: str, days_back: int = 7, forecast_days: int = 7) -> str:
     """Analyze advertising trends for a specific industry over time.
     
     Args:
         industry: Industry to analyze
-        days_back: Number of days to look back for trend analysis
+        days_back: Number of days to look back for trend analysis (max 365)
+        forecast_days: Number of days to forecast ad volume and spend ahead (max 30)
     """
     if industry.lower() not in INDUSTRY_KEYWORDS:
         available = ", ".join(INDUSTRY_KEYWORDS.keys())
         return f"Industry '{industry}' not supported. Available industries: {available}"
     
     # Generate trend analysis based on cached data or demo data
-    trends = _generate_trend_analysis(industry, days_back)
+    trends = _generate_trend_analysis(industry, days_back, forecast_days)
     return f"Ad Trend Analysis for {industry} (last {days_back} days):\n{json.dumps(trends, indent=2)}"
 
 @mcp.tool()
@@ -607,6 +497,17 @@ def compare_industries(industry1: str, industry2: str, metric: str = "ad_volume"
     comparison = _generate_industry_comparison(industry1, industry2, metric)
     return f"Industry Comparison ({industry1} vs {industry2}):\n{json.dumps(comparison, indent=2)}"
 
+@mcp.tool()
+def compare_industries_matrix(metric: str = "ad_volume", industries: Optional[List[str]] = None) -> str:
+    """Compare every pair of industries on one metric in a single call.
+    
+    Args:
+        metric: Metric to compare (ad_volume, spend_estimate, avg_duration)
+        industries: Industries to include (default: all)
+    """
+    matrix = _generate_industry_matrix(metric, industries)
+    return f"Industry Comparison Matrix ({metric}):\n{json.dumps(matrix, indent=2)}"
+
 @mcp.tool()
 def search_google_ads_by_industry(industry: str, limit: int = 50, google_api_key: Optional[str] = None) -> str:
     """Search Google Ads transparency data by industry.
@@ -631,19 +532,13 @@ def search_google_ads_by_industry(industry: str, limit: int = 50, google_api_key
     # If no API key provided, return demo data
     if not google_api_key:
         demo_ads = _generate_demo_google_ads_data(industry, limit)
-        google_ads_cache[cache_key] = {
-            "data": demo_ads,
-            "timestamp": datetime.now().isoformat()
-        }
+        _store_ads(google_ads_cache, cache_key, industry, "google", demo_ads)
         return f"Demo Google Ads Data for {industry}:\n{json.dumps(demo_ads, indent=2)}"
     
     # Real Google Ads API call (placeholder for actual implementation)
     try:
         ads_data = _fetch_google_ads(industry, limit, google_api_key)
-        google_ads_cache[cache_key] = {
-            "data": ads_data,
-            "timestamp": datetime.now().isoformat()
-        }
+        _store_ads(google_ads_cache, cache_key, industry, "google", ads_data)
         return f"Google Ads Transparency Data for {industry}:\n{json.dumps(ads_data, indent=2)}"
     except Exception as e:
         return f"Error fetching Google ads: {str(e)}"
@@ -668,22 +563,26 @@ def get_all_brands_by_industry(industry: str, include_competitors: bool = True)
     # Generate comprehensive brand list
     brands_data = _generate_comprehensive_brands_data(industry, include_competitors)
     brands_cache[cache_key] = brands_data
+    event_broker.publish("cache_refresh", {"cache": "brands", "key": cache_key, "industry": industry.lower()})
     
     return f"Comprehensive Brands in {industry}:\n{json.dumps(brands_data, indent=2)}"
 
 @mcp.tool()
-def compare_meta_vs_google_ads(industry: str, metric: str = "reach") -> str:
+def compare_meta_vs_google_ads(industry: str, metric: str = "reach", access_token: Optional[str] = None,
+                               google_api_key: Optional[str] = None) -> str:
     """Compare Meta vs Google Ads performance for an industry.
     
     Args:
         industry: Industry to compare
         metric: Metric to compare (reach, spend, engagement, ctr)
+        access_token: Meta API access token (optional, uses demo data if not provided)
+        google_api_key: Google Ads API key (optional, uses demo data if not provided)
     """
     if industry.lower() not in INDUSTRY_KEYWORDS:
         available = ", ".join(INDUSTRY_KEYWORDS.keys())
         return f"Industry '{industry}' not supported. Available industries: {available}"
     
-    comparison = _generate_platform_comparison(industry, metric)
+    comparison = _generate_platform_comparison(industry, metric, access_token, google_api_key)
     return f"Meta vs Google Ads Comparison ({industry}):\n{json.dumps(comparison, indent=2)}"
 
 @mcp.tool()
@@ -703,27 +602,113 @@ def analyze_brand_advertising_strategy(brand_name: str, industry: str, platforms
     return f"Brand Strategy Analysis for {brand_name}:\n{json.dumps(strategy_analysis, indent=2)}"
 
 @mcp.tool()
-def get_sector_overview_eur(industry: str, currency: str = "EUR", country_filter: str = "all", date_from: str = None, date_to: str = None) -> str:
+def get_sector_overview_eur(industry: str, currency: str = "EUR", country_filter: str = "all", date_from: str = None, date_to: str = None,
+                            top_n: int = 10, offset: int = 0, cursor: Optional[str] = None, sort_by: str = "total_spend",
+                            fields: Optional[str] = None, response_format: str = "both") -> str:
     """Get comprehensive sector overview with European brands and spending in EUR.
     
     Args:
         industry: Industry to analyze
         currency: Target currency (EUR, USD, GBP, etc.)
         country_filter: Country to filter by (all, Germany, France, etc.)
+        top_n: Number of top spenders to return (default: 10)
+        offset: Number of ranked brands to skip
+        cursor: Cursor from a previous page's pagination.next_cursor (overrides offset and sort_by)
+        sort_by: Numeric field to rank brands by (total_spend, belgium_spend, france_spend, market_share_belgium, market_share_france)
+        fields: Comma-separated top spender fields to include (default: all)
+        response_format: raw (numbers only), display (formatted strings only) or both
     """
-    if industry.lower() not in BELGIUM_FRANCE_BRANDS_DATABASE:
-        available = ", ".join(BELGIUM_FRANCE_BRANDS_DATABASE.keys())
+    if industry.lower() not in current_snapshot.brands:
+        available = ", ".join(current_snapshot.brands.keys())
         return f"Industry '{industry}' not available in Belgian/French database. Available industries: {available}"
     
     if currency not in CURRENCY_RATES:
         available = ", ".join(CURRENCY_RATES.keys())
         return f"Currency '{currency}' not supported. Available currencies: {available}"
     
-    sector_data = _generate_sector_overview(industry, currency, country_filter, date_from, date_to)
+    sector_data = _generate_sector_overview(industry, currency, country_filter, date_from, date_to, top_n, offset, cursor, sort_by,
+                                            fields, response_format)
     return f"European Sector Overview - {industry.title()}:\n{json.dumps(sector_data, indent=2)}"
 
 @mcp.tool()
-def get_brand_details_eur(brand_name: str, industry: str, currency: str = "EUR", country_filter: str = "all", date_from: str = None, date_to: str = None) -> str:
+def get_global_leaderboard_eur(country_filter: str = "all", currency: str = "EUR", date_from: str = None, date_to: str = None,
+                               top_n: int = 50, offset: int = 0, cursor: Optional[str] = None, sort_by: str = "total_spend",
+                               fields: Optional[str] = None, response_format: str = "both") -> str:
+    """Get the top advertisers across all industries in Belgium, France or both.
+    
+    Args:
+        country_filter: Market to rank in (all, belgium, france)
+        currency: Target currency (EUR, USD, GBP, etc.)
+        date_from: Start date (YYYY-MM-DD) scaling annual spend to the period
+        date_to: End date (YYYY-MM-DD)
+        top_n: Number of advertisers to return (default: 50)
+        offset: Number of ranked advertisers to skip
+        cursor: Cursor from a previous page's pagination.next_cursor (overrides offset and sort_by)
+        sort_by: Numeric field to rank brands by (total_spend, belgium_spend, france_spend, market_share_belgium, market_share_france)
+        fields: Comma-separated advertiser fields to include (default: all)
+        response_format: raw (numbers only), display (formatted strings only) or both
+    """
+    leaderboard = _generate_global_leaderboard(country_filter, currency, date_from, date_to, top_n, offset, cursor, sort_by,
+                                               fields, response_format)
+    return f"Global Advertiser Leaderboard:\n{json.dumps(leaderboard, indent=2)}"
+
+@mcp.tool()
+def find_similar_brands(brand_name: str, industry: str, scope: str = "industry", top_n: int = 10) -> str:
+    """Find competitors with the most similar advertising profile (country split, platform split, video/display mix, market shares).
+    
+    Args:
+        brand_name: Brand to find similar brands for
+        industry: Industry of the brand
+        scope: industry (same industry only) or all (across industries)
+        top_n: Number of similar brands to return (default: 10)
+    """
+    result = _find_similar_brands(brand_name, industry, scope, top_n)
+    return f"Similar Brands - {brand_name}:\n{json.dumps(result, indent=2)}"
+
+@mcp.tool()
+def simulate_budget_shift(industry: str, brand_name: Optional[str] = None, scenarios: Optional[List[Dict]] = None,
+                          grid: Optional[Dict[str, List[float]]] = None, currency: str = "EUR") -> str:
+    """Simulate budget what-if scenarios for a brand or a whole industry in one batch.
+    
+    Args:
+        industry: Industry to simulate
+        brand_name: Brand to apply the scenarios to (omit to apply them to the whole industry)
+        scenarios: List of {"name", "shift_google_to_meta_pct", "belgium_spend_change_pct", "france_spend_change_pct"}
+        grid: Lever -> list of values, e.g. {"shift_google_to_meta_pct": [0, 10, 20]}, expanded to every combination
+        currency: Currency of the reported amounts
+    """
+    result = _simulate_budget_shift(industry, brand_name, scenarios, grid, currency)
+    return f"Budget Shift Simulation - {brand_name or industry}:\n{json.dumps(result, indent=2)}"
+
+@mcp.tool()
+def get_spend_anomalies(industry: Optional[str] = None, advertiser: Optional[str] = None, platform: Optional[str] = None,
+                        metric: Optional[str] = None, since: int = 0, limit: int = 50) -> str:
+    """Get recent spikes and drops flagged in ingested spend and ad-volume series.
+    
+    Args:
+        industry: Only anomalies in this industry
+        advertiser: Only anomalies of this advertiser or brand; also returns its running statistics
+        platform: Only anomalies on this platform (meta or google)
+        metric: Only anomalies in this metric (spend or ad_volume)
+        since: Only anomalies after this sequence number, for polling
+        limit: Maximum number of anomalies to return (max 500)
+    """
+    result = _get_spend_anomalies(industry, advertiser, platform, metric, since, limit)
+    return f"Spend Anomalies:\n{json.dumps(result, indent=2)}"
+
+@mcp.tool()
+def get_provider_quotas(provider: Optional[str] = None) -> str:
+    """Get the remaining request allowance of every ad provider credential in use.
+    
+    Args:
+        provider: Only this provider (meta, google or another registered provider)
+    """
+    result = _get_provider_quotas(provider)
+    return f"Provider Quotas:\n{json.dumps(result, indent=2)}"
+
+@mcp.tool()
+def get_brand_details_eur(brand_name: str, industry: str, currency: str = "EUR", country_filter: str = "all", date_from: str = None, date_to: str = None,
+                          fields: Optional[str] = None, response_format: str = "both") -> str:
     """Get detailed information about a specific European brand including ad spend in EUR.
     
     Args:
@@ -731,60 +716,148 @@ def get_brand_details_eur(brand_name: str, industry: str, currency: str = "EUR",
         industry: Industry the brand belongs to
         currency: Target currency for financial data
         country_filter: Country to filter by (all, Germany, France, etc.)
+        fields: Comma-separated sections (market_presence, financial_data, platform_breakdown, ad_type_breakdown, competitive_position) to include (default: all)
+        response_format: raw (numbers only), display (formatted strings only) or both
     """
-    if industry.lower() not in BELGIUM_FRANCE_BRANDS_DATABASE:
-        available = ", ".join(BELGIUM_FRANCE_BRANDS_DATABASE.keys())
+    if industry.lower() not in current_snapshot.brands:
+        available = ", ".join(current_snapshot.brands.keys())
         return f"Industry '{industry}' not available. Available industries: {available}"
     
     if currency not in CURRENCY_RATES:
         available = ", ".join(CURRENCY_RATES.keys())
         return f"Currency '{currency}' not supported. Available currencies: {available}"
     
-    brand_details = _get_brand_granular_details(brand_name, industry, currency, country_filter, date_from, date_to)
+    brand_details = _get_brand_granular_details(brand_name, industry, currency, country_filter, date_from, date_to,
+                                                fields, response_format)
     return f"Brand Details - {brand_name}:\n{json.dumps(brand_details, indent=2)}"
 
 @mcp.tool()
-def get_country_brand_analysis_eur(country: str, currency: str = "EUR") -> str:
-    """Get all brands from a specific European country with ad spending analysis.
+def get_brand_details_batch_eur(brand_names: List[str], industry: str, currency: str = "EUR", country_filter: str = "all",
+                                date_from: str = None, date_to: str = None, fields: Optional[str] = None,
+                                response_format: str = "both") -> str:
+    """Get detailed information about many brands of one industry in a single call.
+    
+    Args:
+        brand_names: Names of the brands
+        industry: Industry the brands belong to
+        currency: Target currency for financial data
+        country_filter: Country to filter by (all, Belgium, France)
+        date_from: Start date (YYYY-MM-DD)
+        date_to: End date (YYYY-MM-DD)
+        fields: Comma-separated sections to include (default: all)
+        response_format: raw (numbers only), display (formatted strings only) or both
+    """
+    if industry.lower() not in current_snapshot.brands:
+        available = ", ".join(current_snapshot.brands.keys())
+        return f"Industry '{industry}' not available. Available industries: {available}"
+    
+    if currency not in CURRENCY_RATES:
+        available = ", ".join(CURRENCY_RATES.keys())
+        return f"Currency '{currency}' not supported. Available currencies: {available}"
+    
+    batch_details = _get_brand_details_batch(brand_names, industry, currency, country_filter, date_from, date_to,
+                                             fields, response_format)
+    return f"Brand Details Batch - {industry.title()}:\n{json.dumps(batch_details, indent=2)}"
+
+@mcp.tool()
+def get_country_brand_analysis_eur(country: str, currency: str = "EUR", top_n: int = 15, offset: int = 0,
+                                   cursor: Optional[str] = None, sort_by: str = "annual_ad_spend",
+                                   fields: Optional[str] = None, response_format: str = "both") -> str:
+    """Get all brands advertising in a specific country with ad spending analysis.
     
     Args:
-        country: Country to analyze (Germany, France, UK, etc.)
+        country: Country to analyze (Belgium, France)
         currency: Target currency for financial data
+        top_n: Number of top brands to return (default: 15)
+        offset: Number of ranked brands to skip
+        cursor: Cursor from a previous page's pagination.next_cursor (overrides offset and sort_by)
+        sort_by: Numeric field to rank brands by (annual_ad_spend, total_spend, market_share)
+        fields: Comma-separated brand fields to include (default: all)
+        response_format: raw (numbers only), display (formatted strings only) or both
     """
     if currency not in CURRENCY_RATES:
         available = ", ".join(CURRENCY_RATES.keys())
         return f"Currency '{currency}' not supported. Available currencies: {available}"
     
-    country_analysis = _generate_country_brand_analysis(country, currency)
+    country_analysis = _generate_country_brand_analysis(country, currency, top_n, offset, cursor, sort_by,
+                                                        fields, response_format)
     return f"Country Brand Analysis - {country}:\n{json.dumps(country_analysis, indent=2)}"
 
 @mcp.tool()
-def get_subcategory_analysis_eur(industry: str, subcategory: str, currency: str = "EUR", country_filter: str = "all") -> str:
+def get_subcategory_analysis_eur(industry: str, subcategory: str, currency: str = "EUR", country_filter: str = "all",
+                                 top_n: int = 50, offset: int = 0, cursor: Optional[str] = None, sort_by: str = "annual_ad_spend",
+                                 fields: Optional[str] = None, response_format: str = "both") -> str:
     """Get granular analysis of a specific subcategory within an industry.
     
     Args:
         industry: Main industry (automotive, fashion, technology, etc.)
-        subcategory: Specific subcategory (luxury, mainstream, enterprise, etc.)
+        subcategory: Subcategory tag within the industry (luxury, mainstream, local, mobile gaming, etc.)
         currency: Target currency for financial data
-        country_filter: Country to filter by (all, Germany, France, etc.)
+        country_filter: Market to analyze (all, belgium, france)
+        top_n: Number of brands to return (default: 50)
+        offset: Number of ranked brands to skip
+        cursor: Cursor from a previous page's pagination.next_cursor (overrides offset and sort_by)
+        sort_by: Numeric field to rank brands by (annual_ad_spend, market_share, share_of_category_spend)
+        fields: Comma-separated brand fields to include (default: all)
+        response_format: raw (numbers only), display (formatted strings only) or both
     """
-    if industry.lower() not in BELGIUM_FRANCE_BRANDS_DATABASE:
-        available = ", ".join(BELGIUM_FRANCE_BRANDS_DATABASE.keys())
+    if industry.lower() not in current_snapshot.brands:
+        available = ", ".join(current_snapshot.brands.keys())
         return f"Industry '{industry}' not available. Available industries: {available}"
     
     if currency not in CURRENCY_RATES:
         available = ", ".join(CURRENCY_RATES.keys())
         return f"Currency '{currency}' not supported. Available currencies: {available}"
     
-    subcategory_data = _generate_subcategory_analysis(industry, subcategory, currency, country_filter)
+    subcategory_data = _generate_subcategory_analysis(industry, subcategory, currency, country_filter, top_n, offset, cursor, sort_by,
+                                                      fields, response_format)
     return f"Subcategory Analysis - {industry.title()} > {subcategory.title()}:\n{json.dumps(subcategory_data, indent=2)}"
 
+@mcp.tool()
+def query_brands_eur(group_by: Optional[List[str]] = None, aggregates: Optional[List[Dict]] = None,
+                     filters: Optional[List[Dict]] = None, order_by: Optional[List[Dict]] = None, limit: int = 100,
+                     currency: str = "EUR", date_from: str = None, date_to: str = None) -> str:
+    """Run an ad-hoc aggregate query over Belgian and French brand spend.
+    
+    Args:
+        group_by: Dimensions to group by (industry, brand_name, country, platform, trait)
+        aggregates: Aggregates as {"fn": count|sum|mean|min|max|share|hhi, "field": spend|market_share, "as": alias}
+        filters: Conditions as {"field", "op": ==|!=|>|>=|<|<=|in|not_in|contains, "value"}
+        order_by: Sort keys as {"field": dimension or aggregate alias, "desc": true|false}
+        limit: Maximum number of groups to return (max 500)
+        currency: Currency of spend aggregates
+        date_from: Start date (YYYY-MM-DD) scaling annual spend to the period
+        date_to: End date (YYYY-MM-DD)
+    """
+    query = {"group_by": group_by, "aggregates": aggregates, "filters": filters, "order_by": order_by, "limit": limit}
+    result = _run_brand_query(query, currency, date_from, date_to)
+    return f"Brand Query Results:\n{json.dumps(result, indent=2)}"
+
+@mcp.tool()
+def query_brands_sql(sql: str, params: Optional[List] = None, max_rows: int = DEFAULT_MAX_ROWS) -> str:
+    """Run a read-only SQL SELECT over the brand store and ad archive (requires BRAND_SQL_ENABLED).
+    
+    Tables: brands(industry, brand_name, belgium_spend, france_spend, total_spend, market_share_be,
+    market_share_fr, platforms, data), brand_platforms(industry, brand_name, platform) and
+    ads(id, platform, industry, cache_key, advertiser_name, title, body, first_shown, last_shown, data).
+    
+    Args:
+        sql: A single SELECT statement, with ? placeholders for params
+        params: Positional statement parameters
+        max_rows: Maximum rows to return (max 10000)
+    """
+    result = _run_brand_sql(sql, params, max_rows)
+    return f"SQL Query Results:\n{json.dumps(result, indent=2)}"
+
 def _generate_demo_google_ads_data(industry: str, limit: int) -> List[Dict]:
     """Generate demo Google Ads data for testing purposes."""
-    demo_ads = []
+    return list(_iter_demo_google_ads_data(industry, min(limit, 20)))
+
+def _iter_demo_google_ads_data(industry: str, limit: int) -> Iterator[Dict]:
+    """Yield demo Google Ads one at a time so large exports never build a list."""
     keywords = INDUSTRY_KEYWORDS[industry.lower()]
     
-    for i in range(min(limit, 20)):
+    for i in range(limit):
         ad = {
             "id": f"google_ad_{industry}_{i+1}",
             "advertiser_name": f"Google {industry.title()} Advertiser {i+1}",
@@ -808,53 +881,15 @@ def _generate_demo_google_ads_data(industry: str, limit: int) -> List[Dict]:
             "political_ad": False,
             "platform": "Google Ads"
         }
-        demo_ads.append(ad)
-    
-    return demo_ads
+        yield ad
 
 def _fetch_google_ads(industry: str, limit: int, api_key: str) -> List[Dict]:
-    """Fetch real Google Ads from Transparency Center API (placeholder implementation)."""
-    # This is a placeholder for actual Google Ads Transparency Center API
-    # Real implementation would use Google's BigQuery API or third-party services like SerpApi
-    
-    # Example SerpApi integration:
-    # base_url = "https://serpapi.com/search"
-    # params = {
-    #     "engine": "google_ads_transparency_center",
-    #     "api_key": api_key,
-    #     "advertiser": industry_specific_advertisers,
-    #     "format": "json"
-    # }
-    
-    try:
-        # Placeholder for actual API implementation
-        # response = requests.get(base_url, params=params, timeout=30)
-        # response.raise_for_status()
-        # return response.json().get("ads", [])
-        
-        # Return demo data for now
-        return _generate_demo_google_ads_data(industry, limit)
-    except Exception as e:
-        raise Exception(f"Google Ads API request failed: {str(e)}")
-
-def _filter_brands_by_country(brands_dict: Dict, country_filter: str) -> Dict:
-    """Filter brands by country."""
-    if country_filter == "all":
-        return brands_dict
-    
-    filtered_brands = {}
-    for brand_name, brand_data in brands_dict.items():
-        # Handle multi-country brands like "Netherlands/UK"
-        brand_country = brand_data["country"].lower()
-        filter_country = country_filter.lower()
-        
-        if filter_country in brand_country or brand_country in filter_country:
-            filtered_brands[brand_name] = brand_data
-        # Handle exact matches and partial matches
-        elif any(filter_country == c.strip().lower() for c in brand_country.split('/')):
-            filtered_brands[brand_name] = brand_data
-    
-    return filtered_brands
+    """Fetch Google Ads from the Transparency Center provider."""
+    return list(_iter_google_ads(industry, limit, api_key))
+
+def _iter_google_ads(industry: str, limit: int, api_key: str) -> Iterator[Dict]:
+    """Yield normalized Google Ads from the Transparency Center provider, one page at a time."""
+    return get_provider("google").iter_ads(industry.lower(), INDUSTRY_KEYWORDS[industry.lower()], limit, api_key)
 
 def _convert_currency(amount_eur: float, target_currency: str) -> float:
     """Convert EUR amount to target currency."""
@@ -905,6 +940,33 @@ def _calculate_date_multiplier(date_from: str, date_to: str) -> float:
     except (ValueError, TypeError):
         return 1.0  # Return full year if date parsing fails
 
+# Brand name indicators for each brand trait
+BRAND_TRAIT_INDICATORS = {
+    # B2C brands tend to favor Meta more than B2B
+    "b2c": ["coca-cola", "nike", "adidas", "zara", "h&m", "mcdonald", "pizza", "burger"],
+    # Local/regional brands tend to use more Google (local search)
+    "local": ["belgium", "kroymans", "d'ieteren", "jbc", "delhaize", "colruyt"],
+    # Luxury brands tend to favor Meta (visual appeal)
+    "luxury": ["mercedes", "bmw", "audi", "chanel", "lvmh", "hermès", "gucci", "prada"],
+    # E-commerce/retail brands favor Google (shopping ads)
+    "ecommerce": ["amazon", "booking", "expedia", "zalando", "bol.com"]
+}
+
+# Percentage points each trait moves from Google to Meta
+BRAND_TRAIT_META_SHIFT = {"b2c": 10, "local": -15, "luxury": 15, "ecommerce": -20}
+
+# Bounds of a brand's Meta share; every brand keeps some spend on each platform
+MIN_META_PERCENTAGE = 10
+MAX_META_PERCENTAGE = 90
+
+def _brand_traits(brand_name: str) -> List[str]:
+    """Get the traits a brand's name indicates, in BRAND_TRAIT_INDICATORS order."""
+    name = brand_name.lower()
+    return [
+        trait for trait, indicators in BRAND_TRAIT_INDICATORS.items()
+        if any(indicator in name for indicator in indicators)
+    ]
+
 def _calculate_platform_split(brand_name: str, industry: str, total_spend: float) -> Dict[str, float]:
     """Calculate realistic Meta vs Google ad spend split based on industry and brand characteristics.
     
@@ -937,32 +999,13 @@ def _calculate_platform_split(brand_name: str, industry: str, total_spend: float
     meta_percentage = base_split["meta"]
     google_percentage = base_split["google"]
     
-    # B2C brands tend to favor Meta more than B2B
-    b2c_indicators = ["coca-cola", "nike", "adidas", "zara", "h&m", "mcdonald", "pizza", "burger"]
-    if any(indicator in brand_name.lower() for indicator in b2c_indicators):
-        meta_percentage += 10
-        google_percentage -= 10
-    
-    # Local/regional brands tend to use more Google (local search)
-    local_indicators = ["belgium", "kroymans", "d'ieteren", "jbc", "delhaize", "colruyt"]
-    if any(indicator in brand_name.lower() for indicator in local_indicators):
-        google_percentage += 15
-        meta_percentage -= 15
-    
-    # Luxury brands tend to favor Meta (visual appeal)
-    luxury_indicators = ["mercedes", "bmw", "audi", "chanel", "lvmh", "hermès", "gucci", "prada"]
-    if any(indicator in brand_name.lower() for indicator in luxury_indicators):
-        meta_percentage += 15
-        google_percentage -= 15
-    
-    # E-commerce/retail brands favor Google (shopping ads)
-    ecommerce_indicators = ["amazon", "booking", "expedia", "zalando", "bol.com"]
-    if any(indicator in brand_name.lower() for indicator in ecommerce_indicators):
-        google_percentage += 20
-        meta_percentage -= 20
+    # Adjust Meta's share for each brand trait (B2C, local, luxury, e-commerce)
+    for trait in _brand_traits(brand_name):
+        meta_percentage += BRAND_TRAIT_META_SHIFT[trait]
+        google_percentage -= BRAND_TRAIT_META_SHIFT[trait]
     
     # Ensure percentages are valid
-    meta_percentage = max(10, min(90, meta_percentage))
+    meta_percentage = max(MIN_META_PERCENTAGE, min(MAX_META_PERCENTAGE, meta_percentage))
     google_percentage = 100 - meta_percentage
     
     # Calculate spend amounts
@@ -976,144 +1019,991 @@ def _calculate_platform_split(brand_name: str, industry: str, total_spend: float
         "google_spend": google_spend
     }
 
-def _generate_sector_overview(industry: str, currency: str, country_filter: str = "all", date_from: str = None, date_to: str = None) -> Dict:
-    """Generate comprehensive sector overview with European brands."""
-    industry_data = BELGIUM_FRANCE_BRANDS_DATABASE.get(industry.lower(), {})
+def _brand_sort_value(brand_data: Dict, sort_by: str, country_filter: str = "all") -> float:
+    """Get the raw EUR-based value a brand is ranked on.
     
-    sector_overview = {
-        "industry": industry,
-        "currency": currency,
-        "total_categories": len(industry_data),
-        "categories": {},
-        "sector_totals": {
-            "total_ad_spend": 0,
-            "total_brands": 0,
-            "total_market_share": 0
+    Currency conversion and date filtering scale every brand by the same factor,
+    so a ranking built on raw database values holds for any currency or period.
+    """
+    country = COUNTRY_FIELDS.get(country_filter.lower())
+    if sort_by == "total_spend" and country:
+        return brand_data[country["spend"]]
+    return brand_data[SORTABLE_BRAND_FIELDS[sort_by]]
+
+def _sector_aggregates(snapshot: BrandSnapshot, industry: str) -> Dict:
+    """Summarize an industry's spend totals for live sector update events."""
+    industry_data = snapshot.brands.get(industry.lower(), {})
+    ranked = _get_rank_index(snapshot, industry, "all", "total_spend")
+    return {
+        "industry": industry.lower(),
+        "total_brands": len(industry_data),
+        "total_spend_eur": sum(brand["total_spend"] for brand in industry_data.values()),
+        "belgium_spend_eur": sum(brand["belgium_ad_spend_eur"] for brand in industry_data.values()),
+        "france_spend_eur": sum(brand["france_ad_spend_eur"] for brand in industry_data.values()),
+        "leader": ranked[0] if ranked else None,
+        "market_concentration": {
+            scope: market.metrics() for (scope, tag), market in _get_market_slices(snapshot, industry).items() if tag is None
         },
-        "top_spenders": [],
-        "country_breakdown": {},
-        "generated_at": datetime.now().isoformat()
+        "data_version": snapshot.version
     }
+
+def _publish_brand_snapshot(snapshot: BrandSnapshot, industries: List[str]) -> int:
+    """Swap in a new brand snapshot and publish the affected sector aggregates.
     
-    all_brands = []
+    Every change to the brand store goes through here, under brand_store_lock.
+    """
+    global current_snapshot
+    current_snapshot = snapshot
+    for industry in sorted(set(i.lower() for i in industries)):
+        event_broker.publish("sector", _sector_aggregates(snapshot, industry))
+    return snapshot.version
+
+def _validate_brand_row(brand_data: Dict) -> Optional[str]:
+    """Check a brand row carries the numeric fields the views read."""
+    for field in ["belgium_ad_spend_eur", "france_ad_spend_eur", "market_share_be", "market_share_fr"]:
+        value = brand_data.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            return f"Field '{field}' must be a non-negative number"
+    platforms = brand_data.get("platforms", [])
+    if not isinstance(platforms, list):
+        return "Field 'platforms' must be a list"
+    return None
+
+def _apply_brand_mutations(mutations: List[Dict]) -> Dict:
+    """Apply upserts and deletes to the brand store as one new data version.
     
-    for brand_name, brand_data in industry_data.items():
-        # Apply country filter and calculate date multiplier
-        belgium_spend = brand_data["belgium_ad_spend_eur"]
-        france_spend = brand_data["france_ad_spend_eur"]
-        total_spend = brand_data["total_spend"]
-        
-        if country_filter.lower() == "belgium" and belgium_spend == 0:
-            continue
-        elif country_filter.lower() == "france" and france_spend == 0:
-            continue
-        
-        # Apply date filtering
-        date_multiplier = _calculate_date_multiplier(date_from, date_to)
-        belgium_spend *= date_multiplier
-        france_spend *= date_multiplier
-        total_spend *= date_multiplier
-        
-        # Convert currency
-        belgium_spend_converted = _convert_currency(belgium_spend, currency)
-        france_spend_converted = _convert_currency(france_spend, currency)
-        total_spend_converted = _convert_currency(total_spend, currency)
+    Args:
+        mutations: Items of {"op": "upsert"|"delete", "industry", "brand_name", "data"}
+    """
+    global brand_changelog_floor
+    
+    for index, mutation in enumerate(mutations):
+        op = mutation.get("op", "upsert")
+        industry = str(mutation.get("industry", "")).lower()
+        brand_name = mutation.get("brand_name")
+        if industry not in current_snapshot.brands:
+            return {"error": f"Mutation {index}: unknown industry '{industry}'"}
+        if not brand_name:
+            return {"error": f"Mutation {index}: brand_name is required"}
+        if op == "upsert":
+            error = _validate_brand_row(mutation.get("data") or {})
+            if error:
+                return {"error": f"Mutation {index}: {error}"}
+        elif op != "delete":
+            return {"error": f"Mutation {index}: op must be 'upsert' or 'delete'"}
+    
+    with brand_store_lock:
+        base = current_snapshot
+        brands = base.brands.sources()
+        copied = set()
+        changed = []
+        for mutation in mutations:
+            industry = mutation["industry"].lower()
+            brand_name = mutation["brand_name"]
+            # Copy an industry only the first time it is touched; the rest stay shared
+            if industry not in copied:
+                brands[industry] = dict(base.brands[industry])
+                copied.add(industry)
+            industry_data = brands[industry]
+            if mutation.get("op", "upsert") == "delete":
+                if industry_data.pop(brand_name, None) is None:
+                    continue
+                op = "delete"
+            else:
+                row = dict(mutation["data"])
+                row["total_spend"] = row["belgium_ad_spend_eur"] + row["france_ad_spend_eur"]
+                row.setdefault("platforms", ["Meta", "Google"])
+                op = "update" if brand_name in industry_data else "insert"
+                industry_data[brand_name] = row
+            changed.append((industry, brand_name, op))
         
-        # Determine display spend based on country filter
-        if country_filter.lower() == "belgium":
-            display_spend = belgium_spend_converted
-            display_spend_formatted = _format_currency(belgium_spend_converted, currency)
-        elif country_filter.lower() == "france":
-            display_spend = france_spend_converted
-            display_spend_formatted = _format_currency(france_spend_converted, currency)
-        else:
-            display_spend = total_spend_converted
-            display_spend_formatted = _format_currency(total_spend_converted, currency)
+        if not changed:
+            return {"version": base.version, "changed": 0}
         
-        brand_info = {
-            "name": brand_name,
-            "belgium_spend": belgium_spend_converted,
-            "belgium_spend_formatted": _format_currency(belgium_spend_converted, currency),
-            "france_spend": france_spend_converted,
-            "france_spend_formatted": _format_currency(france_spend_converted, currency),
-            "total_spend": display_spend,
-            "total_spend_formatted": display_spend_formatted,
-            "market_share_belgium": brand_data["market_share_be"],
-            "market_share_france": brand_data["market_share_fr"],
-            "platforms": brand_data["platforms"]
+        version = base.version + 1
+        for industry, brand_name, op in changed:
+            if len(brand_changelog) == brand_changelog.maxlen:
+                brand_changelog_floor = brand_changelog[0]["version"]
+            brand_changelog.append({"version": version, "industry": industry, "brand_name": brand_name, "op": op})
+        snapshot = BrandSnapshot(version, brands, base.dataset_version, base.dataset_mtime)
+        _carry_market_slices(base, snapshot, changed)
+        _publish_brand_snapshot(snapshot, [industry for industry, _, _ in changed])
+    
+    observations = []
+    for industry, brand_name, _ in changed:
+        observations.extend(_brand_spend_observations(industry, brand_name, brands[industry].get(brand_name)))
+    _publish_anomalies(observations)
+    return {"version": version, "changed": len(changed)}
+
+def _get_brand_changes(since: int, industry: Optional[str] = None) -> Dict:
+    """Get brand rows changed after a data version, with the aggregates they affect.
+    
+    Args:
+        since: Data version the caller already holds
+        industry: Optional industry to restrict changes to
+    """
+    snapshot = current_snapshot
+    if since > snapshot.version:
+        return {"error": f"Version {since} is ahead of current version {snapshot.version}"}
+    if since < brand_changelog_floor:
+        return {
+            "error": f"Changes before version {brand_changelog_floor} are no longer retained; refetch the full data",
+            "full_resync": True,
+            "current_version": snapshot.version
         }
-        
-        all_brands.append(brand_info)
-        
-        # Country breakdown
-        if belgium_spend > 0:
-            if "Belgium" not in sector_overview["country_breakdown"]:
-                sector_overview["country_breakdown"]["Belgium"] = {
-                    "brands": 0,
-                    "total_spend": 0,
-                    "market_share": 0
-                }
-            sector_overview["country_breakdown"]["Belgium"]["brands"] += 1
-            sector_overview["country_breakdown"]["Belgium"]["total_spend"] += belgium_spend_converted
-            sector_overview["country_breakdown"]["Belgium"]["market_share"] += brand_data["market_share_be"]
-        
-        if france_spend > 0:
-            if "France" not in sector_overview["country_breakdown"]:
-                sector_overview["country_breakdown"]["France"] = {
-                    "brands": 0,
-                    "total_spend": 0,
-                    "market_share": 0
-                }
-            sector_overview["country_breakdown"]["France"]["brands"] += 1
-            sector_overview["country_breakdown"]["France"]["total_spend"] += france_spend_converted
-            sector_overview["country_breakdown"]["France"]["market_share"] += brand_data["market_share_fr"]
     
-    # Update totals
-    sector_overview["sector_totals"]["total_ad_spend"] = sum(brand["total_spend"] for brand in all_brands)
-    sector_overview["sector_totals"]["total_brands"] = len(all_brands)
+    # Keep only the latest change per row, up to the snapshot being served
+    latest = {}
+    for entry in list(brand_changelog):
+        if since < entry["version"] <= snapshot.version and (industry is None or entry["industry"] == industry.lower()):
+            latest[(entry["industry"], entry["brand_name"])] = entry
+    
+    changes = []
+    for (row_industry, brand_name), entry in latest.items():
+        row = snapshot.brands.get(row_industry, {}).get(brand_name)
+        changes.append({
+            "industry": row_industry,
+            "brand_name": brand_name,
+            "version": entry["version"],
+            "op": "delete" if row is None else entry["op"],
+            "data": None if row is None else dict(row)
+        })
     
-    # Format country breakdown
-    for country_data in sector_overview["country_breakdown"].values():
-        country_data["total_spend_formatted"] = _format_currency(country_data["total_spend"], currency)
+    return {
+        "since": since,
+        "current_version": snapshot.version,
+        "full_resync": False,
+        "changes": changes,
+        "aggregates": {name: _sector_aggregates(snapshot, name) for name in sorted({c["industry"] for c in changes})},
+        "generated_at": datetime.now().isoformat()
+    }
+
+def _reload_brand_dataset(force: bool = False) -> Dict:
+    """Swap in the brand dataset file if it holds a new version, without a restart.
     
-    # Top spenders across all categories
-    sector_overview["top_spenders"] = sorted(all_brands, key=lambda x: x["total_spend"], reverse=True)[:10]
+    In-memory mutations made since the last load are replaced by the file contents,
+    and delta-sync clients must resync from the new data version.
     
-    # Format sector totals
-    sector_overview["sector_totals"]["total_ad_spend_formatted"] = _format_currency(
-        sector_overview["sector_totals"]["total_ad_spend"], currency
-    )
+    Args:
+        force: Reload even if the file's dataset version is unchanged
+    """
+    global brand_changelog_floor
+    
+    with brand_store_lock:
+        base = current_snapshot
+        try:
+            snapshot = _open_brand_snapshot(base.version + 1)
+        except (OSError, ValueError) as e:
+            return {"error": f"Could not load brand dataset: {e}"}
+        
+        if snapshot.dataset_version == base.dataset_version and not force:
+            return {"reloaded": False, "dataset_version": base.dataset_version, "data_version": base.version}
+        
+        brand_changelog.clear()
+        brand_changelog_floor = snapshot.version
+        _publish_brand_snapshot(snapshot, [])
+    
+    event_broker.publish("cache_refresh", {
+        "cache": "brands_dataset",
+        "dataset_version": snapshot.dataset_version,
+        "data_version": snapshot.version
+    })
+    logger.info(f"Loaded brand dataset version {snapshot.dataset_version} as data version {snapshot.version}")
+    _publish_anomalies(_changed_spend_observations(base, snapshot))
+    return {"reloaded": True, "dataset_version": snapshot.dataset_version, "data_version": snapshot.version}
+
+def _changed_spend_observations(base: BrandSnapshot, snapshot: BrandSnapshot) -> List[tuple]:
+    """Spend observations for brand rows that differ between two snapshots.
     
-    return sector_overview
+    Only industries the base snapshot had already decoded are compared, so a
+    reload never decodes industries nobody has read; unchanged rows are not
+    observed again.
+    """
+    observations = []
+    for industry in base.brands.loaded():
+        if industry not in snapshot.brands:
+            continue
+        old_data, new_data = base.brands[industry], snapshot.brands[industry]
+        for brand_name in old_data.keys() | new_data.keys():
+            new_row = new_data.get(brand_name)
+            if old_data.get(brand_name) != new_row:
+                observations.extend(_brand_spend_observations(industry, brand_name, new_row))
+    return observations
 
-def _get_brand_granular_details(brand_name: str, industry: str, currency: str, country_filter: str = "all", date_from: str = None, date_to: str = None) -> Dict:
-    """Get detailed granular information about a specific brand."""
-    industry_data = BELGIUM_FRANCE_BRANDS_DATABASE.get(industry.lower(), {})
+def _watch_brand_dataset(interval: float) -> None:
+    """Poll the dataset file and reload it whenever it is replaced."""
+    # Each modification is checked once, even if it holds the version already loaded
+    seen_mtime = current_snapshot.dataset_mtime
+    while True:
+        time.sleep(interval)
+        try:
+            mtime = os.stat(BRANDS_DATASET_PATH).st_mtime
+        except OSError:
+            continue
+        if mtime != seen_mtime:
+            seen_mtime = mtime
+            _reload_brand_dataset()
+
+def start_brand_dataset_watcher() -> Optional[threading.Thread]:
+    """Start the dataset file watcher if BRANDS_DATASET_WATCH_SECONDS is set."""
+    if BRANDS_DATASET_WATCH_SECONDS <= 0:
+        return None
+    watcher = threading.Thread(target=_watch_brand_dataset, args=(BRANDS_DATASET_WATCH_SECONDS,),
+                               name="brand-dataset-watcher", daemon=True)
+    watcher.start()
+    return watcher
+
+def _get_rank_index(snapshot: BrandSnapshot, industry: str, country_filter: str, sort_by: str) -> List[str]:
+    """Get brand names of an industry presorted by a numeric field (descending).
     
-    # Find the brand in flat structure (case-insensitive)
-    brand_key = None
-    for key in industry_data.keys():
-        if key.lower() == brand_name.lower():
-            brand_key = key
-            break
+    Indexes are built once per snapshot and shared by every page request.
+    """
+    def build():
+        industry_data = snapshot.brands.get(industry.lower(), {})
+        country = COUNTRY_FIELDS.get(country_filter.lower())
+        entries = [
+            (-_brand_sort_value(brand_data, sort_by, country_filter), brand_name)
+            for brand_name, brand_data in industry_data.items()
+            if country is None or brand_data[country["spend"]] > 0
+        ]
+        entries.sort()
+        return [brand_name for _, brand_name in entries]
     
-    if brand_key is None:
-        return {
-            "error": f"Brand '{brand_name}' not found in {industry} industry",
-            "available_brands": list(industry_data.keys())
-        }
+    return snapshot.derive(("rank_index", industry.lower(), country_filter.lower(), sort_by), build)
+
+def _get_rank_positions(snapshot: BrandSnapshot, industry: str, country_filter: str, sort_by: str) -> Dict[str, int]:
+    """Map brand names to their 1-based rank, derived from the presorted rank index."""
+    def build():
+        ranked = _get_rank_index(snapshot, industry, country_filter, sort_by)
+        return {brand_name: rank for rank, brand_name in enumerate(ranked, 1)}
     
-    brand_info = industry_data[brand_key]
-    # Use the actual brand name from database for consistency
-    brand_name = brand_key
+    return snapshot.derive(("rank_positions", industry.lower(), country_filter.lower(), sort_by), build)
+
+def _normalize_subcategory(subcategory: str) -> str:
+    """Normalize a subcategory tag so "Mobile_Gaming" and "mobile gaming" match."""
+    return " ".join(subcategory.lower().replace("_", " ").replace("-", " ").split())
+
+def _brand_country_value(brand_data: Dict, country_filter: str) -> tuple:
+    """Get a brand's spend and market share in one country, or overall for "all".
     
-    # Check country filter and apply date filtering
-    belgium_spend = brand_info["belgium_ad_spend_eur"]
-    france_spend = brand_info["france_ad_spend_eur"]
-    total_spend = brand_info["total_spend"]
+    The overall market share is the spend-weighted average of the country shares.
+    """
+    country = COUNTRY_FIELDS.get(country_filter)
+    if country:
+        return brand_data[country["spend"]], brand_data[country["market_share"]]
+    total = brand_data["total_spend"]
+    if not total:
+        return 0, 0
+    weighted = sum(brand_data[fields["spend"]] * brand_data[fields["market_share"]] for fields in COUNTRY_FIELDS.values())
+    return total, weighted / total
+
+def _brand_market_slices(brand_data: Dict) -> Iterator[tuple]:
+    """Yield ((country scope, subcategory or None), spend) for every market slice a brand row counts in."""
+    tags = [None] + [_normalize_subcategory(tag) for tag in brand_data.get("subcategories", [])]
+    for scope in CONCENTRATION_SCOPES:
+        spend = _brand_country_value(brand_data, scope)[0]
+        for tag in tags:
+            yield (scope, tag), spend
+
+def _get_market_slices(snapshot: BrandSnapshot, industry: str) -> Dict[tuple, ConcentrationSlice]:
+    """Get an industry's market slices keyed by (country scope, subcategory or None).
     
-    if country_filter.lower() == "belgium" and belgium_spend == 0:
-        return {
+    Each slice holds its members ranked by spend with running totals for share
+    and HHI. A subcategory slice doubles as the tag's posting list. Built once
+    for the first snapshot that needs it, then carried to later versions by
+    _carry_market_slices.
+    """
+    def build():
+        values: Dict[tuple, Dict[str, float]] = {}
+        for brand_name, brand_data in snapshot.brands.get(industry.lower(), {}).items():
+            for key, spend in _brand_market_slices(brand_data):
+                if spend > 0:
+                    values.setdefault(key, {})[brand_name] = spend
+        return {key: ConcentrationSlice.from_values(members) for key, members in values.items()}
+    
+    return snapshot.derive(("market_slices", industry.lower()), build)
+
+def _carry_market_slices(base: BrandSnapshot, snapshot: BrandSnapshot, changed: List[tuple]) -> None:
+    """Carry the base snapshot's built market slices to the next one, applying only the changed rows.
+    
+    Touched slices are copied before updating so the base snapshot stays
+    consistent for readers still holding it; every other slice is shared.
+    """
+    by_industry: Dict[str, set] = {}
+    for industry, brand_name, _ in changed:
+        by_industry.setdefault(industry, set()).add(brand_name)
+    
+    for industry, brand_names in by_industry.items():
+        base_slices = base.cached(("market_slices", industry))
+        if base_slices is None:
+            continue
+        slices = dict(base_slices)
+        copied = set()
+        for brand_name in brand_names:
+            updates = {}
+            old_row = base.brands[industry].get(brand_name)
+            new_row = snapshot.brands[industry].get(brand_name)
+            if old_row is not None:
+                updates.update((key, 0) for key, _ in _brand_market_slices(old_row))
+            if new_row is not None:
+                updates.update(_brand_market_slices(new_row))
+            for key, spend in updates.items():
+                if key not in copied:
+                    slices[key] = slices[key].copy() if key in slices else ConcentrationSlice()
+                    copied.add(key)
+                slices[key].update(brand_name, spend)
+        for key in copied:
+            if not slices[key]:
+                del slices[key]
+        snapshot.derive(("market_slices", industry), lambda slices=slices: slices)
+
+def _encode_cursor(scope: str, sort_by: str, offset: int, version: int) -> str:
+    """Encode an opaque pagination cursor bound to a query and a data version."""
+    payload = json.dumps({"v": version, "q": scope, "s": sort_by, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def _resolve_page(scope: str, top_n: int, offset: int, cursor: Optional[str], sort_by: str, sortable_fields, version: int) -> Dict:
+    """Validate paging parameters, resolving a cursor into sort field and offset.
+    
+    Returns:
+        Dict with top_n, offset and sort_by, or a dict with an "error" key
+    """
+    if cursor:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            cursor_version, cursor_scope = payload["v"], payload["q"]
+            sort_by, offset = payload["s"], payload["o"]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return {"error": "Invalid pagination cursor"}
+        if cursor_scope != scope:
+            return {"error": "Pagination cursor was issued for a different query"}
+        if cursor_version != version:
+            return {
+                "error": "Pagination cursor expired because the brand data changed, restart from the first page",
+                "data_version": version
+            }
+    
+    if sort_by not in sortable_fields:
+        return {
+            "error": f"Cannot sort by '{sort_by}'",
+            "available_sort_fields": list(sortable_fields)
+        }
+    
+    try:
+        top_n = int(top_n)
+        offset = int(offset)
+    except (ValueError, TypeError):
+        return {"error": "top_n and offset must be integers"}
+    
+    return {
+        "top_n": max(1, min(MAX_PAGE_SIZE, top_n)),
+        "offset": max(0, offset),
+        "sort_by": sort_by
+    }
+
+def _pagination_info(scope: str, page: Dict, total: int, version: int) -> Dict:
+    """Describe the returned page, with a cursor for the next one if any rows remain."""
+    next_offset = page["offset"] + page["top_n"]
+    return {
+        "sort_by": page["sort_by"],
+        "offset": page["offset"],
+        "top_n": page["top_n"],
+        "total": total,
+        "data_version": version,
+        "next_cursor": _encode_cursor(scope, page["sort_by"], next_offset, version) if next_offset < total else None
+    }
+
+def _select_top(rows: List[Dict], sort_by: str, offset: int, top_n: int) -> List[Dict]:
+    """Select one page of rows ordered by a numeric field using heap selection."""
+    return heapq.nlargest(offset + top_n, rows, key=lambda row: row[sort_by])[offset:]
+
+def _resolve_projection(fields, response_format: str, available_fields) -> Dict:
+    """Validate a fields projection and response format.
+    
+    Args:
+        fields: Comma-separated string or list of field names (empty means all fields)
+        response_format: raw (numbers only), display (formatted strings only) or both
+        available_fields: Field names that can be requested
+    
+    Returns:
+        Dict with "fields" (a set, or None for all fields) and "format", or a dict with an "error" key
+    """
+    if response_format not in RESPONSE_FORMATS:
+        return {
+            "error": f"Unknown format '{response_format}'",
+            "available_formats": list(RESPONSE_FORMATS)
+        }
+    
+    if not fields:
+        return {"fields": None, "format": response_format}
+    
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    requested = {field.strip() for field in fields if field.strip()}
+    unknown = requested - set(available_fields)
+    if unknown:
+        return {
+            "error": f"Unknown fields: {', '.join(sorted(unknown))}",
+            "available_fields": list(available_fields)
+        }
+    return {"fields": requested, "format": response_format}
+
+def _wants(projection: Dict, field: str) -> bool:
+    """Check whether a field was requested by a projection."""
+    return projection["fields"] is None or field in projection["fields"]
+
+def _add_amount(target: Dict, key: str, amount: float, currency: str, response_format: str) -> None:
+    """Add a currency amount as a raw number, a formatted string, or both."""
+    if response_format != "display":
+        target[key] = amount
+    if response_format != "raw":
+        target[f"{key}_formatted"] = _format_currency(amount, currency)
+
+def _build_sector_brand_row(brand_name: str, brand_data: Dict, currency: str, country_filter: str,
+                            date_multiplier: float, projection: Dict) -> Dict:
+    """Build a top spender row for the sector overview with only the requested fields."""
+    row = {"name": brand_name}
+    response_format = projection["format"]
+    
+    if _wants(projection, "belgium_spend"):
+        _add_amount(row, "belgium_spend", _convert_currency(brand_data["belgium_ad_spend_eur"] * date_multiplier, currency), currency, response_format)
+    if _wants(projection, "france_spend"):
+        _add_amount(row, "france_spend", _convert_currency(brand_data["france_ad_spend_eur"] * date_multiplier, currency), currency, response_format)
+    if _wants(projection, "total_spend"):
+        # Display spend follows the country filter
+        country = COUNTRY_FIELDS.get(country_filter.lower())
+        spend_field = country["spend"] if country else "total_spend"
+        _add_amount(row, "total_spend", _convert_currency(brand_data[spend_field] * date_multiplier, currency), currency, response_format)
+    if _wants(projection, "market_share_belgium"):
+        row["market_share_belgium"] = brand_data["market_share_be"]
+    if _wants(projection, "market_share_france"):
+        row["market_share_france"] = brand_data["market_share_fr"]
+    if _wants(projection, "platforms"):
+        row["platforms"] = brand_data["platforms"]
+    
+    return row
+
+def _iter_global_ranking(snapshot: BrandSnapshot, country_filter: str, sort_by: str) -> Iterator[tuple]:
+    """Lazily k-way merge every industry's presorted rank index into one descending ranking.
+    
+    Yields (sort value, industry, brand name). Each next item costs O(log I) for
+    I industries, so taking the first K never scans the industries' tails.
+    """
+    def ranked(industry: str) -> Iterator[tuple]:
+        industry_data = snapshot.brands[industry]
+        for brand_name in _get_rank_index(snapshot, industry, country_filter, sort_by):
+            yield _brand_sort_value(industry_data[brand_name], sort_by, country_filter), industry, brand_name
+    
+    return heapq.merge(*(ranked(industry) for industry in snapshot.brands), key=lambda entry: entry[0], reverse=True)
+
+def _generate_global_leaderboard(country_filter: str = "all", currency: str = "EUR", date_from: str = None, date_to: str = None,
+                                 top_n: int = 50, offset: int = 0, cursor: Optional[str] = None, sort_by: str = "total_spend",
+                                 fields=None, response_format: str = "both") -> Dict:
+    """Generate the cross-industry leaderboard of advertisers.
+    
+    Only the requested page is taken from the merged per-industry rank indexes.
+    """
+    country_filter = country_filter.lower()
+    if country_filter != "all" and country_filter not in COUNTRY_FIELDS:
+        return {
+            "error": f"Country '{country_filter}' not supported",
+            "available_countries": ["all"] + list(COUNTRY_FIELDS)
+        }
+    if currency not in CURRENCY_RATES:
+        return {
+            "error": f"Currency '{currency}' not supported",
+            "available_currencies": list(CURRENCY_RATES.keys())
+        }
+    
+    snapshot = current_snapshot
+    scope = f"leaderboard|{country_filter}"
+    page = _resolve_page(scope, top_n, offset, cursor, sort_by, SORTABLE_BRAND_FIELDS, snapshot.version)
+    if "error" in page:
+        return page
+    projection = _resolve_projection(fields, response_format, SECTOR_BRAND_FIELDS)
+    if "error" in projection:
+        return projection
+    
+    date_multiplier = _calculate_date_multiplier(date_from, date_to)
+    entries = islice(_iter_global_ranking(snapshot, country_filter, page["sort_by"]), page["offset"], page["offset"] + page["top_n"])
+    leaderboard = []
+    for rank, (_, industry, brand_name) in enumerate(entries, page["offset"] + 1):
+        row = _build_sector_brand_row(brand_name, snapshot.brands[industry][brand_name], currency, country_filter,
+                                      date_multiplier, projection)
+        leaderboard.append({"rank": rank, "industry": industry, **row})
+    
+    total = sum(len(_get_rank_index(snapshot, industry, country_filter, page["sort_by"])) for industry in snapshot.brands)
+    return {
+        "country_filter": country_filter,
+        "currency": currency,
+        "date_range": {"from": date_from, "to": date_to} if date_from and date_to else None,
+        "leaderboard": leaderboard,
+        "pagination": _pagination_info(scope, page, total, snapshot.version),
+        "generated_at": datetime.now().isoformat()
+    }
+
+def _generate_sector_overview(industry: str, currency: str, country_filter: str = "all", date_from: str = None, date_to: str = None,
+                              top_n: int = 10, offset: int = 0, cursor: Optional[str] = None, sort_by: str = "total_spend",
+                              fields=None, response_format: str = "both") -> Dict:
+    """Generate comprehensive sector overview with European brands.
+    
+    Sector totals cover every brand, but only the requested page of top spenders
+    is built, read from a presorted rank index instead of re-sorting the industry.
+    Top spender rows carry only the projected fields, in the requested format.
+    """
+    snapshot = current_snapshot
+    industry_data = snapshot.brands.get(industry.lower(), {})
+    
+    scope = f"sector|{industry.lower()}|{country_filter.lower()}"
+    page = _resolve_page(scope, top_n, offset, cursor, sort_by, SORTABLE_BRAND_FIELDS, snapshot.version)
+    if "error" in page:
+        return page
+    projection = _resolve_projection(fields, response_format, SECTOR_BRAND_FIELDS)
+    if "error" in projection:
+        return projection
+    
+    sector_overview = {
+        "industry": industry,
+        "currency": currency,
+        "total_categories": len(industry_data),
+        "categories": {},
+        "sector_totals": {
+            "total_ad_spend": 0,
+            "total_brands": 0,
+            "total_market_share": 0
+        },
+        "top_spenders": [],
+        "country_breakdown": {},
+        "generated_at": datetime.now().isoformat()
+    }
+    
+    date_multiplier = _calculate_date_multiplier(date_from, date_to)
+    total_ad_spend = 0
+    total_brands = 0
+    
+    for brand_name, brand_data in industry_data.items():
+        # Apply country filter and date multiplier
+        belgium_spend = brand_data["belgium_ad_spend_eur"]
+        france_spend = brand_data["france_ad_spend_eur"]
+        total_spend = brand_data["total_spend"]
+        
+        if country_filter.lower() == "belgium" and belgium_spend == 0:
+            continue
+        elif country_filter.lower() == "france" and france_spend == 0:
+            continue
+        
+        belgium_spend *= date_multiplier
+        france_spend *= date_multiplier
+        total_spend *= date_multiplier
+        
+        # Convert currency
+        belgium_spend_converted = _convert_currency(belgium_spend, currency)
+        france_spend_converted = _convert_currency(france_spend, currency)
+        
+        # Determine display spend based on country filter
+        if country_filter.lower() == "belgium":
+            total_ad_spend += belgium_spend_converted
+        elif country_filter.lower() == "france":
+            total_ad_spend += france_spend_converted
+        else:
+            total_ad_spend += _convert_currency(total_spend, currency)
+        total_brands += 1
+        
+        # Country breakdown
+        if belgium_spend > 0:
+            if "Belgium" not in sector_overview["country_breakdown"]:
+                sector_overview["country_breakdown"]["Belgium"] = {
+                    "brands": 0,
+                    "total_spend": 0,
+                    "market_share": 0
+                }
+            sector_overview["country_breakdown"]["Belgium"]["brands"] += 1
+            sector_overview["country_breakdown"]["Belgium"]["total_spend"] += belgium_spend_converted
+            sector_overview["country_breakdown"]["Belgium"]["market_share"] += brand_data["market_share_be"]
+        
+        if france_spend > 0:
+            if "France" not in sector_overview["country_breakdown"]:
+                sector_overview["country_breakdown"]["France"] = {
+                    "brands": 0,
+                    "total_spend": 0,
+                    "market_share": 0
+                }
+            sector_overview["country_breakdown"]["France"]["brands"] += 1
+            sector_overview["country_breakdown"]["France"]["total_spend"] += france_spend_converted
+            sector_overview["country_breakdown"]["France"]["market_share"] += brand_data["market_share_fr"]
+    
+    # Update totals
+    sector_overview["sector_totals"]["total_ad_spend"] = total_ad_spend
+    sector_overview["sector_totals"]["total_brands"] = total_brands
+    
+    # Format country breakdown
+    for country_data in sector_overview["country_breakdown"].values():
+        _add_amount(country_data, "total_spend", country_data.pop("total_spend"), currency, projection["format"])
+    
+    # Requested page of top spenders, read from the presorted rank index
+    ranked_brands = _get_rank_index(snapshot, industry, country_filter, page["sort_by"])
+    sector_overview["top_spenders"] = [
+        _build_sector_brand_row(brand_name, industry_data[brand_name], currency, country_filter, date_multiplier, projection)
+        for brand_name in ranked_brands[page["offset"]:page["offset"] + page["top_n"]]
+    ]
+    sector_overview["pagination"] = _pagination_info(scope, page, len(ranked_brands), snapshot.version)
+    
+    # Concentration is scale-free, so currency and date range leave it unchanged
+    country_scope = country_filter.lower() if country_filter.lower() in COUNTRY_FIELDS else "all"
+    market = _get_market_slices(snapshot, industry).get((country_scope, None)) or ConcentrationSlice()
+    sector_overview["market_concentration"] = market.metrics()
+    
+    # Format sector totals
+    _add_amount(sector_overview["sector_totals"], "total_ad_spend", sector_overview["sector_totals"].pop("total_ad_spend"),
+                currency, projection["format"])
+    
+    return sector_overview
+
+# Brand profile features compared by similar-brand search, each a 0-1 fraction
+SIMILARITY_FEATURES = ["belgium_share", "france_share", "meta_share", "google_share", "video_share", "display_share",
+                       "market_share_belgium", "market_share_france"]
+
+def _brand_profile(brand_name: str, industry: str, brand_data: Dict) -> Dict[str, float]:
+    """Describe a brand by its country split, platform split, video/display mix and market shares."""
+    total = brand_data["total_spend"]
+    split = _calculate_platform_split(brand_name, industry, 1.0)
+    ad_types = brand_data.get("ad_types", {})
+    return {
+        "belgium_share": brand_data["belgium_ad_spend_eur"] / total if total else 0.0,
+        "france_share": brand_data["france_ad_spend_eur"] / total if total else 0.0,
+        "meta_share": split["meta_percentage"] / 100,
+        "google_share": split["google_percentage"] / 100,
+        "video_share": ad_types.get("video", 60) / 100,
+        "display_share": ad_types.get("display", 40) / 100,
+        "market_share_belgium": brand_data["market_share_be"] / 100,
+        "market_share_france": brand_data["market_share_fr"] / 100
+    }
+
+def _get_similarity_index(snapshot: BrandSnapshot, industry: Optional[str] = None) -> SimilarityIndex:
+    """Get the snapshot's brand profile vectors for cosine similarity search, built once per snapshot.
+    
+    Args:
+        industry: Index only this industry's brands, decoding no other industry
+    """
+    def build():
+        keys = []
+        vectors = []
+        for industry in (industries or snapshot.brands):
+            for brand_name, brand_data in snapshot.brands[industry].items():
+                profile = _brand_profile(brand_name, industry, brand_data)
+                keys.append((industry, brand_name))
+                vectors.append([profile[feature] for feature in SIMILARITY_FEATURES])
+        return SimilarityIndex(keys, vectors)
+    
+    industries = [industry] if industry else None
+    return snapshot.derive(("similarity", industry), build)
+
+def _find_similar_brands(brand_name: str, industry: str, scope: str = "industry", top_n: int = 10) -> Dict:
+    """Find the brands whose spend profiles are closest to a brand's.
+    
+    Args:
+        brand_name: Brand to find neighbours for
+        industry: Industry of the brand
+        scope: Search within the brand's industry ("industry") or across all industries ("all")
+        top_n: Number of similar brands to return
+    """
+    started = time.perf_counter()
+    snapshot = current_snapshot
+    industry_data = snapshot.brands.get(industry.lower())
+    if industry_data is None:
+        return {
+            "error": f"Industry '{industry}' not found",
+            "available_industries": list(snapshot.brands.keys())
+        }
+    if scope not in ("industry", "all"):
+        return {"error": f"Unknown scope '{scope}'. Use 'industry' or 'all'"}
+    brand_key = next((name for name in industry_data if name.lower() == brand_name.lower()), None)
+    if brand_key is None:
+        return {
+            "error": f"Brand '{brand_name}' not found in {industry} industry",
+            "available_brands": list(industry_data.keys())
+        }
+    try:
+        top_n = max(1, min(MAX_PAGE_SIZE, int(top_n)))
+    except (TypeError, ValueError):
+        return {"error": "top_n must be an integer"}
+    
+    # Industry scope standardizes within the industry, matching brand details' closest competitors
+    index = _get_similarity_index(snapshot, industry.lower() if scope == "industry" else None)
+    neighbours = index.nearest((industry.lower(), brand_key), top_n)
+    similar_brands = []
+    for rank, ((neighbour_industry, neighbour_name), similarity) in enumerate(neighbours, 1):
+        neighbour_data = snapshot.brands[neighbour_industry][neighbour_name]
+        similar_brands.append({
+            "rank": rank,
+            "name": neighbour_name,
+            "industry": neighbour_industry,
+            "similarity": similarity,
+            "profile": {k: round(v, 4) for k, v in _brand_profile(neighbour_name, neighbour_industry, neighbour_data).items()}
+        })
+    
+    return {
+        "brand_name": brand_key,
+        "industry": industry.lower(),
+        "scope": scope,
+        "profile": {k: round(v, 4) for k, v in _brand_profile(brand_key, industry, industry_data[brand_key]).items()},
+        "similar_brands": similar_brands,
+        "data_version": snapshot.version,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "generated_at": datetime.now().isoformat()
+    }
+
+def _get_platform_columns(snapshot: BrandSnapshot, industry: str) -> Dict[str, List]:
+    """Get an industry's brands as Belgium spend, France spend and Meta percentage columns, built once per snapshot."""
+    def build():
+        industry_data = snapshot.brands.get(industry.lower(), {})
+        names = list(industry_data)
+        return {
+            "names": names,
+            "belgium": [industry_data[name]["belgium_ad_spend_eur"] for name in names],
+            "france": [industry_data[name]["france_ad_spend_eur"] for name in names],
+            "meta_percentage": [_calculate_platform_split(name, industry, 1.0)["meta_percentage"] for name in names]
+        }
+    
+    return snapshot.derive(("platform_columns", industry.lower()), build)
+
+def _resolve_scenarios(scenarios: Optional[List[Dict]], grid: Optional[Dict[str, List[float]]]) -> List[Dict]:
+    """Expand explicit scenarios plus the cartesian product of a grid into lever dicts.
+    
+    Raises:
+        ValueError: If a lever is unknown or not a number, or there are too many scenarios
+    """
+    if scenarios is not None and not isinstance(scenarios, list):
+        raise ValueError("scenarios must be a list of objects")
+    if grid is not None and not isinstance(grid, dict):
+        raise ValueError("grid must be an object of lever -> list of values")
+    if any(not isinstance(scenario, dict) for scenario in scenarios or []):
+        raise ValueError("Each scenario must be an object")
+    if any(not isinstance(values, list) for values in (grid or {}).values()):
+        raise ValueError("Each grid lever must map to a list of values")
+    # Count before expanding, so an oversized grid is rejected without being built
+    count = len(scenarios or []) + (math.prod(len(values) for values in grid.values()) if grid else 0)
+    if count > MAX_SCENARIOS:
+        raise ValueError(f"At most {MAX_SCENARIOS} scenarios can be simulated per request")
+    
+    resolved = []
+    for scenario in scenarios or []:
+        unknown = set(scenario) - set(SCENARIO_FIELDS) - {"name"}
+        if unknown:
+            raise ValueError(f"Unknown scenario fields: {', '.join(sorted(unknown))}. Available: {', '.join(SCENARIO_FIELDS)}")
+        resolved.append(dict(scenario))
+    if grid:
+        unknown = set(grid) - set(SCENARIO_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown grid fields: {', '.join(sorted(unknown))}. Available: {', '.join(SCENARIO_FIELDS)}")
+        levers = list(grid)
+        resolved.extend(dict(zip(levers, values)) for values in product(*(grid[lever] for lever in levers)))
+    if not resolved:
+        raise ValueError("Provide at least one scenario or a grid")
+    
+    for scenario in resolved:
+        for field in SCENARIO_FIELDS:
+            value = scenario.get(field, 0)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Scenario field '{field}' must be a number")
+            if field != "shift_google_to_meta_pct" and value < -100:
+                raise ValueError(f"Scenario field '{field}' cannot cut spend by more than 100%")
+            scenario[field] = value
+    return resolved
+
+def _simulate_budget_shift(industry: str, brand_name: Optional[str] = None, scenarios: Optional[List[Dict]] = None,
+                           grid: Optional[Dict[str, List[float]]] = None, currency: str = "EUR") -> Dict:
+    """Evaluate budget what-if scenarios for one brand or a whole industry.
+    
+    Each scenario moves percentage points of spend from Google to Meta (clamped
+    to the platform split bounds) and changes Belgian and French spend by a
+    percentage. Scenarios are evaluated as columns across the whole batch: for
+    a brand against its industry's totals, shares and spend rank; for an
+    industry against every brand in it and its rank among industries.
+    
+    Args:
+        industry: Industry to simulate
+        brand_name: Brand the levers apply to; omit to apply them to every brand in the industry
+        scenarios: Scenarios as {"name", "shift_google_to_meta_pct", "belgium_spend_change_pct", "france_spend_change_pct"}
+        grid: Lever -> list of values, expanded to every combination
+        currency: Currency of the reported amounts
+    """
+    started = time.perf_counter()
+    snapshot = current_snapshot
+    if industry.lower() not in snapshot.brands:
+        return {
+            "error": f"Industry '{industry}' not found",
+            "available_industries": list(snapshot.brands.keys())
+        }
+    if currency not in CURRENCY_RATES:
+        return {
+            "error": f"Currency '{currency}' not supported",
+            "available_currencies": list(CURRENCY_RATES.keys())
+        }
+    try:
+        resolved = _resolve_scenarios(scenarios, grid)
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    columns = _get_platform_columns(snapshot, industry)
+    rate = CURRENCY_RATES[currency]
+    shift = [scenario["shift_google_to_meta_pct"] for scenario in resolved]
+    belgium_factor = [1 + scenario["belgium_spend_change_pct"] / 100 for scenario in resolved]
+    france_factor = [1 + scenario["france_spend_change_pct"] / 100 for scenario in resolved]
+    
+    def clamp(percentage: float) -> float:
+        return max(MIN_META_PERCENTAGE, min(MAX_META_PERCENTAGE, percentage))
+    
+    industry_belgium = sum(columns["belgium"])
+    industry_france = sum(columns["france"])
+    industry_meta = sum(m / 100 * (b + f) for m, b, f in zip(columns["meta_percentage"], columns["belgium"], columns["france"]))
+    
+    if brand_name is not None:
+        brand_key = next((name for name in columns["names"] if name.lower() == brand_name.lower()), None)
+        if brand_key is None:
+            return {
+                "error": f"Brand '{brand_name}' not found in {industry} industry",
+                "available_brands": columns["names"]
+            }
+        position = columns["names"].index(brand_key)
+        brand_belgium = columns["belgium"][position]
+        brand_france = columns["france"][position]
+        brand_meta = columns["meta_percentage"][position]
+        
+        # Scenario columns for the brand, then the industry with only the brand's row replaced
+        new_belgium = [brand_belgium * factor for factor in belgium_factor]
+        new_france = [brand_france * factor for factor in france_factor]
+        new_total = list(map(operator.add, new_belgium, new_france))
+        new_meta_percentage = [clamp(brand_meta + s) for s in shift]
+        new_meta = [p / 100 * t for p, t in zip(new_meta_percentage, new_total)]
+        base_total = brand_belgium + brand_france
+        sector_belgium = [industry_belgium - brand_belgium + b for b in new_belgium]
+        sector_france = [industry_france - brand_france + f for f in new_france]
+        sector_meta = [industry_meta - brand_meta / 100 * base_total + m for m in new_meta]
+        
+        # Rank by total spend against every other brand's unchanged total
+        others = sorted(b + f for i, (b, f) in enumerate(zip(columns["belgium"], columns["france"])) if i != position)
+        def rank(total: float) -> int:
+            return 1 + len(others) - bisect_right(others, total)
+        base_rank = rank(base_total)
+        subject = {"brand_name": brand_key, "industry": industry.lower()}
+    else:
+        # Every brand scales; each keeps its own clamped Meta percentage
+        new_belgium = [industry_belgium * factor for factor in belgium_factor]
+        new_france = [industry_france * factor for factor in france_factor]
+        new_total = list(map(operator.add, new_belgium, new_france))
+        new_meta = [
+            sum(clamp(m + s) / 100 * (b * bf + f * ff)
+                for m, b, f in zip(columns["meta_percentage"], columns["belgium"], columns["france"]))
+            for s, bf, ff in zip(shift, belgium_factor, france_factor)
+        ]
+        new_meta_percentage = [m / t * 100 if t else 0 for m, t in zip(new_meta, new_total)]
+        sector_belgium, sector_france, sector_meta = new_belgium, new_france, new_meta
+        base_total = industry_belgium + industry_france
+        
+        # Rank by total spend against every other industry
+        others = sorted(
+            sum(brand["total_spend"] for brand in snapshot.brands[other].values())
+            for other in snapshot.brands if other != industry.lower()
+        )
+        def rank(total: float) -> int:
+            return 1 + len(others) - bisect_right(others, total)
+        base_rank = rank(base_total)
+        subject = {"industry": industry.lower()}
+    
+    def share(part: float, whole: float) -> float:
+        return round(part / whole * 100, 2) if whole else 0
+    
+    results = []
+    for i, scenario in enumerate(resolved):
+        sector_total = sector_belgium[i] + sector_france[i]
+        after_rank = rank(new_total[i])
+        results.append({
+            "scenario": scenario,
+            "spend": {
+                "total_spend": round(new_total[i] * rate, 2),
+                "belgium_spend": round(new_belgium[i] * rate, 2),
+                "france_spend": round(new_france[i] * rate, 2),
+                "meta_spend": round(new_meta[i] * rate, 2),
+                "google_spend": round((new_total[i] - new_meta[i]) * rate, 2),
+                "meta_percentage": round(new_meta_percentage[i], 2)
+            },
+            "sector": {
+                "total_spend": round(sector_total * rate, 2),
+                "meta_spend": round(sector_meta[i] * rate, 2),
+                "google_spend": round((sector_total - sector_meta[i]) * rate, 2),
+                "meta_percentage": share(sector_meta[i], sector_total)
+            },
+            "shares": {
+                "share_of_sector_spend": share(new_total[i], sector_total),
+                "share_of_belgium_spend": share(new_belgium[i], sector_belgium[i]),
+                "share_of_france_spend": share(new_france[i], sector_france[i]),
+                "share_of_meta_spend": share(new_meta[i], sector_meta[i]),
+                "share_of_google_spend": share(new_total[i] - new_meta[i], sector_total - sector_meta[i])
+            },
+            "rank": {"before": base_rank, "after": after_rank, "change": base_rank - after_rank}
+        })
+    
+    return {
+        **subject,
+        "currency": currency,
+        "baseline": {
+            "total_spend": round(base_total * rate, 2),
+            "sector_total_spend": round((industry_belgium + industry_france) * rate, 2),
+            "sector_meta_percentage": share(industry_meta, industry_belgium + industry_france),
+            "rank": base_rank
+        },
+        "scenarios": results,
+        "scenario_count": len(results),
+        "data_version": snapshot.version,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "generated_at": datetime.now().isoformat()
+    }
+
+def _brand_details_context(industry: str, currency: str, date_from: str = None, date_to: str = None) -> Dict:
+    """Evaluate the per-industry setup shared by every brand details lookup.
+    
+    Batch lookups compute this once and reuse it for every brand in the batch.
+    """
+    snapshot = current_snapshot
+    industry_data = snapshot.brands.get(industry.lower(), {})
+    ranked_brands = _get_rank_index(snapshot, industry, "all", "total_spend")
+    
+    return {
+        "industry_data": industry_data,
+        "brand_keys": {brand_name.lower(): brand_name for brand_name in industry_data},
+        "date_multiplier": _calculate_date_multiplier(date_from, date_to),
+        "currency_rate": CURRENCY_RATES.get(currency, 1.0),
+        "snapshot": snapshot,
+        "rank_positions": _get_rank_positions(snapshot, industry, "all", "total_spend"),
+        "industry_leader": ranked_brands[0] if ranked_brands else None,
+        "leader_spend": industry_data[ranked_brands[0]]["total_spend"] if ranked_brands else 0
+    }
+
+def _build_brand_details(brand_name: str, industry: str, currency: str, country_filter: str, projection: Dict, context: Dict) -> Dict:
+    """Build the details of one brand from a precomputed industry context."""
+    industry_data = context["industry_data"]
+    response_format = projection["format"]
+    
+    # Find the brand in flat structure (case-insensitive)
+    brand_key = context["brand_keys"].get(brand_name.lower())
+    
+    if brand_key is None:
+        return {
+            "error": f"Brand '{brand_name}' not found in {industry} industry",
+            "available_brands": list(industry_data.keys())
+        }
+    
+    brand_info = industry_data[brand_key]
+    # Use the actual brand name from database for consistency
+    brand_name = brand_key
+    
+    # Check country filter
+    belgium_spend = brand_info["belgium_ad_spend_eur"]
+    france_spend = brand_info["france_ad_spend_eur"]
+    
+    if country_filter.lower() == "belgium" and belgium_spend == 0:
+        return {
             "error": f"Brand '{brand_name}' has no advertising spend in Belgium",
             "available_brands": [brand for brand, data in industry_data.items() if data["belgium_ad_spend_eur"] > 0]
         }
@@ -1123,235 +2013,493 @@ def _get_brand_granular_details(brand_name: str, industry: str, currency: str, c
             "available_brands": [brand for brand, data in industry_data.items() if data["france_ad_spend_eur"] > 0]
         }
     
-    # Apply date filtering
-    date_multiplier = _calculate_date_multiplier(date_from, date_to)
-    belgium_spend *= date_multiplier
-    france_spend *= date_multiplier
-    total_spend *= date_multiplier
-    
-    # Convert currency
-    belgium_spend_converted = _convert_currency(belgium_spend, currency)
-    france_spend_converted = _convert_currency(france_spend, currency)
-    total_spend_converted = _convert_currency(total_spend, currency)
+    # Apply date filtering and currency conversion in one scale factor
+    scale = context["date_multiplier"] * context["currency_rate"]
+    belgium_spend_converted = belgium_spend * scale
+    france_spend_converted = france_spend * scale
+    total_spend_converted = brand_info["total_spend"] * scale
     
     # Determine display spend based on country filter
     if country_filter.lower() == "belgium":
         display_spend = belgium_spend_converted
-        display_spend_formatted = _format_currency(belgium_spend_converted, currency)
     elif country_filter.lower() == "france":
         display_spend = france_spend_converted  
-        display_spend_formatted = _format_currency(france_spend_converted, currency)
     else:
         display_spend = total_spend_converted
-        display_spend_formatted = _format_currency(total_spend_converted, currency)
     
     # Generate detailed analysis
     brand_details = {
         "brand_name": brand_name,
-        "industry": industry,
-        "market_presence": {
+        "industry": industry
+    }
+    
+    if _wants(projection, "market_presence"):
+        brand_details["market_presence"] = {
             "belgium": belgium_spend > 0,
             "france": france_spend > 0,
             "platforms": brand_info["platforms"]
-        },
-        "financial_data": {
-            "belgium_ad_spend": belgium_spend_converted,
-            "belgium_ad_spend_formatted": _format_currency(belgium_spend_converted, currency),
-            "france_ad_spend": france_spend_converted,
-            "france_ad_spend_formatted": _format_currency(france_spend_converted, currency),
-            "total_ad_spend": display_spend,
-            "total_ad_spend_formatted": display_spend_formatted,
-            "currency": currency,
-            "market_share_belgium": brand_info["market_share_be"],
-            "market_share_france": brand_info["market_share_fr"],
-            "estimated_monthly_spend_total": display_spend / 12,
-            "estimated_monthly_spend_total_formatted": _format_currency(display_spend / 12, currency),
-            "estimated_daily_spend_total": display_spend / 365,
-            "estimated_daily_spend_total_formatted": _format_currency(display_spend / 365, currency)
-        },
-        "platform_breakdown": {
-            "meta_estimated": _calculate_platform_split(brand_name, industry, display_spend)["meta_spend"],
-            "google_estimated": _calculate_platform_split(brand_name, industry, display_spend)["google_spend"],
-            "meta_estimated_formatted": _format_currency(_calculate_platform_split(brand_name, industry, display_spend)["meta_spend"], currency),
-            "google_estimated_formatted": _format_currency(_calculate_platform_split(brand_name, industry, display_spend)["google_spend"], currency),
-            "meta_percentage": _calculate_platform_split(brand_name, industry, display_spend)["meta_percentage"],
-            "google_percentage": _calculate_platform_split(brand_name, industry, display_spend)["google_percentage"]
-        },
-        "ad_type_breakdown": {
-            "video_percentage": brand_info.get("ad_types", {}).get("video", 60),
-            "display_percentage": brand_info.get("ad_types", {}).get("display", 40),
-            "video_spend": display_spend * (brand_info.get("ad_types", {}).get("video", 60) / 100),
-            "display_spend": display_spend * (brand_info.get("ad_types", {}).get("display", 40) / 100),
-            "video_spend_formatted": _format_currency(display_spend * (brand_info.get("ad_types", {}).get("video", 60) / 100), currency),
-            "display_spend_formatted": _format_currency(display_spend * (brand_info.get("ad_types", {}).get("display", 40) / 100), currency)
-        },
+        }
+    
+    if _wants(projection, "financial_data"):
+        financial_data = {}
+        _add_amount(financial_data, "belgium_ad_spend", belgium_spend_converted, currency, response_format)
+        _add_amount(financial_data, "france_ad_spend", france_spend_converted, currency, response_format)
+        _add_amount(financial_data, "total_ad_spend", display_spend, currency, response_format)
+        financial_data["currency"] = currency
+        financial_data["market_share_belgium"] = brand_info["market_share_be"]
+        financial_data["market_share_france"] = brand_info["market_share_fr"]
+        _add_amount(financial_data, "estimated_monthly_spend_total", display_spend / 12, currency, response_format)
+        _add_amount(financial_data, "estimated_daily_spend_total", display_spend / 365, currency, response_format)
+        brand_details["financial_data"] = financial_data
+    
+    if _wants(projection, "platform_breakdown"):
+        platform_split = _calculate_platform_split(brand_name, industry, display_spend)
+        platform_breakdown = {}
+        _add_amount(platform_breakdown, "meta_estimated", platform_split["meta_spend"], currency, response_format)
+        _add_amount(platform_breakdown, "google_estimated", platform_split["google_spend"], currency, response_format)
+        platform_breakdown["meta_percentage"] = platform_split["meta_percentage"]
+        platform_breakdown["google_percentage"] = platform_split["google_percentage"]
+        brand_details["platform_breakdown"] = platform_breakdown
+    
+    if _wants(projection, "ad_type_breakdown"):
+        ad_types = brand_info.get("ad_types", {})
+        video_percentage = ad_types.get("video", 60)
+        display_percentage = ad_types.get("display", 40)
+        ad_type_breakdown = {
+            "video_percentage": video_percentage,
+            "display_percentage": display_percentage
+        }
+        _add_amount(ad_type_breakdown, "video_spend", display_spend * (video_percentage / 100), currency, response_format)
+        _add_amount(ad_type_breakdown, "display_spend", display_spend * (display_percentage / 100), currency, response_format)
+        brand_details["ad_type_breakdown"] = ad_type_breakdown
+    
+    brand_details["generated_at"] = datetime.now().isoformat()
+    
+    # Competitive position analysis, read from the presorted rank index
+    if _wants(projection, "competitive_position"):
+        leader_spend_converted = context["leader_spend"] * context["currency_rate"]
+        brand_details["competitive_position"] = {
+            "rank_in_industry": context["rank_positions"][brand_name],
+            "total_brands_in_industry": len(industry_data),
+            "industry_leader": context["industry_leader"],
+            "spend_vs_leader_ratio": total_spend_converted / leader_spend_converted if leader_spend_converted else 0,
+            "closest_competitors": [
+                name for (_, name), _ in _get_similarity_index(context["snapshot"], industry.lower()).nearest(
+                    (industry.lower(), brand_name), 3)
+            ]
+        }
+    
+    return brand_details
+
+def _get_brand_granular_details(brand_name: str, industry: str, currency: str, country_filter: str = "all", date_from: str = None, date_to: str = None,
+                                fields=None, response_format: str = "both") -> Dict:
+    """Get detailed granular information about a specific brand.
+    
+    Only the projected sections are computed, and amounts are returned raw,
+    formatted or both depending on response_format.
+    """
+    projection = _resolve_projection(fields, response_format, BRAND_DETAIL_SECTIONS)
+    if "error" in projection:
+        return projection
+    
+    context = _brand_details_context(industry, currency, date_from, date_to)
+    return _build_brand_details(brand_name, industry, currency, country_filter, projection, context)
+
+def _get_brand_details_batch(brand_names: List[str], industry: str, currency: str, country_filter: str = "all", date_from: str = None, date_to: str = None,
+                             fields=None, response_format: str = "both") -> Dict:
+    """Get details for many brands of one industry sharing the same parameters.
+    
+    The rank index, date multiplier and currency factor are evaluated once and
+    every brand is computed in a single pass. Results keep the request order;
+    brands that cannot be resolved carry a per-item error.
+    """
+    if not isinstance(brand_names, list) or not brand_names:
+        return {"error": "brand_names must be a non-empty list"}
+    
+    if len(brand_names) > MAX_BATCH_SIZE:
+        return {"error": f"At most {MAX_BATCH_SIZE} brands can be requested per batch"}
+    
+    projection = _resolve_projection(fields, response_format, BRAND_DETAIL_SECTIONS)
+    if "error" in projection:
+        return projection
+    
+    context = _brand_details_context(industry, currency, date_from, date_to)
+    
+    results = []
+    errors = 0
+    for brand_name in brand_names:
+        brand_details = _build_brand_details(str(brand_name), industry, currency, country_filter, projection, context)
+        if "error" in brand_details:
+            # Drop per-brand suggestion lists, they would repeat the whole industry for every miss
+            brand_details = {"brand_name": brand_name, "error": brand_details["error"]}
+            errors += 1
+        results.append(brand_details)
+    
+    return {
+        "industry": industry,
+        "currency": currency,
+        "country_filter": country_filter,
+        "requested": len(brand_names),
+        "found": len(brand_names) - errors,
+        "brands": results,
         "generated_at": datetime.now().isoformat()
     }
+
+def _export_batches(industry: str = "all", country_filter: str = "all", currency: str = "EUR",
+                    date_from: str = None, date_to: str = None) -> Iterator[Dict[str, List]]:
+    """Validate an export view and return its column batches.
     
-    # Competitive position analysis
-    all_brands_spending = [(name, data["total_spend"]) for name, data in industry_data.items()]
-    all_brands_spending.sort(key=lambda x: x[1], reverse=True)
+    Args:
+        industry: Industry to export, or "all" for every industry
+        country_filter: Only brands with spend in this country (belgium, france, or all)
+        currency: Currency of the spend columns
+        date_from: Start date (YYYY-MM-DD) scaling annual spend to the period
+        date_to: End date (YYYY-MM-DD)
     
-    brand_rank = next((i+1 for i, (name, _) in enumerate(all_brands_spending) if name == brand_name), None)
+    Raises:
+        ValueError: If the industry, country or currency is unknown
+    """
+    snapshot = current_snapshot
+    if industry.lower() != "all" and industry.lower() not in snapshot.brands:
+        raise ValueError(f"Industry '{industry}' not found. Available industries: {', '.join(snapshot.brands)}")
+    if country_filter.lower() != "all" and country_filter.lower() not in COUNTRY_FIELDS:
+        raise ValueError(f"Country '{country_filter}' not supported. Available countries: all, {', '.join(COUNTRY_FIELDS)}")
+    if currency not in CURRENCY_RATES:
+        raise ValueError(f"Currency '{currency}' not supported. Available currencies: {', '.join(CURRENCY_RATES)}")
     
-    brand_details["competitive_position"] = {
-        "rank_in_industry": brand_rank,
-        "total_brands_in_industry": len(industry_data),
-        "industry_leader": all_brands_spending[0][0] if all_brands_spending else None,
-        "spend_vs_leader_ratio": total_spend_converted / _convert_currency(all_brands_spending[0][1], currency) if all_brands_spending else 0
-    }
+    industries = list(snapshot.brands) if industry.lower() == "all" else [industry.lower()]
+    return _iter_export_batches(snapshot, industries, country_filter.lower(), currency, date_from, date_to)
+
+def _iter_export_batches(snapshot: BrandSnapshot, industries: List[str], country_filter: str, currency: str,
+                         date_from: str, date_to: str) -> Iterator[Dict[str, List]]:
+    """Yield the brand view as column batches of at most EXPORT_BATCH_ROWS rows, one industry at a time."""
+    scale = _calculate_date_multiplier(date_from, date_to) * CURRENCY_RATES[currency]
+    country = COUNTRY_FIELDS.get(country_filter)
+    
+    for industry in industries:
+        rows = [
+            (brand_name, brand_data) for brand_name, brand_data in snapshot.brands[industry].items()
+            if country is None or brand_data[country["spend"]] > 0
+        ]
+        for start in range(0, len(rows), EXPORT_BATCH_ROWS):
+            batch = rows[start:start + EXPORT_BATCH_ROWS]
+            yield {
+                "industry": [industry] * len(batch),
+                "brand_name": [brand_name for brand_name, _ in batch],
+                "belgium_spend": [round(data["belgium_ad_spend_eur"] * scale, 2) for _, data in batch],
+                "france_spend": [round(data["france_ad_spend_eur"] * scale, 2) for _, data in batch],
+                "total_spend": [round(data["total_spend"] * scale, 2) for _, data in batch],
+                "market_share_be": [float(data["market_share_be"]) for _, data in batch],
+                "market_share_fr": [float(data["market_share_fr"]) for _, data in batch],
+                "platforms": [list(data.get("platforms", [])) for _, data in batch],
+                "currency": [currency] * len(batch)
+            }
+
+def _query_fact_table(snapshot: BrandSnapshot) -> Dict[str, List]:
+    """Build the snapshot's brand x country x platform fact columns for ad-hoc queries.
     
-    return brand_details
+    Country spend is split between Meta and Google with each brand's platform
+    split; traits come from the brand name. Built once per snapshot.
+    """
+    def build() -> Dict[str, List]:
+        table = {column: [] for column in ["industry", "brand_name", "country", "platform", "trait", "spend",
+                                           "market_share", "total_spend", "belgium_spend", "france_spend"]}
+        for industry in snapshot.brands:
+            for brand_name, brand_data in snapshot.brands[industry].items():
+                split = _calculate_platform_split(brand_name, industry, 1.0)
+                traits = tuple(_brand_traits(brand_name))
+                for country, country_fields in COUNTRY_FIELDS.items():
+                    for platform in ("meta", "google"):
+                        table["industry"].append(industry)
+                        table["brand_name"].append(brand_name)
+                        table["country"].append(country)
+                        table["platform"].append(platform)
+                        table["trait"].append(traits)
+                        table["spend"].append(brand_data[country_fields["spend"]] * split[f"{platform}_spend"])
+                        table["market_share"].append(float(brand_data[country_fields["market_share"]]))
+                        table["total_spend"].append(brand_data["total_spend"])
+                        table["belgium_spend"].append(brand_data["belgium_ad_spend_eur"])
+                        table["france_spend"].append(brand_data["france_ad_spend_eur"])
+        return table
+    
+    return snapshot.derive(("query_facts",), build)
+
+def _run_brand_query(query: Dict, currency: str = "EUR", date_from: str = None, date_to: str = None) -> Dict:
+    """Run an ad-hoc query over the current brand snapshot.
+    
+    Args:
+        query: Query with filters, group_by, aggregates, order_by and limit (see brand_query)
+        currency: Currency of spend aggregates
+        date_from: Start date (YYYY-MM-DD) scaling annual spend to the period
+        date_to: End date (YYYY-MM-DD)
+    """
+    if currency not in CURRENCY_RATES:
+        return {"error": f"Currency '{currency}' not supported. Available currencies: {', '.join(CURRENCY_RATES)}"}
+    
+    started = time.perf_counter()
+    snapshot = current_snapshot
+    scale = _calculate_date_multiplier(date_from, date_to) * CURRENCY_RATES[currency]
+    try:
+        result = run_query(_query_fact_table(snapshot), query, scale)
+    except QueryError as e:
+        return {"error": str(e)}
+    
+    result.update({
+        "currency": currency,
+        "data_version": snapshot.version,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "generated_at": datetime.now().isoformat()
+    })
+    return result
 
-def _generate_country_brand_analysis(country: str, currency: str) -> Dict:
-    """Generate analysis of all brands from a specific country."""
-    country_brands = []
-    
-    for industry, categories in BELGIUM_FRANCE_BRANDS_DATABASE.items():
-        for category, brands in categories.items():
-            for brand_name, brand_data in brands.items():
-                if country.lower() in brand_data["country"].lower():
-                    spend_converted = _convert_currency(brand_data["annual_ad_spend_eur"], currency)
-                    country_brands.append({
-                        "name": brand_name,
-                        "industry": industry,
-                        "category": category,
-                        "headquarters": brand_data["headquarters"],
-                        "annual_ad_spend": spend_converted,
-                        "annual_ad_spend_formatted": _format_currency(spend_converted, currency),
-                        "market_share": brand_data["market_share"]
-                    })
-    
-    if not country_brands:
+def _run_brand_sql(sql: str, params: Optional[List] = None, max_rows: int = DEFAULT_MAX_ROWS,
+                   timeout: float = DEFAULT_TIMEOUT_SECONDS) -> Dict:
+    """Run a read-only SQL statement against the SQLite mirror of the brand store and ad archive.
+    
+    The mirror is reloaded whenever the brand data version has changed since the
+    last statement, and ad cache entries are synced incrementally.
+    
+    Args:
+        sql: A single SELECT statement, with ? placeholders for params
+        params: Positional statement parameters
+        max_rows: Row cap; the result reports whether it was truncated
+        timeout: Statement timeout in seconds
+    """
+    global brand_sql_mirror
+    if not BRAND_SQL_ENABLED:
+        return {"error": "SQL queries are disabled. Set BRAND_SQL_ENABLED=1 to enable the SQLite mirror"}
+    if not isinstance(sql, str) or not sql.strip():
+        return {"error": "A SQL statement is required"}
+    
+    snapshot = current_snapshot
+    with brand_sql_lock:
+        if brand_sql_mirror is None:
+            brand_sql_mirror = BrandSqlMirror()
+        mirror = brand_sql_mirror
+    mirror.refresh_brands(snapshot.version, (
+        (industry, brand_name, brand_data)
+        for industry in snapshot.brands for brand_name, brand_data in snapshot.brands[industry].items()
+    ))
+    mirror.sync_ads({"meta": ad_cache, "google": google_ads_cache})
+    
+    try:
+        result = mirror.query(sql, params, max_rows, min(float(timeout), DEFAULT_TIMEOUT_SECONDS * 5))
+    except sqlite3.Error as e:
+        return {"error": f"SQL error: {e}"}
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}
+    
+    result["data_version"] = snapshot.version
+    return result
+
+def _generate_country_brand_analysis(country: str, currency: str, top_n: int = 15, offset: int = 0,
+                                     cursor: Optional[str] = None, sort_by: str = "annual_ad_spend",
+                                     fields=None, response_format: str = "both") -> Dict:
+    """Generate analysis of all brands advertising in a specific country.
+    
+    Brands are ranked with heap selection on raw values, so only the requested
+    page is built, with the projected fields in the requested format.
+    """
+    country_fields = COUNTRY_FIELDS.get(country.lower())
+    if country_fields is None:
         return {
             "error": f"No brands found for country '{country}'",
-            "available_countries": list(set(
-                brand_data["country"] for categories in BELGIUM_FRANCE_BRANDS_DATABASE.values() 
-                for brands in categories.values() 
-                for brand_data in brands.values()
-            ))
+            "available_countries": [fields["name"] for fields in COUNTRY_FIELDS.values()]
         }
     
-    # Sort by spending
-    country_brands.sort(key=lambda x: x["annual_ad_spend"], reverse=True)
-    
-    # Calculate totals
-    total_spend = sum(brand["annual_ad_spend"] for brand in country_brands)
-    total_market_share = sum(brand["market_share"] for brand in country_brands)
-    
-    # Industry breakdown
+    snapshot = current_snapshot
+    scope = f"country|{country.lower()}"
+    page = _resolve_page(scope, top_n, offset, cursor, sort_by, COUNTRY_SORT_FIELDS, snapshot.version)
+    if "error" in page:
+        return page
+    projection = _resolve_projection(fields, response_format, COUNTRY_BRAND_FIELDS)
+    if "error" in projection:
+        return projection
+    
+    # Raw sort keys per listing field
+    sort_source = {
+        "annual_ad_spend": country_fields["spend"],
+        "total_spend": "total_spend",
+        "market_share": country_fields["market_share"]
+    }[page["sort_by"]]
+    
+    candidates = []
     industry_breakdown = {}
-    for brand in country_brands:
-        industry = brand["industry"]
-        if industry not in industry_breakdown:
-            industry_breakdown[industry] = {"brands": 0, "total_spend": 0, "brands_list": []}
-        industry_breakdown[industry]["brands"] += 1
-        industry_breakdown[industry]["total_spend"] += brand["annual_ad_spend"]
-        industry_breakdown[industry]["brands_list"].append(brand["name"])
-    
-    # Format industry breakdown
+    total_spend = 0
+    total_market_share = 0
+    
+    for industry, industry_data in snapshot.brands.items():
+        for brand_name, brand_data in industry_data.items():
+            spend = brand_data[country_fields["spend"]]
+            if spend <= 0:
+                continue
+            
+            candidates.append((brand_data[sort_source], brand_name, industry, brand_data))
+            total_spend += spend
+            total_market_share += brand_data[country_fields["market_share"]]
+            
+            # Industry breakdown
+            if industry not in industry_breakdown:
+                industry_breakdown[industry] = {"brands": 0, "total_spend": 0, "brands_list": []}
+            industry_breakdown[industry]["brands"] += 1
+            industry_breakdown[industry]["total_spend"] += spend
+            industry_breakdown[industry]["brands_list"].append(brand_name)
+    
+    # Convert and format industry breakdown
     for industry_data in industry_breakdown.values():
-        industry_data["total_spend_formatted"] = _format_currency(industry_data["total_spend"], currency)
+        _add_amount(industry_data, "total_spend", _convert_currency(industry_data.pop("total_spend"), currency),
+                    currency, projection["format"])
+    
+    # Select the requested page on raw values, then build only those rows
+    selected = heapq.nlargest(page["offset"] + page["top_n"], candidates, key=lambda candidate: candidate[0])[page["offset"]:]
+    top_brands = []
+    for _, brand_name, industry, brand_data in selected:
+        brand = {"name": brand_name}
+        if _wants(projection, "industry"):
+            brand["industry"] = industry
+        if _wants(projection, "annual_ad_spend"):
+            _add_amount(brand, "annual_ad_spend", _convert_currency(brand_data[country_fields["spend"]], currency),
+                        currency, projection["format"])
+        if _wants(projection, "total_spend"):
+            _add_amount(brand, "total_spend", _convert_currency(brand_data["total_spend"], currency),
+                        currency, projection["format"])
+        if _wants(projection, "market_share"):
+            brand["market_share"] = brand_data[country_fields["market_share"]]
+        top_brands.append(brand)
+    
+    summary = {"total_brands": len(candidates)}
+    _add_amount(summary, "total_ad_spend", _convert_currency(total_spend, currency), currency, projection["format"])
+    summary["total_market_share"] = total_market_share
+    summary["industries_represented"] = len(industry_breakdown)
     
     return {
-        "country": country,
+        "country": country_fields["name"],
         "currency": currency,
-        "summary": {
-            "total_brands": len(country_brands),
-            "total_ad_spend": total_spend,
-            "total_ad_spend_formatted": _format_currency(total_spend, currency),
-            "total_market_share": total_market_share,
-            "industries_represented": len(industry_breakdown)
-        },
-        "top_brands": country_brands[:15],
+        "summary": summary,
+        "top_brands": top_brands,
+        "pagination": _pagination_info(scope, page, len(candidates), snapshot.version),
         "industry_breakdown": industry_breakdown,
         "generated_at": datetime.now().isoformat()
     }
 
-def _generate_subcategory_analysis(industry: str, subcategory: str, currency: str, country_filter: str = "all") -> Dict:
-    """Generate granular analysis of a specific subcategory."""
-    industry_data = BELGIUM_FRANCE_BRANDS_DATABASE.get(industry.lower(), {})
+def _generate_subcategory_analysis(industry: str, subcategory: str, currency: str, country_filter: str = "all",
+                                   top_n: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                                   sort_by: str = "annual_ad_spend", fields=None, response_format: str = "both") -> Dict:
+    """Generate granular analysis of a specific subcategory.
     
-    if subcategory.lower() not in industry_data:
+    Members, totals and concentration come from the subcategory's market slice,
+    so the cost is proportional to the subcategory's size, not the industry's.
+    """
+    snapshot = current_snapshot
+    if industry.lower() not in snapshot.brands:
+        return {
+            "error": f"Industry '{industry}' not found",
+            "available_industries": list(snapshot.brands.keys())
+        }
+    if country_filter.lower() != "all" and country_filter.lower() not in COUNTRY_FIELDS:
+        return {
+            "error": f"Country '{country_filter}' not supported",
+            "available_countries": ["all"] + list(COUNTRY_FIELDS)
+        }
+    country_filter = country_filter.lower()
+    tag = _normalize_subcategory(subcategory)
+    
+    scope = f"subcategory|{industry.lower()}|{tag}|{country_filter}"
+    page = _resolve_page(scope, top_n, offset, cursor, sort_by, SUBCATEGORY_SORT_FIELDS, snapshot.version)
+    if "error" in page:
+        return page
+    projection = _resolve_projection(fields, response_format, SUBCATEGORY_BRAND_FIELDS)
+    if "error" in projection:
+        return projection
+    
+    slices = _get_market_slices(snapshot, industry)
+    available_subcategories = sorted(tag for scope, tag in slices if scope == "all" and tag)
+    if ("all", tag) not in slices:
         return {
             "error": f"Subcategory '{subcategory}' not found in {industry}",
-            "available_subcategories": list(industry_data.keys())
+            "available_subcategories": available_subcategories
         }
     
-    category_brands = industry_data[subcategory.lower()]
-    
-    # Apply country filter
-    filtered_brands = _filter_brands_by_country(category_brands, country_filter)
+    market = slices.get((country_filter, tag)) or ConcentrationSlice()
+    industry_total = slices[(country_filter, None)].total if (country_filter, None) in slices else 0
+    industry_data = snapshot.brands[industry.lower()]
+    total_spend = market.total
     
-    # Convert and sort brands
     brands_analysis = []
-    total_spend = 0
-    
-    for brand_name, brand_data in filtered_brands.items():
-        spend_converted = _convert_currency(brand_data["annual_ad_spend_eur"], currency)
-        total_spend += spend_converted
-        
+    for brand_name in market.ranked():
+        brand_data = industry_data[brand_name]
+        spend, market_share = _brand_country_value(brand_data, country_filter)
         brands_analysis.append({
             "name": brand_name,
-            "country": brand_data["country"],
-            "headquarters": brand_data["headquarters"],
-            "annual_ad_spend": spend_converted,
-            "annual_ad_spend_formatted": _format_currency(spend_converted, currency),
-            "market_share": brand_data["market_share"],
-            "share_of_category_spend": 0  # Will calculate after total is known
+            "brand_data": brand_data,
+            "annual_ad_spend": spend,
+            "market_share": round(market_share, 2),
+            "share_of_category_spend": spend / total_spend * 100 if total_spend > 0 else 0
         })
     
-    # Calculate share of category spend
-    for brand in brands_analysis:
-        brand["share_of_category_spend"] = (brand["annual_ad_spend"] / total_spend * 100) if total_spend > 0 else 0
-    
-    # Sort by spending
-    brands_analysis.sort(key=lambda x: x["annual_ad_spend"], reverse=True)
-    
-    # Country analysis within subcategory
+    # Project and format only the requested page of brands
+    brands_page = []
+    for brand in _select_top(brands_analysis, page["sort_by"], page["offset"], page["top_n"]):
+        brand_data = brand["brand_data"]
+        row = {"name": brand["name"]}
+        for field in SUBCATEGORY_BRAND_FIELDS:
+            if not _wants(projection, field):
+                continue
+            if field == "annual_ad_spend":
+                _add_amount(row, field, _convert_currency(brand[field], currency), currency, projection["format"])
+            elif field == "markets":
+                row[field] = [fields["name"] for fields in COUNTRY_FIELDS.values() if brand_data[fields["spend"]] > 0]
+            elif field == "subcategories":
+                row[field] = list(brand_data.get("subcategories", []))
+            else:
+                row[field] = brand[field]
+        brands_page.append(row)
+    
+    # Per-market breakdown of the subcategory, from the precomputed country scopes
     country_analysis = {}
-    for brand in brands_analysis:
-        country = brand["country"]
-        if country not in country_analysis:
-            country_analysis[country] = {"brands": 0, "total_spend": 0, "market_share": 0}
-        country_analysis[country]["brands"] += 1
-        country_analysis[country]["total_spend"] += brand["annual_ad_spend"]
-        country_analysis[country]["market_share"] += brand["market_share"]
-    
-    # Format country analysis
-    for country_data in country_analysis.values():
-        country_data["total_spend_formatted"] = _format_currency(country_data["total_spend"], currency)
+    for country, country_fields in COUNTRY_FIELDS.items():
+        if country_filter not in ("all", country):
+            continue
+        country_market = slices.get((country, tag))
+        if not country_market:
+            continue
+        country_data = {"brands": len(country_market)}
+        _add_amount(country_data, "total_spend", _convert_currency(country_market.total, currency),
+                    currency, projection["format"])
+        country_data["share_of_industry_spend"] = round(country_market.total / slices[(country, None)].total * 100, 2)
+        country_analysis[country_fields["name"]] = country_data
+    
+    summary = {"total_brands": len(brands_analysis)}
+    _add_amount(summary, "total_ad_spend", _convert_currency(total_spend, currency), currency, projection["format"])
+    _add_amount(summary, "average_spend_per_brand",
+                _convert_currency(total_spend / len(brands_analysis), currency) if brands_analysis else 0,
+                currency, projection["format"])
+    summary["countries_represented"] = len(country_analysis)
+    summary["share_of_industry_spend"] = round(total_spend / industry_total * 100, 2) if industry_total else 0
     
     return {
         "industry": industry,
-        "subcategory": subcategory,
+        "subcategory": tag,
         "currency": currency,
-        "summary": {
-            "total_brands": len(brands_analysis),
-            "total_ad_spend": total_spend,
-            "total_ad_spend_formatted": _format_currency(total_spend, currency),
-            "average_spend_per_brand": total_spend / len(brands_analysis) if brands_analysis else 0,
-            "average_spend_per_brand_formatted": _format_currency(total_spend / len(brands_analysis), currency) if brands_analysis else "€0",
-            "countries_represented": len(country_analysis)
-        },
-        "brands": brands_analysis,
+        "country_filter": country_filter,
+        "summary": summary,
+        "brands": brands_page,
+        "pagination": _pagination_info(scope, page, len(brands_analysis), snapshot.version),
         "country_analysis": country_analysis,
-        "market_concentration": {
-            "top_3_share": sum(brand["share_of_category_spend"] for brand in brands_analysis[:3]),
-            "top_5_share": sum(brand["share_of_category_spend"] for brand in brands_analysis[:5]),
-            "herfindahl_index": sum(brand["share_of_category_spend"]**2 for brand in brands_analysis) / 10000
-        },
+        "market_concentration": market.metrics(),
+        "available_subcategories": available_subcategories,
         "generated_at": datetime.now().isoformat()
     }
 
 def _generate_comprehensive_brands_data(industry: str, include_competitors: bool) -> Dict:
     """Generate comprehensive brand data using real European brand database."""
-    industry_data = BELGIUM_FRANCE_BRANDS_DATABASE.get(industry.lower(), {})
+    snapshot = current_snapshot
+    industry_data = snapshot.brands.get(industry.lower(), {})
     
     if not industry_data:
         return {
             "error": f"Industry '{industry}' not found in European database",
-            "available_industries": list(BELGIUM_FRANCE_BRANDS_DATABASE.keys())
+            "available_industries": list(snapshot.brands.keys())
         }
     
     result = {
@@ -1386,49 +2534,154 @@ def _generate_comprehensive_brands_data(industry: str, include_competitors: bool
     
     return result
 
-def _generate_platform_comparison(industry: str, metric: str) -> Dict:
-    """Generate comparison between Meta and Google Ads for an industry."""
+def _fetch_platform_ads(industry: str, platform: str, limit: int, credential: Optional[str] = None,
+                        max_wait: Optional[float] = None) -> List[Dict]:
+    """Get an industry's ads for one platform from the ad cache, fetching and caching them on a miss.
     
-    # Generate realistic comparison metrics
-    meta_base = hash(f"meta_{industry}") % 1000 + 500
-    google_base = hash(f"google_{industry}") % 1000 + 500
+    Args:
+        max_wait: Fail instead of fetching when the credential's rate limit
+            allows no request for this many seconds
     
-    metrics_data = {
-        "reach": {
-            "meta": {"value": meta_base * 1000, "unit": "users", "trend": "stable"},
-            "google": {"value": google_base * 1200, "unit": "users", "trend": "increasing"}
-        },
-        "spend": {
-            "meta": {"value": meta_base * 100, "unit": "USD", "trend": "increasing"},
-            "google": {"value": google_base * 120, "unit": "USD", "trend": "stable"}
-        },
-        "engagement": {
-            "meta": {"value": meta_base / 100, "unit": "rate", "trend": "decreasing"},
-            "google": {"value": google_base / 150, "unit": "rate", "trend": "stable"}
-        },
-        "ctr": {
-            "meta": {"value": (meta_base % 10) / 10 + 1, "unit": "percentage", "trend": "stable"},
-            "google": {"value": (google_base % 10) / 10 + 2, "unit": "percentage", "trend": "increasing"}
-        }
-    }
+    Raises:
+        ProviderError: With status 429 when the rate limit rules out fetching
+    """
+    cache, cache_key = (ad_cache, f"{industry}_{limit}") if platform == "meta" else (google_ads_cache, f"google_{industry}_{limit}")
+    cached_data = cache.get(cache_key)
+    if cached_data:
+        cache_time = datetime.fromisoformat(cached_data.get("timestamp", "2020-01-01"))
+        if datetime.now() - cache_time < timedelta(hours=1):
+            return cached_data["data"]
+    
+    if credential and max_wait is not None:
+        quota = get_provider(platform).quota(credential)
+        if quota["available_in_seconds"] > max_wait:
+            raise ProviderError(f"{platform} rate limit allows no request for {quota['available_in_seconds']}s", 429)
+    
+    if platform == "meta":
+        ads = _fetch_meta_ads(INDUSTRY_KEYWORDS[industry], limit, credential) if credential else _generate_demo_ad_data(industry, limit)
+    else:
+        ads = _fetch_google_ads(industry, limit, credential) if credential else _generate_demo_google_ads_data(industry, limit)
+    _store_ads(cache, cache_key, industry, platform, ads)
+    return ads
+
+def _ad_metric_columns(ads: List[Dict]) -> Dict[str, List[float]]:
+    """Normalize provider-specific ad fields into impressions, spend and clicks columns.
     
-    current_metric = metrics_data.get(metric, metrics_data["reach"])
-    leader = "google" if current_metric["google"]["value"] > current_metric["meta"]["value"] else "meta"
+    Columns hold one value per ad that reports the field, so providers that do
+    not report one (Meta has no clicks) leave that column empty.
+    """
+    columns = {"impressions": [], "spend": [], "clicks": [], "ctr_impressions": []}
+    for ad in ads:
+        performance = ad.get("performance_metrics") or {}
+        impressions = _range_midpoint(ad.get("impressions") or ad.get("impressions_estimate"))
+        if impressions is None and "impressions_min" in performance:
+            impressions = (performance["impressions_min"] + performance.get("impressions_max", performance["impressions_min"])) / 2
+        spend = _ad_spend_midpoint(ad)
+        clicks = _range_midpoint(performance.get("clicks_estimate"))
+        if impressions is not None:
+            columns["impressions"].append(impressions)
+        if spend is not None:
+            columns["spend"].append(spend)
+        if clicks is not None:
+            columns["clicks"].append(clicks)
+            if impressions is not None:
+                columns["ctr_impressions"].append(impressions)
+    return columns
+
+def _platform_metric(columns: Dict[str, List[float]], metric: str, ads: int) -> Dict:
+    """Aggregate one comparison metric from a platform's normalized columns."""
+    if metric == "ctr":
+        impressions = sum(columns["ctr_impressions"])
+        value = round(sum(columns["clicks"]) / impressions * 100, 2) if impressions else None
+        return {"value": value, "unit": "percentage", "coverage": round(len(columns["ctr_impressions"]) / ads, 2) if ads else 0}
+    column = columns[PLATFORM_METRICS[metric]]
+    if metric == "engagement":
+        value = round(sum(column) / len(column), 2) if column else None
+        unit = "clicks per ad"
+    else:
+        value = round(sum(column), 2) if column else None
+        unit = "impressions" if metric == "reach" else "USD"
+    return {"value": value, "unit": unit, "coverage": round(len(column) / ads, 2) if ads else 0}
+
+def _generate_platform_comparison(industry: str, metric: str, access_token: Optional[str] = None,
+                                  google_api_key: Optional[str] = None,
+                                  timeout: float = PLATFORM_COMPARISON_TIMEOUT_SECONDS) -> Dict:
+    """Compare Meta and Google Ads for an industry from both providers' ads.
+    
+    Both providers are fetched concurrently under one shared deadline, so the
+    comparison takes as long as the slower provider, not both. A provider that
+    fails or misses the deadline is reported as degraded and the comparison
+    continues with the other; a late fetch still lands in the ad cache. A
+    provider whose rate limit allows no request before the deadline is not
+    fetched at all and is reported as throttled.
+    
+    Args:
+        industry: Industry to compare
+        metric: reach, spend, engagement or ctr (unknown metrics compare reach)
+        access_token: Meta API access token (demo data without one)
+        google_api_key: Google Ads API key (demo data without one)
+        timeout: Seconds both fetches share
+    """
+    industry = industry.lower()
+    metric = metric if metric in PLATFORM_METRICS else "reach"
+    started = time.perf_counter()
+    futures = {
+        platform_fetch_pool.submit(_fetch_platform_ads, industry, "meta", PLATFORM_COMPARISON_LIMIT, access_token, timeout): "meta",
+        platform_fetch_pool.submit(_fetch_platform_ads, industry, "google", PLATFORM_COMPARISON_LIMIT, google_api_key, timeout): "google"
+    }
+    done, _ = wait(futures, timeout=timeout)
+    
+    platforms = {}
+    providers = {}
+    for future, platform in futures.items():
+        if future not in done:
+            providers[platform] = {"status": "timeout", "timeout_seconds": timeout}
+            platforms[platform] = {"value": None, "unit": None, "coverage": 0}
+            continue
+        try:
+            ads = future.result()
+        except ProviderError as e:
+            logger.warning(f"{platform} fetch failed for platform comparison: {e}")
+            providers[platform] = {"status": "throttled" if e.status == 429 else "error", "error": str(e)}
+            platforms[platform] = {"value": None, "unit": None, "coverage": 0}
+            continue
+        except Exception as e:
+            logger.warning(f"{platform} fetch failed for platform comparison: {e}")
+            providers[platform] = {"status": "error", "error": str(e)}
+            platforms[platform] = {"value": None, "unit": None, "coverage": 0}
+            continue
+        providers[platform] = {"status": "ok", "ads": len(ads)}
+        platforms[platform] = _platform_metric(_ad_metric_columns(ads), metric, len(ads))
+    
+    meta_value, google_value = platforms["meta"]["value"], platforms["google"]["value"]
+    leader = None
+    difference = None
+    if meta_value is not None and google_value is not None:
+        leader = "google" if google_value > meta_value else "meta"
+        largest = max(meta_value, google_value)
+        difference = round(abs(meta_value - google_value) / largest * 100, 2) if largest else 0.0
+    
+    names = {"meta": "Meta", "google": "Google Ads"}
+    insights = []
+    if leader:
+        other = "meta" if leader == "google" else "google"
+        insights.append(f"{names[leader]} leads {industry} on {metric} by {difference}% over {names[other]}")
+    for platform, provider in providers.items():
+        if provider["status"] != "ok":
+            insights.append(f"{names[platform]} data unavailable ({provider['status']}); comparison is partial")
+        elif platforms[platform]["value"] is None:
+            insights.append(f"{names[platform]} does not report the data behind {metric}")
     
     return {
         "industry": industry,
         "comparison_metric": metric,
-        "platforms": current_metric,
+        "platforms": platforms,
         "leader": leader,
-        "difference_percentage": abs(current_metric["meta"]["value"] - current_metric["google"]["value"]) / max(current_metric["meta"]["value"], current_metric["google"]["value"]) * 100,
-        "insights": [
-            f"Google Ads shows higher {metric} volume in {industry}",
-            f"Meta provides better engagement rates for {industry} brands",
-            f"Both platforms show strong performance in {industry} sector"
-        ][:2] if leader == "google" else [
-            f"Meta leads in {metric} performance for {industry}",
-            f"Google Ads offers broader reach in {industry} market"
-        ]
+        "difference_percentage": difference,
+        "insights": insights,
+        "providers": providers,
+        "degraded": any(provider["status"] != "ok" for provider in providers.values()),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
     }
 
 def _generate_brand_strategy_analysis(brand_name: str, industry: str, platforms: List[str]) -> Dict:
@@ -1448,8 +2701,8 @@ def _generate_brand_strategy_analysis(brand_name: str, industry: str, platforms:
             "primary_objective": "Brand awareness and engagement",
             "ad_formats": ["Video", "Carousel", "Single Image"],
             "targeting_strategy": "Interest-based with lookalike audiences",
-            "estimated_spend": f"${hash(brand_name) % 50000 + 10000}",
-            "performance_score": (hash(brand_name) % 10) / 10 + 0.7,
+            "estimated_spend": f"${_stable_hash(brand_name) % 50000 + 10000}",
+            "performance_score": (_stable_hash(brand_name) % 10) / 10 + 0.7,
             "key_campaigns": [
                 f"{brand_name} Brand Launch",
                 f"{brand_name} Product Showcase",
@@ -1462,8 +2715,8 @@ def _generate_brand_strategy_analysis(brand_name: str, industry: str, platforms:
             "primary_objective": "Lead generation and conversions",
             "ad_formats": ["Search", "Display", "Shopping", "YouTube"],
             "targeting_strategy": "Keyword-based with demographic overlays",
-            "estimated_spend": f"${hash(brand_name) % 60000 + 15000}",
-            "performance_score": (hash(brand_name) % 8) / 10 + 0.75,
+            "estimated_spend": f"${_stable_hash(brand_name) % 60000 + 15000}",
+            "performance_score": (_stable_hash(brand_name) % 8) / 10 + 0.75,
             "key_campaigns": [
                 f"{brand_name} Search Campaign",
                 f"{brand_name} Shopping Ads",
@@ -1483,10 +2736,13 @@ def _generate_brand_strategy_analysis(brand_name: str, industry: str, platforms:
 
 def _generate_demo_ad_data(industry: str, limit: int) -> List[Dict]:
     """Generate demo ad data for testing purposes."""
-    demo_ads = []
+    return list(_iter_demo_ad_data(industry, min(limit, 20)))  # Cap demo data at 20 ads
+
+def _iter_demo_ad_data(industry: str, limit: int) -> Iterator[Dict]:
+    """Yield demo ads one at a time so large exports never build a list."""
     keywords = INDUSTRY_KEYWORDS[industry.lower()]
     
-    for i in range(min(limit, 20)):  # Cap demo data at 20 ads
+    for i in range(limit):
         ad = {
             "id": f"demo_ad_{industry}_{i+1}",
             "advertiser_name": f"Demo {industry.title()} Company {i+1}",
@@ -1503,50 +2759,330 @@ def _generate_demo_ad_data(industry: str, limit: int) -> List[Dict]:
             "ad_type": "image" if i % 2 == 0 else "video",
             "platform": ["Facebook", "Instagram"][i % 2]
         }
-        demo_ads.append(ad)
-    
-    return demo_ads
+        yield ad
 
 def _fetch_meta_ads(keywords: List[str], limit: int, access_token: str) -> List[Dict]:
-    """Fetch real ads from Meta Ad Library API (placeholder implementation)."""
-    # This is a placeholder for the actual Meta Ad Library API integration
-    # In a real implementation, you would make authenticated requests to:
-    # https://graph.facebook.com/v18.0/ads_archive
-    
-    base_url = "https://graph.facebook.com/v18.0/ads_archive"
-    params = {
-        "access_token": access_token,
-        "search_terms": " OR ".join(keywords[:5]),  # Limit to first 5 keywords
-        "ad_reached_countries": ["US"],
-        "ad_active_status": "ALL",
-        "limit": limit,
-        "fields": "id,ad_creative_body,ad_delivery_start_time,ad_delivery_stop_time,page_name,spend,impressions,demographic_distribution,region_distribution"
+    """Fetch ads from the Meta Ad Library provider."""
+    return list(_iter_meta_ads(keywords, limit, access_token))
+
+def _iter_meta_ads(keywords: List[str], limit: int, access_token: str) -> Iterator[Dict]:
+    """Yield normalized ads from the Meta Ad Library provider, following paging links one page at a time."""
+    return get_provider("meta").iter_ads(None, keywords, limit, access_token)
+
+def _iter_industry_ads(industry: str, limit: int, platform: str = "meta", credential: Optional[str] = None) -> Iterator[Dict]:
+    """Yield ads for an industry from the platform fetcher, or uncapped demo ads without credentials."""
+    if industry.lower() not in INDUSTRY_KEYWORDS:
+        available = ", ".join(INDUSTRY_KEYWORDS.keys())
+        raise ValueError(f"Industry '{industry}' not supported. Available industries: {available}")
+    
+    if platform == "google":
+        if credential:
+            return _iter_google_ads(industry, limit, credential)
+        return _iter_demo_google_ads_data(industry, limit)
+    
+    if credential:
+        return _iter_meta_ads(INDUSTRY_KEYWORDS[industry.lower()], limit, credential)
+    return _iter_demo_ad_data(industry, limit)
+
+def _store_ads(cache: Dict[str, Dict], cache_key: str, industry: str, platform: str, ads: List[Dict]) -> None:
+    """Cache fetched ads and announce the refresh plus any ads missing from the previous entry."""
+    global ad_archive_version
+    previous = cache.get(cache_key, {}).get("data", [])
+    cache[cache_key] = {
+        "data": ads,
+        "industry": industry.lower(),
+        "timestamp": datetime.now().isoformat()
+    }
+    ad_archive_version += 1
+    
+    event_broker.publish("cache_refresh", {"cache": f"{platform}_ads", "key": cache_key, "industry": industry.lower()})
+    seen_ids = {ad.get("id") for ad in previous}
+    new_ids = [ad.get("id") for ad in ads if ad.get("id") not in seen_ids]
+    if new_ids:
+        event_broker.publish("ads", {"industry": industry.lower(), "platform": platform, "count": len(new_ids), "new_ad_ids": new_ids})
+    _observe_ads(industry.lower(), platform, ads)
+
+def _range_midpoint(value) -> Optional[float]:
+    """Midpoint of a {"lower_bound", "upper_bound"} range, a "low-high" string or a plain number."""
+    try:
+        if isinstance(value, dict):
+            lower = float(value.get("lower_bound", 0))
+            return (lower + float(value.get("upper_bound", lower))) / 2
+        if isinstance(value, str):
+            bounds = [float(part) for part in value.replace("$", "").replace(",", "").split("-") if part.strip()]
+            return sum(bounds) / len(bounds) if bounds else None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def _ad_spend_midpoint(ad: Dict) -> Optional[float]:
+    """Midpoint of an ad's reported spend range (Meta API bounds or a "$low-$high" estimate)."""
+    return _range_midpoint(ad.get("spend") or ad.get("spend_estimate"))
+
+def _publish_anomalies(observations: List[tuple]) -> List[Dict]:
+    """Feed observations to the anomaly detector and announce whatever it flags."""
+    anomalies = anomaly_detector.observe_many(observations)
+    for anomaly in anomalies:
+        event_broker.publish("anomaly", anomaly)
+    return anomalies
+
+def _observe_ads(industry: str, platform: str, ads: List[Dict]) -> None:
+    """Record each advertiser's ad count and estimated spend in a fetched batch.
+    
+    An advertiser missing from a fetch is not observed as zero: fetches are
+    capped samples, so absence does not mean the advertiser stopped.
+    """
+    volume: Dict[str, int] = {}
+    spend: Dict[str, float] = {}
+    for ad in ads:
+        advertiser = ad.get("advertiser_name") or ad.get("page_name")
+        if not advertiser:
+            continue
+        volume[advertiser] = volume.get(advertiser, 0) + 1
+        amount = _ad_spend_midpoint(ad)
+        if amount is not None:
+            spend[advertiser] = spend.get(advertiser, 0) + amount
+    observations = [(industry, advertiser, platform, "ad_volume", count) for advertiser, count in volume.items()]
+    observations.extend((industry, advertiser, platform, "spend", amount) for advertiser, amount in spend.items())
+    _publish_anomalies(observations)
+
+def _brand_spend_observations(industry: str, brand_name: str, brand_data: Optional[Dict]) -> List[tuple]:
+    """Per-platform spend observations for a brand row; a deleted row observes zero spend."""
+    split = _calculate_platform_split(brand_name, industry, brand_data["total_spend"] if brand_data else 0)
+    return [(industry, brand_name, platform, "spend", split[f"{platform}_spend"]) for platform in ("meta", "google")]
+
+def _get_provider_quotas(provider: Optional[str] = None) -> Dict:
+    """Get each provider's published rate limit and the token buckets of the credentials used with it.
+    
+    Args:
+        provider: Only this provider (meta, google or another registered provider)
+    """
+    available = provider_names()
+    if provider is not None and provider.lower() not in available:
+        return {"error": f"provider must be one of: {', '.join(available)}"}
+    
+    names = [provider.lower()] if provider else available
+    buckets = rate_limiter.metrics()
+    providers = {}
+    for name in names:
+        limit = get_provider(name).rate_limit
+        providers[name] = {
+            "rate_limit": {"requests": limit.requests, "per_seconds": limit.per_seconds},
+            "credentials": [bucket for bucket in buckets if bucket["provider"] == name]
+        }
+    return {"providers": providers, "generated_at": datetime.now().isoformat()}
+
+def _get_spend_anomalies(industry: Optional[str] = None, advertiser: Optional[str] = None, platform: Optional[str] = None,
+                         metric: Optional[str] = None, since: int = 0, limit: int = 50) -> Dict:
+    """Get recent anomalies flagged by the streaming detector.
+    
+    Args:
+        industry: Only anomalies in this industry
+        advertiser: Only anomalies of this advertiser; also returns its running statistics
+        platform: Only anomalies on this platform (meta or google)
+        metric: Only anomalies in this metric (spend or ad_volume)
+        since: Only anomalies after this sequence number
+        limit: Maximum number of anomalies to return (max 500)
+    """
+    if industry is not None and industry.lower() not in INDUSTRY_KEYWORDS:
+        available = ", ".join(INDUSTRY_KEYWORDS.keys())
+        return {"error": f"Industry '{industry}' not supported. Available industries: {available}"}
+    if platform is not None and platform.lower() not in ("meta", "google"):
+        return {"error": "platform must be 'meta' or 'google'"}
+    if metric is not None and metric not in ANOMALY_METRICS:
+        return {"error": f"metric must be one of: {', '.join(ANOMALY_METRICS)}"}
+    
+    try:
+        since = int(since)
+        limit = max(1, min(MAX_PAGE_SIZE, int(limit)))
+    except (TypeError, ValueError):
+        return {"error": "since and limit must be integers"}
+    
+    industry = industry.lower() if industry else None
+    platform = platform.lower() if platform else None
+    anomalies = anomaly_detector.recent(since, industry, advertiser, platform, metric, limit)
+    result = {
+        "anomalies": anomalies,
+        "last_seq": anomalies[-1]["seq"] if anomalies else since,
+        "detector": anomaly_detector.stats(),
+        "generated_at": datetime.now().isoformat()
+    }
+    if advertiser and industry:
+        result["series"] = {
+            name: anomaly_detector.series_stats(industry, advertiser, name)
+            for name in ([platform] if platform else ["meta", "google"])
+        }
+    return result
+
+def _iter_ads_ndjson(industry: str, limit: int, platform: str = "meta", credential: Optional[str] = None) -> Iterator[str]:
+    """Yield one compact JSON line per ad."""
+    for ad in _iter_industry_ads(industry, limit, platform, credential):
+        yield json.dumps(ad, separators=(",", ":")) + "\n"
+
+def _ad_run_dates(ad: Dict) -> Optional[tuple]:
+    """First and last delivery dates of an ad; a missing stop date means it is still running."""
+    start = ad.get("ad_delivery_start_time") or ad.get("first_shown")
+    if not start:
+        return None
+    stop = ad.get("ad_delivery_stop_time") or ad.get("last_shown")
+    try:
+        start_date = datetime.fromisoformat(start[:10]).date()
+        stop_date = datetime.fromisoformat(stop[:10]).date() if stop else datetime.now().date()
+    except ValueError:
+        return None
+    return start_date, max(start_date, stop_date)
+
+def _bucket_ad_archive(days_back: int) -> Dict[tuple, Dict]:
+    """Bucket cached ads into daily active-ad counts and spend per industry and advertiser.
+    
+    An ad counts on every day it runs, and its spend estimate is spread evenly
+    over its run. Each ad is added to difference arrays once, so bucketing is
+    linear in ads plus series, not ads times days.
+    
+    Returns:
+        (industry, advertiser or None for the industry) -> {"ad_count", "spend" (oldest day first), "ads"}
+    """
+    first_day = datetime.now().date() - timedelta(days=days_back - 1)
+    deltas: Dict[tuple, List[List[float]]] = {}
+    ad_totals: Dict[tuple, int] = {}
+    seen = set()
+    for platform, cache in (("meta", ad_cache), ("google", google_ads_cache)):
+        for entry in list(cache.values()):
+            industry = entry.get("industry")
+            for ad in entry.get("data", []):
+                ad_key = (platform, ad.get("id"))
+                run = _ad_run_dates(ad)
+                if not industry or ad_key in seen or run is None:
+                    continue
+                seen.add(ad_key)
+                start, stop = ((day - first_day).days for day in run)
+                if stop < 0 or start >= days_back:
+                    continue
+                daily_spend = (_ad_spend_midpoint(ad) or 0.0) / (stop - start + 1)
+                start, stop = max(start, 0), min(stop, days_back - 1)
+                advertiser = ad.get("advertiser_name") or ad.get("page_name")
+                for key in ((industry, None), (industry, advertiser)) if advertiser else ((industry, None),):
+                    counts, spend = deltas.setdefault(key, ([0.0] * (days_back + 1), [0.0] * (days_back + 1)))
+                    counts[start] += 1
+                    counts[stop + 1] -= 1
+                    spend[start] += daily_spend
+                    spend[stop + 1] -= daily_spend
+                    ad_totals[key] = ad_totals.get(key, 0) + 1
+    
+    buckets = {}
+    for key, (counts, spend) in deltas.items():
+        buckets[key] = {
+            "ad_count": list(accumulate(counts))[:days_back],
+            "spend": [max(0.0, value) for value in accumulate(spend)][:days_back],
+            "ads": ad_totals[key]
+        }
+    return buckets
+
+def _demo_trend_series(industry: str, days_back: int) -> Dict:
+    """Demo daily series for an industry without archived ads, oldest day first."""
+    days_ago = range(days_back - 1, -1, -1)
+    return {
+        "ad_count": [10 + (i * 2) + (_stable_hash(industry) % 10) for i in days_ago],
+        "spend": [(10 + i * 2) * 1000 for i in days_ago],
+        "ads": days_back * 15  # Demo: ~15 ads per day
     }
+
+def _get_trend_models(days_back: int) -> Dict:
+    """Get daily series and fitted forecast models for every industry and advertiser.
     
+    Industries and advertisers with archived ads use the bucketed archive; other
+    industries use demo series. All series are fitted in one batch, cached per
+    ad archive version, window and day.
+    """
+    today = datetime.now().date()
+    cache_key = (ad_archive_version, days_back, today)
+    with trend_model_lock:
+        model = trend_model_cache.get(cache_key)
+        if model is not None:
+            trend_model_cache.move_to_end(cache_key)
+            return model
+    
+    series = _bucket_ad_archive(days_back)
+    for industry in INDUSTRY_KEYWORDS:
+        if (industry, None) not in series:
+            series[industry, None] = dict(_demo_trend_series(industry, days_back), demo=True)
+    
+    keys = [(key, metric) for key in series for metric in ("ad_count", "spend")]
+    fits = fit_batch([series[key][metric] for key, metric in keys])
+    model = {
+        "dates": [today - timedelta(days=days_back - 1 - j) for j in range(days_back)],
+        "series": series,
+        "fits": dict(zip(keys, fits))
+    }
+    with trend_model_lock:
+        trend_model_cache[cache_key] = model
+        if len(trend_model_cache) > TREND_MODEL_CACHE_SIZE:
+            trend_model_cache.popitem(last=False)
+    return model
+
+def _series_forecast(model: Dict, key: tuple, metric: str, forecast_days: int) -> List[Dict]:
+    """Dated forecast points of one fitted series."""
+    last_date = model["dates"][-1]
+    return [
+        dict(point, date=(last_date + timedelta(days=point["step"])).strftime("%Y-%m-%d"))
+        for point in model["fits"][key, metric].forecast(forecast_days)
+    ]
+
+def _generate_trend_analysis(industry: str, days_back: int, forecast_days: int = 7) -> Dict:
+    """Analyze an industry's daily ad volume and spend and forecast them ahead.
+    
+    Args:
+        industry: Industry to analyze
+        days_back: Days of history to analyze (max 365)
+        forecast_days: Days to forecast past today (max 30)
+    """
+    industry = industry.lower()
     try:
-        response = requests.get(base_url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("data", [])
-    except requests.RequestException as e:
-        raise Exception(f"API request failed: {str(e)}")
-
-def _generate_trend_analysis(industry: str, days_back: int) -> Dict:
-    """Generate trend analysis for demo purposes."""
+        # Every series allocates and fits days_back values, so the history is capped
+        days_back = max(1, min(MAX_TREND_DAYS, int(days_back)))
+        forecast_days = max(1, min(MAX_FORECAST_DAYS, int(forecast_days)))
+    except (TypeError, ValueError):
+        return {"error": "days_back and forecast_days must be integers"}
+    model = _get_trend_models(days_back)
+    key = (industry, None)
+    series = model["series"][key]
+    
+    advertisers = sorted(
+        (advertiser for (name, advertiser) in model["series"] if name == industry and advertiser is not None),
+        key=lambda advertiser: -sum(model["series"][industry, advertiser]["spend"])
+    )[:TOP_ADVERTISER_FORECASTS]
+    
     return {
         "industry": industry,
         "analysis_period": f"Last {days_back} days",
-        "total_ads": days_back * 15,  # Demo: ~15 ads per day
-        "trend_direction": "increasing" if industry in ["technology", "automotive"] else "stable",
-        "top_keywords": INDUSTRY_KEYWORDS[industry.lower()][:5],
+        "data_source": "demo" if series.get("demo") else "ad_archive",
+        "total_ads": series["ads"],
+        "trend_direction": model["fits"][key, "ad_count"].direction(),
+        "spend_trend_direction": model["fits"][key, "spend"].direction(),
+        "top_keywords": INDUSTRY_KEYWORDS[industry][:5],
         "daily_breakdown": [
             {
-                "date": (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d"),
-                "ad_count": 10 + (i * 2) + (hash(industry) % 10),
-                "estimated_spend": f"${(10 + i * 2) * 1000}"
+                "date": date.strftime("%Y-%m-%d"),
+                "ad_count": round(count),
+                "estimated_spend": f"${round(spend)}"
             }
-            for i in range(days_back)
-        ]
+            for date, count, spend in reversed(list(zip(model["dates"], series["ad_count"], series["spend"])))
+        ],
+        "forecast": {
+            "horizon_days": forecast_days,
+            "ad_count": _series_forecast(model, key, "ad_count", forecast_days),
+            "spend": _series_forecast(model, key, "spend", forecast_days),
+            "models": {metric: model["fits"][key, metric].parameters() for metric in ("ad_count", "spend")}
+        },
+        "advertiser_forecasts": {
+            advertiser: {
+                "trend_direction": model["fits"][(industry, advertiser), "spend"].direction(),
+                "spend": _series_forecast(model, (industry, advertiser), "spend", forecast_days)
+            }
+            for advertiser in advertisers
+        }
     }
 
 def _generate_top_advertisers(industry: str, limit: int) -> List[Dict]:
@@ -1577,39 +3113,151 @@ def _generate_top_advertisers(industry: str, limit: int) -> List[Dict]:
         for i in range(min(limit, len(base_companies)))
     ]
 
-def _generate_industry_comparison(industry1: str, industry2: str, metric: str) -> Dict:
-    """Generate industry comparison data for demo purposes."""
-    metrics1 = {
-        "ad_volume": hash(industry1) % 1000 + 500,
-        "spend_estimate": hash(industry1) % 100000 + 50000,
-        "avg_duration": hash(industry1) % 30 + 15
+def _stable_hash(text: str) -> int:
+    """Process-independent hash for demo figures; hash() is salted per process."""
+    return zlib.crc32(text.encode("utf-8"))
+
+def _archived_ad_stats() -> Dict[str, Dict[str, int]]:
+    """Distinct cached ads and their total run days, per industry."""
+    seen = set()
+    stats: Dict[str, Dict[str, int]] = {}
+    for platform, cache in (("meta", ad_cache), ("google", google_ads_cache)):
+        for entry in list(cache.values()):
+            industry = entry.get("industry")
+            for ad in entry.get("data", []):
+                ad_key = (platform, ad.get("id"))
+                run = _ad_run_dates(ad)
+                if not industry or ad_key in seen or run is None:
+                    continue
+                seen.add(ad_key)
+                industry_stats = stats.setdefault(industry, {"ads": 0, "run_days": 0})
+                industry_stats["ads"] += 1
+                industry_stats["run_days"] += (run[1] - run[0]).days + 1
+    return stats
+
+def _get_industry_comparison() -> Dict:
+    """Get every industry's metrics and the all-pairs matrices of each metric.
+    
+    Spend comes from the brand store. Ad volume and average run length come from
+    the ad archive, falling back to demo values for industries without archived
+    ads. The result is rebuilt only when the brand data or ad archive changes.
+    """
+    global industry_comparison_cache
+    snapshot = current_snapshot
+    cache_key = (snapshot.version, ad_archive_version)
+    cached = industry_comparison_cache
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    
+    archived = _archived_ad_stats()
+    names = list(INDUSTRY_KEYWORDS)
+    metrics = {}
+    for name in names:
+        ads = archived.get(name)
+        seed = _stable_hash(name)
+        metrics[name] = {
+            "ad_volume": ads["ads"] if ads else seed % 1000 + 500,
+            "spend_estimate": round(sum(brand["total_spend"] for brand in snapshot.brands.get(name, {}).values())),
+            "avg_duration": round(ads["run_days"] / ads["ads"], 1) if ads else seed % 30 + 15
+        }
+    
+    matrices = {}
+    for metric in INDUSTRY_METRICS:
+        values = [metrics[name][metric] for name in names]
+        matrices[metric] = {
+            "ratio": [[round(a / b, 4) if b else None for b in values] for a in values],
+            "difference_percentage": [[round(abs(a - b) / max(a, b) * 100, 2) if max(a, b) else 0.0 for b in values] for a in values]
+        }
+    
+    comparison = {
+        "names": names,
+        "metrics": metrics,
+        "sources": {name: "ad_archive" if name in archived else "demo" for name in names},
+        "matrices": matrices,
+        "data_version": snapshot.version,
+        "ad_archive_version": ad_archive_version
     }
+    industry_comparison_cache = (cache_key, comparison)
+    return comparison
+
+def _industry_trend(industry: str, metric: str) -> Optional[str]:
+    """Fitted trend direction of the series behind an industry metric, if it has one."""
+    series = INDUSTRY_METRICS[metric]
+    if series is None:
+        return None
+    return _get_trend_models(COMPARISON_TREND_DAYS)["fits"][(industry, None), series].direction()
+
+def _generate_industry_matrix(metric: str, industries: Optional[List[str]] = None) -> Dict:
+    """Compare every pair of industries on one metric.
     
-    metrics2 = {
-        "ad_volume": hash(industry2) % 1000 + 500,
-        "spend_estimate": hash(industry2) % 100000 + 50000,
-        "avg_duration": hash(industry2) % 30 + 15
+    Args:
+        metric: Metric to compare (ad_volume, spend_estimate, avg_duration)
+        industries: Industries to include (default: all)
+    
+    Returns:
+        Values per industry and N x N matrices where row i, column j compares
+        industry i against industry j
+    """
+    if metric not in INDUSTRY_METRICS:
+        return {"error": f"Invalid metric '{metric}'. Must be one of: {', '.join(INDUSTRY_METRICS)}"}
+    
+    comparison = _get_industry_comparison()
+    names = comparison["names"]
+    selected = [name.lower() for name in industries] if industries else names
+    unknown = [name for name in selected if name not in INDUSTRY_KEYWORDS]
+    if unknown:
+        return {"error": f"Unknown industries: {', '.join(unknown)}. Available industries: {', '.join(names)}"}
+    
+    positions = [names.index(name) for name in selected]
+    matrices = comparison["matrices"][metric]
+    values = {name: comparison["metrics"][name][metric] for name in selected}
+    ranking = sorted(selected, key=lambda name: -values[name])
+    ratio = [[matrices["ratio"][i][j] for j in positions] for i in positions]
+    return {
+        "comparison_metric": metric,
+        "industries": selected,
+        "values": values,
+        "ranking": ranking,
+        "leader": ranking[0] if ranking else None,
+        "wins": {name: sum(1 for r in row if r is not None and r > 1) for name, row in zip(selected, ratio)},
+        "ratio": ratio,
+        "difference_percentage": [[matrices["difference_percentage"][i][j] for j in positions] for i in positions],
+        "trends": {name: _industry_trend(name, metric) for name in selected},
+        "sources": {name: comparison["sources"][name] for name in selected},
+        "data_version": comparison["data_version"],
+        "ad_archive_version": comparison["ad_archive_version"]
     }
+
+def _generate_industry_comparison(industry1: str, industry2: str, metric: str) -> Dict:
+    """Compare two industries on one metric, from the cached all-pairs comparison."""
+    if metric not in INDUSTRY_METRICS:
+        return {"error": f"Invalid metric '{metric}'. Must be one of: {', '.join(INDUSTRY_METRICS)}"}
+    
+    comparison = _get_industry_comparison()
+    value1 = comparison["metrics"][industry1.lower()][metric]
+    value2 = comparison["metrics"][industry2.lower()][metric]
+    i, j = comparison["names"].index(industry1.lower()), comparison["names"].index(industry2.lower())
     
     return {
         "comparison_metric": metric,
         "industries": {
             industry1: {
-                "value": metrics1[metric],
-                "trend": "increasing" if metrics1[metric] > 700 else "stable"
+                "value": value1,
+                "trend": _industry_trend(industry1.lower(), metric)
             },
             industry2: {
-                "value": metrics2[metric],
-                "trend": "increasing" if metrics2[metric] > 700 else "stable"
+                "value": value2,
+                "trend": _industry_trend(industry2.lower(), metric)
             }
         },
-        "leader": industry1 if metrics1[metric] > metrics2[metric] else industry2,
-        "difference_percentage": abs(metrics1[metric] - metrics2[metric]) / max(metrics1[metric], metrics2[metric]) * 100
+        "leader": industry1 if value1 > value2 else industry2,
+        "difference_percentage": comparison["matrices"][metric]["difference_percentage"][i][j]
     }
 
 if __name__ == "__main__":
     try:
         logger.info("Starting MCP server...")
+        start_brand_dataset_watcher()
         mcp.run()
     except Exception as e:
         logger.error(f"Server failed to start: {e}")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Streaming spike and drop detection on ingested spend and ad-volume series
+
+Each (industry, advertiser, platform, metric) series keeps only an exponentially
+weighted moving mean and variance, so an observation is scored and folded in
+in constant time and memory without revisiting history. An observation whose
+deviation from the moving mean exceeds the threshold, in moving standard
+deviations, is recorded as a spike or a drop once the series is warmed up.
+
+The deviation scale is floored at a fraction of the mean, so a series that has
+been flat (zero variance) flags a large relative jump instead of every change.
+"""
+
+import math
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_ALPHA = 0.3
+DEFAULT_THRESHOLD = 3.0
+# Observations a series needs before it can flag anomalies
+DEFAULT_WARMUP = 4
+# Smallest deviation scale, as a fraction of the moving mean
+MIN_RELATIVE_DEVIATION = 0.1
+
+# Least recently updated series are evicted beyond this many
+MAX_SERIES = 200000
+# Recent anomalies retained for polling
+MAX_ANOMALIES = 1000
+
+METRICS = ["spend", "ad_volume"]
+
+class EwmaSeries:
+    """Exponentially weighted moving mean and variance of one series."""
+
+    __slots__ = ("mean", "variance", "count", "last_value", "updated_at")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+        self.last_value = None
+        self.updated_at = None
+
+    def update(self, value: float, alpha: float) -> None:
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.variance = (1 - alpha) * (self.variance + diff * increment)
+        self.count += 1
+        self.last_value = value
+
+    def scale(self) -> float:
+        """Deviation unit an observation is scored against."""
+        return max(math.sqrt(self.variance), abs(self.mean) * MIN_RELATIVE_DEVIATION)
+
+class AnomalyDetector:
+    """EWMA statistics per series plus a bounded log of flagged observations."""
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA, threshold: float = DEFAULT_THRESHOLD,
+                 warmup: int = DEFAULT_WARMUP, max_series: int = MAX_SERIES, max_anomalies: int = MAX_ANOMALIES):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.max_series = max_series
+        self.sequence = 0
+        self.observations = 0
+        self._series: "OrderedDict[Tuple[str, str, str, str], EwmaSeries]" = OrderedDict()
+        self._anomalies: deque = deque(maxlen=max_anomalies)
+        self._lock = threading.Lock()
+
+    def _observe(self, key: Tuple[str, str, str, str], value: float, observed_at: str) -> Optional[Dict]:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = EwmaSeries()
+            if len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        else:
+            self._series.move_to_end(key)
+
+        anomaly = None
+        if series.count >= self.warmup:
+            scale = series.scale()
+            score = (value - series.mean) / scale if scale else 0.0
+            if abs(score) >= self.threshold:
+                self.sequence += 1
+                industry, advertiser, platform, metric = key
+                anomaly = {
+                    "seq": self.sequence,
+                    "industry": industry,
+                    "advertiser": advertiser,
+                    "platform": platform,
+                    "metric": metric,
+                    "direction": "spike" if score > 0 else "drop",
+                    "value": round(value, 2),
+                    "expected": round(series.mean, 2),
+                    "score": round(score, 2),
+                    "change_percentage": round((value - series.mean) / series.mean * 100, 1) if series.mean else None,
+                    "previous_value": series.last_value,
+                    "detected_at": observed_at
+                }
+                self._anomalies.append(anomaly)
+
+        series.update(value, self.alpha)
+        series.updated_at = observed_at
+        self.observations += 1
+        return anomaly
+
+    def observe(self, industry: str, advertiser: str, platform: str, metric: str, value: float) -> Optional[Dict]:
+        """Score one observation against its series, then fold it in.
+
+        Returns:
+            The anomaly record if the observation was flagged, else None
+        """
+        anomalies = self.observe_many([(industry, advertiser, platform, metric, value)])
+        return anomalies[0] if anomalies else None
+
+    def observe_many(self, observations: Iterable[Tuple[str, str, str, str, float]]) -> List[Dict]:
+        """Score and fold in a batch of (industry, advertiser, platform, metric, value) observations.
+
+        Returns:
+            Anomaly records for the flagged observations, in input order
+        """
+        observed_at = datetime.now().isoformat()
+        anomalies = []
+        with self._lock:
+            for industry, advertiser, platform, metric, value in observations:
+                anomaly = self._observe((industry, advertiser, platform, metric), float(value), observed_at)
+                if anomaly is not None:
+                    anomalies.append(anomaly)
+        return anomalies
+
+    def recent(self, since: int = 0, industry: Optional[str] = None, advertiser: Optional[str] = None,
+               platform: Optional[str] = None, metric: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Get flagged observations after a sequence number, oldest first.
+
+        Polling again with the last returned seq as since picks up where this
+        page stopped, so no anomaly is skipped when more than limit arrived.
+        """
+        with self._lock:
+            anomalies = list(self._anomalies)
+        matches = [
+            anomaly for anomaly in anomalies
+            if anomaly["seq"] > since
+            and (industry is None or anomaly["industry"] == industry)
+            and (advertiser is None or anomaly["advertiser"] == advertiser)
+            and (platform is None or anomaly["platform"] == platform)
+            and (metric is None or anomaly["metric"] == metric)
+        ]
+        return matches[:limit]
+
+    def series_stats(self, industry: str, advertiser: str, platform: str) -> Dict[str, Dict]:
+        """Get the current moving statistics of one advertiser's series, per metric."""
+        with self._lock:
+            stats = {}
+            for metric in METRICS:
+                series = self._series.get((industry, advertiser, platform, metric))
+                if series is not None:
+                    stats[metric] = {
+                        "mean": round(series.mean, 2),
+                        "std": round(math.sqrt(series.variance), 2),
+                        "observations": series.count,
+                        "last_value": series.last_value,
+                        "updated_at": series.updated_at
+                    }
+            return stats
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "series": len(self._series),
+                "observations": self.observations,
+                "anomalies_detected": self.sequence,
+                "alpha": self.alpha,
+                "threshold": self.threshold,
+                "warmup": self.warmup
+            }
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Batched Holt-Winters forecasting over daily ad-volume and spend series
+
+All series of one length are fitted together: the smoothing recursions step
+through time once per parameter combination, updating every series' level,
+trend and seasonal state as parallel columns. Each series keeps the
+combination with the lowest one-step-ahead squared error. Series spanning at
+least two seasons get an additive weekly seasonal component; shorter ones
+fall back to Holt's linear trend.
+
+Prediction intervals widen with the square root of the horizon around the
+fitted one-step error, and are clipped at zero because every series is a
+non-negative count or amount.
+"""
+
+import math
+import operator
+from itertools import product
+from typing import Dict, List, Sequence
+
+SEASON_LENGTH = 7
+
+# Smoothing parameter grid searched per series: level, trend, season
+ALPHAS = (0.2, 0.5, 0.8)
+BETAS = (0.05, 0.2)
+GAMMAS = (0.1, 0.3)
+
+# Two-sided normal quantiles per interval coverage
+INTERVAL_Z = {80: 1.2816, 95: 1.96}
+
+# Daily trend, relative to the level, beyond which a series is rising or falling
+TREND_TOLERANCE = 0.01
+
+class SeriesFit:
+    """Final smoothing state and chosen parameters of one fitted series."""
+
+    __slots__ = ("level", "trend", "season", "sigma", "alpha", "beta", "gamma", "length")
+
+    def __init__(self, level: float, trend: float, season: List[float], sigma: float,
+                 alpha: float, beta: float, gamma: float, length: int):
+        self.level = level
+        self.trend = trend
+        self.season = season
+        self.sigma = sigma
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.length = length
+
+    def direction(self) -> str:
+        """increasing, decreasing or stable by the fitted daily trend."""
+        scale = max(abs(self.level), 1e-9)
+        if self.trend > TREND_TOLERANCE * scale:
+            return "increasing"
+        if self.trend < -TREND_TOLERANCE * scale:
+            return "decreasing"
+        return "stable"
+
+    def parameters(self) -> Dict:
+        return {
+            "model": "holt_winters_additive" if self.season else "holt_linear",
+            "alpha": self.alpha,
+            "beta": self.beta,
+            "gamma": self.gamma if self.season else None,
+            "level": round(self.level, 2),
+            "daily_trend": round(self.trend, 2),
+            "residual_std": round(self.sigma, 2),
+            "observations": self.length
+        }
+
+    def forecast(self, horizon: int) -> List[Dict]:
+        """Point forecasts and intervals for the next horizon steps."""
+        points = []
+        for step in range(1, horizon + 1):
+            seasonal = self.season[(self.length - 1 + step) % len(self.season)] if self.season else 0.0
+            value = self.level + step * self.trend + seasonal
+            point = {"step": step, "value": round(max(0.0, value), 2)}
+            for coverage, z in INTERVAL_Z.items():
+                spread = z * self.sigma * math.sqrt(step)
+                point[f"lower_{coverage}"] = round(max(0.0, value - spread), 2)
+                point[f"upper_{coverage}"] = round(max(0.0, value + spread), 2)
+            points.append(point)
+        return points
+
+def _fit_group(series: List[Sequence[float]], season_length: int) -> List[SeriesFit]:
+    """Fit equal-length series together, one pass over time per parameter combination."""
+    length = len(series[0])
+    count = len(series)
+    if length < 2:
+        return [SeriesFit(float(s[0]) if length else 0.0, 0.0, [], 0.0, 0.0, 0.0, 0.0, length) for s in series]
+
+    columns = [list(map(float, column)) for column in zip(*series)]
+    seasonal = length >= 2 * season_length
+    if seasonal:
+        first = [sum(values) / season_length for values in zip(*columns[:season_length])]
+        second = [sum(values) / season_length for values in zip(*columns[season_length:2 * season_length])]
+        initial_level = first
+        initial_trend = [(b - a) / season_length for a, b in zip(first, second)]
+        initial_season = [list(map(operator.sub, columns[i], first)) for i in range(season_length)]
+        start = season_length
+        combinations = list(product(ALPHAS, BETAS, GAMMAS))
+    else:
+        initial_level = columns[0]
+        initial_trend = list(map(operator.sub, columns[1], columns[0]))
+        initial_season = None
+        start = 1
+        combinations = [(alpha, beta, 0.0) for alpha, beta in product(ALPHAS, BETAS)]
+
+    best_sse = [math.inf] * count
+    best = [None] * count
+    for alpha, beta, gamma in combinations:
+        level = list(initial_level)
+        trend = list(initial_trend)
+        season = [list(column) for column in initial_season] if seasonal else None
+        zeros = [0.0] * count
+        sse = [0.0] * count
+        for t in range(start, length):
+            observed = columns[t]
+            slot = season[t % season_length] if seasonal else zeros
+            errors = [y - (l + b + s) for y, l, b, s in zip(observed, level, trend, slot)]
+            sse = list(map(operator.add, sse, map(operator.mul, errors, errors)))
+            new_level = [alpha * (y - s) + (1 - alpha) * (l + b) for y, s, l, b in zip(observed, slot, level, trend)]
+            trend = [beta * (n - l) + (1 - beta) * b for n, l, b in zip(new_level, level, trend)]
+            if seasonal:
+                season[t % season_length] = [gamma * (y - n) + (1 - gamma) * s for y, n, s in zip(observed, new_level, slot)]
+            level = new_level
+
+        for k in range(count):
+            if sse[k] < best_sse[k]:
+                best_sse[k] = sse[k]
+                best[k] = (alpha, beta, gamma, level[k], trend[k], [column[k] for column in season] if seasonal else [])
+
+    steps = length - start
+    return [
+        SeriesFit(level, trend, season_values, math.sqrt(best_sse[k] / steps), alpha, beta, gamma, length)
+        for k, (alpha, beta, gamma, level, trend, season_values) in enumerate(best)
+    ]
+
+def fit_batch(series: List[Sequence[float]], season_length: int = SEASON_LENGTH) -> List[SeriesFit]:
+    """Fit every series, batching those of equal length into one pass.
+
+    Returns:
+        One SeriesFit per input series, in input order
+    """
+    by_length: Dict[int, List[int]] = {}
+    for i, values in enumerate(series):
+        by_length.setdefault(len(values), []).append(i)
+
+    fits: List[SeriesFit] = [None] * len(series)
+    for positions in by_length.values():
+        for position, fit in zip(positions, _fit_group([series[i] for i in positions], season_length)):
+            fits[position] = fit
+    return fits